@@ -1,7 +1,11 @@
 import json
 import os
+import threading
 from datetime import datetime
-from utils.config_manager import ConfigManager, get_user_config_dir
+from utils.config_manager import get_user_config_dir
+from utils.deferred_writer import DeferredWriter
+from models.resource_store import ResourceStore
+from models.asset_storage import JsonAssetStorage, SqliteAssetStorage
 
 # 定义默认资源配置
 DEFAULT_ASSETS_CONFIG = {
@@ -11,34 +15,96 @@ DEFAULT_ASSETS_CONFIG = {
     "settings": {
         "auto_refresh": True,
         "show_preview": True,
-        "max_recent_files": 10
+        "max_recent_files": 10,
+        # 模糊搜索：容许拼写错误，按相关度排序
+        "fuzzy_search": True
     },
     "version": "1.0.0"
 }
 
 class AssetManager:
-    def __init__(self):
+    # 按需加载的存储启动时读取的资源数量（足够显示首屏），其余在后台读取
+    FIRST_SCREEN_RESOURCES = 200
+
+    def __init__(self, storage=None, journal: bool = False):
+        """
+        Args:
+            storage: 存储后端，默认在存在ue_assets.db（见models.asset_storage的迁移工具）时
+                使用SQLite，否则使用ue_assets.json
+            journal: 使用ue_assets.json时是否开启追加日志模式（见ConfigManager），默认关闭
+        """
         # 获取用户配置目录
         config_dir = get_user_config_dir()
         
         self.data_file = os.path.join(config_dir, "ue_assets.json")
-        # 创建配置管理器
-        self.config_manager = ConfigManager(
-            config_file=self.data_file,
-            current_version="1.0.0",
-            default_config=DEFAULT_ASSETS_CONFIG
-        )
+        self.db_file = os.path.join(config_dir, "ue_assets.db")
+        if storage is None:
+            if os.path.exists(self.db_file):
+                storage = SqliteAssetStorage(self.db_file, DEFAULT_ASSETS_CONFIG)
+            else:
+                storage = JsonAssetStorage(self.data_file, DEFAULT_ASSETS_CONFIG, journal=journal)
+        self.storage = storage
+        # 修改后合并写入，不在界面线程中反复重写整个文件；退出时写入未保存的修改（见DeferredWriter）
+        self.writer = DeferredWriter(self._write_data)
         # 加载配置
-        self.config = self.config_manager.load_config()
+        self.config = self.storage.load_config()
         self.categories = ["全部"] + self.config.get("categories", ["默认"])
         self.category_paths = self.config.get("category_paths", {})
-        self.resources = self.config.get("resources", [])
+        self.resources = self._load_resources()
+    
+    def _load_resources(self):
+        """创建资源存储，旧数据中没有id的资源补充id后立即保存，保证id稳定
+
+        按需加载的存储只读取首屏的资源，其余资源在后台读取，读取完成前搜索在存储中进行。
+        查重、统计等需要完整资源的方法会等待读取完成。
+        """
+        self._total = self.storage.count()
+        limit = self.FIRST_SCREEN_RESOURCES if self.storage.lazy else None
+        resources = ResourceStore(self.storage.load_resources(0, limit))
+        # 每次加载使用新的事件，旧的后台读取不会影响新的加载
+        self._loaded = threading.Event()
+        if len(resources) < self._total:
+            threading.Thread(target=self._load_remaining, args=(resources, self._loaded), daemon=True).start()
+            return resources
+        
+        self._loaded.set()
+        if resources.assigned_ids:
+            self.resources = resources
+            self.save_data()
+            self.flush()
+            resources.assigned_ids = False
+        # 搜索索引在后台建立，不阻塞启动
+        if len(resources):
+            threading.Thread(target=resources.build_search_index, daemon=True).start()
+        return resources
+    
+    def _load_remaining(self, resources, loaded):
+        """后台读取首屏之后的资源"""
+        try:
+            resources.extend(self.storage.load_resources(len(resources)))
+        except Exception as e:
+            print(f"后台加载资源失败: {e}")
+        finally:
+            loaded.set()
+        resources.build_search_index()
+    
+    def is_loaded(self):
+        """资源是否已全部读取"""
+        return self._loaded.is_set()
+    
+    def resource_count(self):
+        """资源总数（后台读取完成前为存储中的数量）"""
+        if self._loaded.is_set():
+            return len(self.resources)
+        return max(self._total, len(self.resources))
     
     def load_data(self):
         """加载数据"""
+        # 先写入未保存的修改，避免读到旧数据
+        self.flush()
         try:
-            self.config = self.config_manager.load_config()
-            self.resources = self.config.get('resources', [])
+            self.config = self.storage.load_config()
+            self.resources = self._load_resources()
             # 加载自定义分类
             custom_cats = self.config.get('categories', [])
             for cat in custom_cats:
@@ -51,25 +117,50 @@ class AssetManager:
             # 用日志记录替代控制台输出
             import logging
             logging.error(f"加载数据失败: {e}")
-            self.resources = []
+            self.resources = ResourceStore()
 
     def save_data(self):
-        """保存数据"""
+        """保存数据 - 只标记有修改，由后台线程合并写入（需要立即写入时调用flush）
+
+        本次修改的写入结果无法立即得知；返回False表示上一次写入失败（修改仍保留，会自动重试）。
+        """
+        self.writer.mark_dirty()
+        return not self.writer.failed
+
+    def flush(self):
+        """立即写入未保存的修改，返回是否写入成功"""
+        return self.writer.flush()
+
+    def close(self):
+        """写入未保存的修改并关闭存储，之后不能再使用"""
+        result = self.writer.close()
+        self.storage.close()
+        return result
+
+    def _write_data(self):
+        """写入数据（在后台线程中调用）"""
+        # 资源全部读取后才能保存，否则未读取的资源会被当作已删除
+        self._loaded.wait()
         try:
-            # 更新配置数据
-            self.config["resources"] = self.resources
-            self.config["categories"] = [cat for cat in self.categories if cat != "全部"]
-            self.config["category_paths"] = self.category_paths
+            # 界面线程可能同时在修改，先复制一份再序列化
+            config = dict(self.config)
+            config["resources"] = [dict(resource) for resource in self.resources.to_list()]
+            config["categories"] = [cat for cat in list(self.categories) if cat != "全部"]
+            config["category_paths"] = {category: list(paths)
+                                        for category, paths in dict(self.category_paths).items()}
+            if isinstance(config.get("settings"), dict):
+                config["settings"] = dict(config["settings"])
             
             # 保存配置
-            return self.config_manager.save_config(self.config)
+            return self.storage.save_config(config)
         except Exception as e:
             import logging
             logging.error(f"保存数据失败: {str(e)}")
             return False
 
     def get_resources(self):
-        """获取所有资源"""
+        """获取所有资源（等待后台读取完成）"""
+        self._loaded.wait()
         return self.resources
 
     def add_resource(self, name, path, category, cover, create_readme):
@@ -108,16 +199,20 @@ class AssetManager:
                 import logging
                 logging.error(f"创建README失败: {e}")
         
-        resource.update({
-            'name': name,
-            'category': category,
-            'path': path,
-            'cover': cover,
-            'doc': doc_path
-        })
+        self.resources.update(resource,
+                              name=name,
+                              category=category,
+                              path=path,
+                              cover=cover,
+                              doc=doc_path)
         
         return self.save_data()
 
+    def set_resource_category(self, resource, category):
+        """更改资源分类"""
+        self.resources.update(resource, category=category)
+        return self.save_data()
+
     def remove_resource(self, resource):
         """移除资源"""
         if resource in self.resources:
@@ -125,6 +220,30 @@ class AssetManager:
             return self.save_data()
         return False
 
+    def get_resource(self, resource_id):
+        """按id获取资源"""
+        return self.resources.get(resource_id)
+
+    def get_resource_by_path(self, path):
+        """按路径获取资源"""
+        self._loaded.wait()
+        return self.resources.get_by_path(path)
+
+    def has_resource_path(self, path):
+        """检查路径是否已导入"""
+        self._loaded.wait()
+        return self.resources.has_path(path)
+
+    def has_resource_name(self, name):
+        """检查资源名称是否已存在"""
+        self._loaded.wait()
+        return self.resources.has_name(name)
+
+    def count_resources_in_category(self, category):
+        """统计分类中的资源数量"""
+        self._loaded.wait()
+        return self.resources.count_in_category(category)
+
     def add_category(self, category_name):
         """添加新分类"""
         if category_name and category_name not in self.categories:
@@ -160,21 +279,24 @@ class AssetManager:
                 return True
         return False
 
+    def is_fuzzy_search_enabled(self):
+        """是否启用模糊搜索"""
+        return self.config.get("settings", {}).get("fuzzy_search", True)
+
+    def set_fuzzy_search(self, enabled):
+        """启用或关闭模糊搜索并保存设置"""
+        self.config.setdefault("settings", {})["fuzzy_search"] = bool(enabled)
+        return self.save_data()
+
     def get_filtered_resources(self, current_category, search_term):
-        """获取过滤后的资源列表"""
-        filtered_assets = []
-        for asset in self.resources:
-            # 分类过滤
-            if current_category != "全部":
-                if asset.get('category') != current_category:
-                    continue
-            
-            # 搜索过滤
-            if search_term:
-                search_in = asset.get('name', '').lower() + " " + asset.get('category', '').lower()
-                if search_term not in search_in:
-                    continue
-            
-            filtered_assets.append(asset)
-        
-        return filtered_assets
\ No newline at end of file
+        """获取过滤后的资源列表 - 使用倒排索引搜索名称、分类、路径和README内容
+
+        启用模糊搜索时结果按相关度排序，否则保持添加顺序。
+        """
+        category = None if current_category == "全部" else current_category
+        if not self._loaded.is_set() and self.storage.supports_query and (category is not None or
+                                                                           (search_term or "").strip()):
+            # 资源还没有全部读取，在存储中过滤；已读取的资源使用同一个对象
+            return [self.resources.get(resource["id"]) or resource
+                    for resource in self.storage.query(search_term or "", category)]
+        return self.resources.search(search_term or "", category, fuzzy=self.is_fuzzy_search_enabled())
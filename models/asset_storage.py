@@ -0,0 +1,332 @@
+import os
+import re
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+from utils.config_manager import ConfigManager
+from utils.json_codec import get_codec
+from models.resource_store import ResourceStore
+from models.search_index import resource_short_text
+
+
+class AssetStorage(ABC):
+    """资产库存储后端 - AssetManager通过它读写分类、设置和资源
+
+    - load_config：读取除资源以外的配置（分类、分类路径、设置、版本）
+    - count/load_resources：资源总数和按添加顺序分段读取资源
+    - save_config：保存完整的配置快照（含resources），后端自行决定如何增量写入
+    - query：在存储中按搜索词和分类过滤（supports_query为True时可用）
+    """
+
+    # 是否支持在存储中过滤（query）
+    supports_query = False
+    # 是否按需加载：启动时只读取首屏需要的资源，其余在后台读取
+    lazy = False
+
+    @abstractmethod
+    def load_config(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def count(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_resources(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_config(self, config: Dict[str, Any]) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def query(self, search_term: str, category: Optional[str] = None) -> List[Dict]:
+        """按搜索词（空格分隔，全部为名称、分类或路径的子串）和分类过滤，结果保持添加顺序"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class JsonAssetStorage(AssetStorage):
+    """JSON存储 - ue_assets.json，启动时读取全部资源
+
+    journal为True时使用快照加追加日志（见ConfigManager），默认关闭，每次保存重写整个文件。
+    """
+
+    def __init__(self, data_file: str, default_config: Dict[str, Any], current_version: str = "1.0.0",
+                 journal: bool = False):
+        self.data_file = data_file
+        self.config_manager = ConfigManager(
+            config_file=data_file,
+            current_version=current_version,
+            default_config=default_config,
+            # 开启日志模式时修改只追加到日志，资源按id逐项记录
+            journal=journal,
+            keyed_lists={"resources": "id"}
+        )
+        self._resources: List[Dict] = []
+
+    def load_config(self) -> Dict[str, Any]:
+        config = dict(self.config_manager.load_config())
+        self._resources = config.pop("resources", None) or []
+        return config
+
+    def count(self) -> int:
+        return len(self._resources)
+
+    def load_resources(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        end = None if limit is None else offset + limit
+        return self._resources[offset:end]
+
+    def save_config(self, config: Dict[str, Any]) -> bool:
+        if not self.config_manager.save_config(config):
+            return False
+        self._resources = list(config.get("resources", []))
+        return True
+
+    def query(self, search_term: str, category: Optional[str] = None) -> List[Dict]:
+        # 资源全部在内存中，逐个比较（AssetManager直接在ResourceStore中搜索，不调用这里）
+        terms = (search_term or "").lower().split()
+        return [resource for resource in self._resources
+                if (category is None or resource.get("category") == category)
+                and all(term in resource_short_text(resource) for term in terms)]
+
+
+class SqliteAssetStorage(AssetStorage):
+    """SQLite存储 - 适合上万个资源的资产库
+
+    - WAL模式，每个资源一行，保存时只写入变化的行和设置
+    - 分类、路径、名称有索引；名称、分类、路径的文本用FTS5 trigram索引，子串查询在数据库中完成
+      （SQLite不支持FTS5或搜索词太短时逐行比较）
+    - 启动时只读取首屏的资源，其余在后台分段读取
+    - 连接在加载、写入和搜索线程间共用，通过锁互斥
+    """
+
+    supports_query = True
+    lazy = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS resources (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL UNIQUE,
+            name TEXT NOT NULL DEFAULT '',
+            path TEXT NOT NULL DEFAULT '',
+            category TEXT NOT NULL DEFAULT '',
+            search_text TEXT NOT NULL DEFAULT '',
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_resources_category ON resources(category);
+        CREATE INDEX IF NOT EXISTS idx_resources_path ON resources(path);
+        CREATE INDEX IF NOT EXISTS idx_resources_name ON resources(name);
+    """
+
+    def __init__(self, db_file: str, default_config: Dict[str, Any], current_version: str = "1.0.0"):
+        self.db_file = db_file
+        self.default_config = dict(default_config)
+        self.default_config["version"] = current_version
+        self._lock = threading.RLock()
+        self.codec = get_codec()
+        db_dir = os.path.dirname(db_file)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self.has_fts = self._create_fts()
+        # 数据库中的内容，用于保存时只写入变化的部分：{键: JSON}、{资源id: 资源}
+        self._meta: Dict[str, str] = {}
+        self._persisted: Dict[str, Dict] = {}
+
+    def _create_fts(self) -> bool:
+        try:
+            with self._conn:
+                self._conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS resources_fts "
+                                   "USING fts5(search_text, tokenize='trigram')")
+            return True
+        except sqlite3.OperationalError as e:
+            print(f"SQLite不支持FTS5 trigram，搜索退回逐行比较: {e}")
+            return False
+
+    def _encode(self, value: Any) -> str:
+        return self.codec.dumps(value).decode("utf-8")
+
+    @staticmethod
+    def _search_text(resource: Dict) -> str:
+        # 与内存中逐个比较使用相同的文本（NUL分隔符换成换行，SQLite文本中不宜包含NUL）
+        return resource_short_text(resource).replace("\0", "\n")
+
+    # ---- 读取 ----
+
+    def load_config(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM meta").fetchall()
+        self._meta = dict(rows)
+        config = {key: value for key, value in self.default_config.items() if key != "resources"}
+        for key, value in rows:
+            config[key] = self.codec.loads(value)
+        return config
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM resources").fetchone()[0]
+
+    def load_resources(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM resources ORDER BY seq LIMIT ? OFFSET ?",
+                                      (-1 if limit is None else limit, offset)).fetchall()
+        resources = []
+        for (data,) in rows:
+            resource = self.codec.loads(data)
+            self._persisted[resource["id"]] = dict(resource)
+            resources.append(resource)
+        return resources
+
+    def query(self, search_term: str, category: Optional[str] = None) -> List[Dict]:
+        sql, params = self._query_sql(search_term, category)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self.codec.loads(data) for (data,) in rows]
+
+    def _query_sql(self, search_term: str, category: Optional[str]) -> Tuple[str, List[Any]]:
+        """生成查询语句：子串用instr精确判断，trigram索引先缩小范围
+
+        trigram索引只能用于不带ESCAPE的LIKE，且片段至少3个字符，
+        因此把搜索词按LIKE通配符（%、_）拆开，只用其中较长的片段查询索引。
+        """
+        where, params = [], []
+        fts_patterns = []
+        for term in (search_term or "").lower().split():
+            where.append("instr(search_text, ?) > 0")
+            params.append(term)
+            fts_patterns.extend(f"%{piece}%" for piece in re.split(r"[%_]", term) if len(piece) >= 3)
+        if fts_patterns and self.has_fts:
+            conditions = " AND ".join("search_text LIKE ?" for _ in fts_patterns)
+            where.insert(0, f"seq IN (SELECT rowid FROM resources_fts WHERE {conditions})")
+            params[:0] = fts_patterns
+        if category is not None:
+            where.append("category = ?")
+            params.append(category)
+        sql = "SELECT data FROM resources"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return sql + " ORDER BY seq", params
+
+    # ---- 写入 ----
+
+    def save_config(self, config: Dict[str, Any]) -> bool:
+        meta = {}
+        for key, value in config.items():
+            if key == "resources":
+                continue
+            encoded = self._encode(value)
+            if self._meta.get(key) != encoded:
+                meta[key] = encoded
+        changed, seen = [], set()
+        for resource in config.get("resources", []):
+            resource_id = resource.get("id")
+            if not resource_id:
+                continue
+            seen.add(resource_id)
+            if self._persisted.get(resource_id) != resource:
+                changed.append(resource)
+        removed = [resource_id for resource_id in self._persisted if resource_id not in seen]
+        if not meta and not changed and not removed:
+            return True
+
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", meta.items())
+                for resource in changed:
+                    self._upsert(resource)
+                for resource_id in removed:
+                    self._delete(resource_id)
+        except sqlite3.Error as e:
+            print(f"保存资产数据库失败: {e}")
+            return False
+
+        self._meta.update(meta)
+        for resource in changed:
+            self._persisted[resource["id"]] = dict(resource)
+        for resource_id in removed:
+            del self._persisted[resource_id]
+        return True
+
+    def _upsert(self, resource: Dict):
+        search_text = self._search_text(resource)
+        self._conn.execute(
+            "INSERT INTO resources (id, name, path, category, search_text, data) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET name = excluded.name, path = excluded.path, "
+            "category = excluded.category, search_text = excluded.search_text, data = excluded.data",
+            (resource["id"], resource.get("name") or "", ResourceStore.normalize_path(resource.get("path") or ""),
+             resource.get("category") or "", search_text, self._encode(resource)))
+        if self.has_fts:
+            seq = self._conn.execute("SELECT seq FROM resources WHERE id = ?", (resource["id"],)).fetchone()[0]
+            self._conn.execute("DELETE FROM resources_fts WHERE rowid = ?", (seq,))
+            self._conn.execute("INSERT INTO resources_fts (rowid, search_text) VALUES (?, ?)", (seq, search_text))
+
+    def _delete(self, resource_id: str):
+        row = self._conn.execute("SELECT seq FROM resources WHERE id = ?", (resource_id,)).fetchone()
+        if row is None:
+            return
+        if self.has_fts:
+            self._conn.execute("DELETE FROM resources_fts WHERE rowid = ?", row)
+        self._conn.execute("DELETE FROM resources WHERE seq = ?", row)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def migrate_json_to_sqlite(json_file: str, db_file: str, default_config: Dict[str, Any]) -> int:
+    """
+    把ue_assets.json（含追加日志）一次性导入SQLite数据库，JSON文件保留作为备份
+
+    Args:
+        json_file: JSON配置文件路径
+        db_file: 数据库文件路径，已存在时不导入
+        default_config: 默认配置
+
+    Returns:
+        导入的资源数量
+    """
+    if os.path.exists(db_file):
+        raise FileExistsError(f"数据库已存在: {db_file}")
+    source = JsonAssetStorage(json_file, default_config)
+    config = source.load_config()
+    # 旧数据中没有id的资源在这里补充id
+    config["resources"] = [dict(resource) for resource in ResourceStore(source.load_resources())]
+
+    # 先写入临时文件，导入完成后再改名，中途失败不会留下不完整的数据库
+    temp_file = db_file + ".tmp"
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(temp_file + suffix):
+            os.remove(temp_file + suffix)
+    target = SqliteAssetStorage(temp_file, default_config)
+    try:
+        if not target.save_config(config):
+            raise IOError(f"写入数据库失败: {temp_file}")
+    finally:
+        target.close()
+    os.replace(temp_file, db_file)
+    return len(config["resources"])
+
+
+# 把用户配置目录中的ue_assets.json导入ue_assets.db（在项目根目录运行 python -m models.asset_storage）
+if __name__ == "__main__":
+    from utils.config_manager import get_user_config_dir
+    from models.asset_manager import DEFAULT_ASSETS_CONFIG
+
+    config_dir = get_user_config_dir()
+    try:
+        count = migrate_json_to_sqlite(os.path.join(config_dir, "ue_assets.json"),
+                                       os.path.join(config_dir, "ue_assets.db"), DEFAULT_ASSETS_CONFIG)
+        print(f"已导入 {count} 个资源到 {os.path.join(config_dir, 'ue_assets.db')}")
+    except (FileExistsError, IOError) as e:
+        print(f"导入失败: {e}")
@@ -0,0 +1,195 @@
+import re
+import time
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+# 名称中的单词：下划线/空格/连字符分隔，以及驼峰和数字边界（CastleKit_02 -> castle, kit, 02）
+WORD_PATTERN = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+|[^\W\d_a-zA-Z]+")
+# 至少4个字符的查询词才允许1处拼写错误，避免短词匹配到大量无关资源
+MIN_TYPO_LENGTH = 4
+# 单词首字母缩写至少2个字符才参与匹配
+MIN_INITIALS_LENGTH = 2
+
+# 单个查询词的得分：完全相同 > 名称开头 > 单词开头 > 首字母缩写 > 名称中间 > 拼写容错 > 分类/路径/README
+SCORE_EXACT = 100
+SCORE_PREFIX = 90
+SCORE_WORD_BOUNDARY = 75
+SCORE_INITIALS = 70
+SCORE_SUBSTRING = 55
+SCORE_TYPO = 45
+SCORE_OTHER = 30
+# 名称和拼写容错匹配时，查询词覆盖名称的比例越高得分越高（最多加COVERAGE_WEIGHT分）
+COVERAGE_WEIGHT = 5
+# 最近添加的资源加分，每过RECENCY_HALF_LIFE_DAYS天减半
+RECENCY_WEIGHT = 10
+RECENCY_HALF_LIFE_DAYS = 30
+RECENCY_HALF_LIFE = RECENCY_HALF_LIFE_DAYS * 86400
+# 衰减系数相对此时间（2020-01-01 UTC）预先计算，查询时只需乘以当前时间对应的系数
+RECENCY_EPOCH = 1577836800
+
+
+def split_words(name: str) -> List[re.Match]:
+    """拆分名称中的单词"""
+    return list(WORD_PATTERN.finditer(name or ""))
+
+
+def _deletes(word: str) -> Set[str]:
+    """删除一个字符得到的所有变体"""
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    """a和b之间是否最多相差1处编辑（插入、删除、替换或相邻字符交换）"""
+    if a == b:
+        return True
+    len_a, len_b = len(a), len(b)
+    if abs(len_a - len_b) > 1:
+        return False
+    # 跳过相同的前缀
+    i = 0
+    while i < len_a and i < len_b and a[i] == b[i]:
+        i += 1
+    if len_a == len_b:
+        if a[i + 1:] == b[i + 1:]:
+            return True
+        return i + 1 < len_a and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]
+    if len_a > len_b:
+        return a[i + 1:] == b[i:]
+    return a[i:] == b[i + 1:]
+
+
+def _recency_factor(value: str) -> float:
+    """添加时间的衰减系数 2^((添加时间-RECENCY_EPOCH)/半衰期)，没有添加时间时为0
+
+    添加时间晚于当前时间（时钟调整）时按当前时间计算，保证加分不超过RECENCY_WEIGHT。
+    """
+    if not value:
+        return 0.0
+    try:
+        added = min(datetime.fromisoformat(value).timestamp(), time.time())
+        return 2.0 ** ((added - RECENCY_EPOCH) / RECENCY_HALF_LIFE)
+    except (TypeError, ValueError, OverflowError):
+        return 0.0
+
+
+def _profile(resource: Dict) -> Tuple[str, FrozenSet[int], FrozenSet[str], str, float, float]:
+    """预先计算资源的匹配信息：(小写名称, 单词起始位置, 单词, 首字母缩写, 添加时间衰减系数, 每个字符的覆盖度得分)"""
+    name = resource.get('name', '') or ''
+    matches = split_words(name)
+    return (name.lower(),
+            frozenset(match.start() for match in matches),
+            frozenset(match.group().lower() for match in matches),
+            "".join(match.group()[0] for match in matches).lower(),
+            _recency_factor(resource.get('date_added', '')),
+            COVERAGE_WEIGHT / len(name) if name else 0.0)
+
+
+class FuzzyIndex:
+    """模糊搜索结构 - 拼写容错和相关度排序
+
+    每个资源预先拆分名称单词、记录单词边界、首字母缩写和添加时间；
+    名称单词的删除一个字符变体建立索引（SymSpell），查询时只需查找查询词自身的变体，
+    不需要逐个计算编辑距离。线程安全由SearchIndex的锁保证。
+    """
+
+    def __init__(self):
+        self._profiles: Dict[str, Tuple] = {}
+        # {单词: {资源id}}
+        self._words: Dict[str, Set[str]] = {}
+        # {删除变体: {单词}}
+        self._variants: Dict[str, Set[str]] = {}
+        # {首字母缩写前缀: {资源id}}
+        self._initials: Dict[str, Set[str]] = {}
+
+    def add(self, resource: Dict):
+        resource_id = resource['id']
+        self.remove(resource_id)
+        profile = self._profiles[resource_id] = _profile(resource)
+        for word in profile[2]:
+            ids = self._words.get(word)
+            if ids is None:
+                self._words[word] = {resource_id}
+                if len(word) >= MIN_TYPO_LENGTH - 1:
+                    for variant in _deletes(word) | {word}:
+                        self._variants.setdefault(variant, set()).add(word)
+            else:
+                ids.add(resource_id)
+        for prefix in self._initial_prefixes(profile[3]):
+            self._initials.setdefault(prefix, set()).add(resource_id)
+
+    def remove(self, resource_id: str):
+        profile = self._profiles.pop(resource_id, None)
+        if profile is None:
+            return
+        for word in profile[2]:
+            ids = self._words.get(word)
+            if ids is None:
+                continue
+            ids.discard(resource_id)
+            if not ids:
+                del self._words[word]
+                if len(word) >= MIN_TYPO_LENGTH - 1:
+                    for variant in _deletes(word) | {word}:
+                        words = self._variants.get(variant)
+                        if words is not None:
+                            words.discard(word)
+                            if not words:
+                                del self._variants[variant]
+        for prefix in self._initial_prefixes(profile[3]):
+            ids = self._initials.get(prefix)
+            if ids is not None:
+                ids.discard(resource_id)
+                if not ids:
+                    del self._initials[prefix]
+
+    @staticmethod
+    def _initial_prefixes(initials: str) -> List[str]:
+        return [initials[:i] for i in range(MIN_INITIALS_LENGTH, len(initials) + 1)]
+
+    # ---- 查询 ----
+
+    def match_typos(self, term: str) -> Set[str]:
+        """名称中有单词与term相差1处编辑的资源"""
+        if len(term) < MIN_TYPO_LENGTH:
+            return set()
+        words = set()
+        for variant in _deletes(term) | {term}:
+            words |= self._variants.get(variant, set())
+        result = set()
+        for word in words:
+            if within_one_edit(term, word):
+                result |= self._words[word]
+        return result
+
+    def match_initials(self, term: str) -> Set[str]:
+        """名称单词首字母缩写以term开头的资源（如ck匹配Castle_Kit）"""
+        if len(term) < MIN_INITIALS_LENGTH:
+            return set()
+        return set(self._initials.get(term, ()))
+
+    def score(self, terms: List[str], ids: Set[str], typo_ids: Dict[str, Set[str]]) -> Dict[str, float]:
+        """计算资源的相关度得分，typo_ids为每个查询词拼写容错命中的资源"""
+        # RECENCY_WEIGHT * 2^(-(当前时间-添加时间)/半衰期) = recency * scale
+        scale = RECENCY_WEIGHT * 2.0 ** ((RECENCY_EPOCH - time.time()) / RECENCY_HALF_LIFE)
+        terms = [(term, len(term), len(term) >= MIN_INITIALS_LENGTH, typo_ids.get(term, ())) for term in terms]
+        profiles = self._profiles
+        if len(ids) * 4 > len(profiles):
+            # 范围较大时按添加顺序遍历，内存访问连续，比逐个查找更快
+            ids = [resource_id for resource_id in profiles if resource_id in ids]
+        scores = {}
+        for resource_id, (name, boundaries, _, initials, recency, coverage) in zip(ids, map(profiles.__getitem__, ids)):
+            total = recency * scale
+            for term, length, use_initials, typos in terms:
+                position = name.find(term)
+                if position == 0:
+                    total += (SCORE_EXACT if name == term else SCORE_PREFIX) + coverage * length
+                elif position > 0:
+                    total += (SCORE_WORD_BOUNDARY if position in boundaries else SCORE_SUBSTRING) + coverage * length
+                elif use_initials and initials.startswith(term):
+                    total += SCORE_INITIALS
+                elif resource_id in typos:
+                    total += SCORE_TYPO + coverage * length
+                else:
+                    total += SCORE_OTHER
+            scores[resource_id] = total
+        return scores
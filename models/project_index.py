@@ -0,0 +1,99 @@
+import os
+import json
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# 2: 子目录列表不再包含工程根目录下被跳过的大型目录
+INDEX_VERSION = 2
+TEMP_SUFFIX = ".tmp"
+
+
+class ProjectIndex:
+    """工程扫描索引 - 记录已访问目录的修改时间、子目录及其中的.uproject文件
+
+    目录的修改时间只会在其直接子项增删时变化，因此修改时间未变的目录
+    可以直接复用上次的列表结果，无需再次读取目录内容。
+    """
+
+    def __init__(self, index_file: str):
+        self.index_file = index_file
+        # {目录路径: [修改时间(ns), [需要进入的子目录名], [.uproject文件名]]}
+        self.dirs: Dict[str, list] = {}
+        # 本次扫描访问过的目录
+        self.visited: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> bool:
+        """加载索引文件，文件不存在或损坏时返回False（需要完整扫描）"""
+        self.dirs = {}
+        if not os.path.exists(self.index_file):
+            return False
+
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION or not isinstance(data.get("dirs"), dict):
+                print("工程索引版本不匹配，将重新完整扫描")
+                return False
+            self.dirs = data["dirs"]
+            return True
+        except (json.JSONDecodeError, IOError, AttributeError) as e:
+            print(f"工程索引读取错误: {e}，将重新完整扫描")
+            self.dirs = {}
+            return False
+
+    def save(self, scanned_tops: Optional[List[str]] = None) -> bool:
+        """保存索引，只替换本次扫描覆盖范围内的目录记录"""
+        with self._lock:
+            if scanned_tops is None:
+                merged = dict(self.visited)
+            else:
+                tops = set(scanned_tops)
+                prefixes = tuple(_as_prefix(top) for top in scanned_tops)
+                merged = {path: entry for path, entry in self.dirs.items()
+                          if path not in tops and not path.startswith(prefixes)}
+                merged.update(self.visited)
+            self.dirs = merged
+            self.visited = {}
+
+        # 先写入临时文件再原子替换，写入中途崩溃不会损坏原来的索引
+        temp_file = self.index_file + TEMP_SUFFIX
+        try:
+            os.makedirs(os.path.dirname(self.index_file) or ".", exist_ok=True)
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump({"version": INDEX_VERSION, "dirs": self.dirs}, f,
+                          ensure_ascii=False, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.index_file)
+            return True
+        except IOError as e:
+            print(f"工程索引保存失败: {e}")
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+            return False
+
+    def clear(self):
+        """清空索引，下次扫描将完整遍历"""
+        self.dirs = {}
+        self.visited = {}
+
+    def lookup(self, path: str, mtime_ns: int) -> Optional[Tuple[List[str], List[str]]]:
+        """查询目录缓存，修改时间一致时返回(子目录名, 工程文件名)"""
+        entry = self.dirs.get(path)
+        if entry is None or entry[0] != mtime_ns:
+            return None
+        # 字典单项读写在多线程下是原子的，扫描线程之间无需加锁
+        self.visited[path] = entry
+        return entry[1], entry[2]
+
+    def store(self, path: str, mtime_ns: int, subdirs: List[str], project_files: List[str]):
+        """记录目录的列表结果"""
+        self.visited[path] = [mtime_ns, subdirs, project_files]
+
+
+def _as_prefix(path: str) -> str:
+    """将目录转换为用于前缀匹配的形式（以分隔符结尾）"""
+    return path if path.endswith(os.sep) else path + os.sep
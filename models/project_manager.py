@@ -1,9 +1,14 @@
 import os
 import json
 import time
+import threading
 from datetime import datetime
 from typing import List, Dict, Optional
 from utils.config_manager import ConfigManager, get_user_config_dir
+from models.project_scanner import (ProjectScanner, ScanJob, get_scan_partitions, resolve_scan_roots,
+                                    DEFAULT_EXCLUDE_PATHS, DEFAULT_MAX_DEPTH)
+from models.project_index import ProjectIndex
+from models.project_watcher import ProjectWatcher, inotify_available
 
 # 定义默认项目配置
 DEFAULT_PROJECTS_CONFIG = {
@@ -11,8 +16,15 @@ DEFAULT_PROJECTS_CONFIG = {
     "last_updated": "",
     "settings": {
         "auto_scan": True,
+        # 扫描模式：full 扫描所有磁盘，targeted 只扫描scan_paths、最近工程目录和默认工程目录
+        "scan_mode": "full",
+        # 每项可以是路径，也可以是 {"path": 路径, "max_depth": 深度}
         "scan_paths": ["C:\\"],
         "exclude_paths": ["C:\\Windows", "C:\\Program Files"],
+        "max_depth": DEFAULT_MAX_DEPTH,
+        # 扫描预算：最长耗时（秒）和最多读取的目录数，0表示不限制
+        "scan_time_budget": 0,
+        "scan_entry_budget": 0,
         "max_projects": 50
     },
     "version": "1.0.0"
@@ -21,7 +33,14 @@ DEFAULT_PROJECTS_CONFIG = {
 class ProjectManager:
     """虚幻引擎工程管理器"""
     
-    def __init__(self):
+    # 轮询模式下重新扫描根目录、发现新建工程的间隔（秒）
+    RESCAN_INTERVAL = 300.0
+    
+    def __init__(self, journal: bool = False):
+        """
+        Args:
+            journal: ue_projects.json是否开启追加日志模式（见ConfigManager），默认关闭
+        """
         self.projects = []
         # 获取用户配置目录
         config_dir = get_user_config_dir()
@@ -31,11 +50,31 @@ class ProjectManager:
         self.config_manager = ConfigManager(
             config_file=self.config_file,
             current_version="1.0.0",
-            default_config=DEFAULT_PROJECTS_CONFIG
+            default_config=DEFAULT_PROJECTS_CONFIG,
+            # 开启日志模式时修改只追加到日志
+            journal=journal
         )
         # 加载配置
         self.config = self.config_manager.load_config()
         self.recent_projects = self.config.get("recent_projects", [])
+        # 增量扫描索引，首次搜索时加载
+        self.index = ProjectIndex(os.path.join(config_dir, "ue_projects_index.json"))
+        # 当前扫描任务，新扫描会取代正在进行的扫描
+        self.scan_job = None
+        self._job_lock = threading.Lock()
+        # 同一时间只运行一个扫描，被取代的扫描退出后新扫描才开始
+        self._scan_lock = threading.Lock()
+        # 最近一次完整扫描的根目录，供目录监视使用
+        self.scan_roots = []
+        # 工程目录监视器及工程变化监听者
+        self.watcher = None
+        # 监视器的启动和停止可以在后台线程中进行，以最后一次调用为准
+        self._watch_lock = threading.Lock()
+        self._watch_generation = 0
+        # 监视器定期重新扫描使用的扫描任务，停止监视时取消
+        self._rescan_job = None
+        self._change_listeners = []
+        self._projects_lock = threading.Lock()
     
     def load_config(self):
         """加载配置文件"""
@@ -108,120 +147,197 @@ class ProjectManager:
         
         return running_processes
     
-    def search_ue_projects(self, progress_callback=None) -> List[Dict]:
-        """搜索系统中的UE工程文件"""
-        projects = []
+    def start_scan_job(self) -> ScanJob:
+        """创建新的扫描任务，并取消正在进行的扫描"""
+        with self._job_lock:
+            if self.scan_job is not None:
+                self.scan_job.cancel()
+            self.scan_job = ScanJob()
+            return self.scan_job
+    
+    def cancel_scan(self):
+        """取消正在进行的扫描"""
+        with self._job_lock:
+            if self.scan_job is not None:
+                self.scan_job.cancel()
+    
+    def pause_scan(self):
+        """暂停正在进行的扫描"""
+        if self.scan_job is not None:
+            self.scan_job.pause()
+    
+    def resume_scan(self):
+        """继续已暂停的扫描"""
+        if self.scan_job is not None:
+            self.scan_job.resume()
+    
+    def is_scanning(self) -> bool:
+        """是否有扫描正在进行"""
+        job = self.scan_job
+        return job is not None and not job.finished.is_set()
+    
+    def get_scan_roots(self) -> List[tuple]:
+        """根据扫描模式获取扫描根目录，返回 [(根目录, 最大深度)]"""
+        settings = self.config.get("settings", {})
+        max_depth = settings.get("max_depth", DEFAULT_MAX_DEPTH)
         
-        try:
-            # 尝试导入psutil，如果失败则使用备用方案
-            import psutil
-            partitions = psutil.disk_partitions()
-        except ImportError:
-            print("未安装psutil库，使用备用方案")
-            # 备用方案：只搜索常见的磁盘驱动器
-            import string
-            partitions = []
-            for letter in string.ascii_uppercase:
-                drive = f"{letter}:\\"
-                if os.path.exists(drive):
-                    partitions.append(type('Partition', (), {'mountpoint': drive, 'opts': '', 'fstype': 'NTFS'})())
+        if settings.get("scan_mode", "full") == "targeted":
+            roots = resolve_scan_roots(settings.get("scan_paths", []), self.recent_projects, max_depth)
+            if roots:
+                return roots
+            print("未找到可用的扫描目录，改为扫描所有磁盘")
         
-        # 获取排除路径设置
-        exclude_paths = self.config.get("settings", {}).get("exclude_paths", [
-            'appdata\\roaming',  # 屏蔽 AppData\Roaming 目录
-            'appdata\\local',    # 屏蔽 AppData\Local 目录  
-            'temp',               # 临时文件目录
-            '$recycle.bin',       # 回收站
-            'system volume information',  # 系统信息
-            'windows',            # Windows 系统目录
-            'program files',      # 程序安装目录
-            'programdata\\epic\\epicgameslauncher\\vaultcache',  # Epic 缓存目录
-            '.vs',                # Visual Studio 缓存
-            '.vscode',            # VS Code 缓存
-            'node_modules',       # Node.js 模块
-            '.git',               # Git 仓库
-            '__pycache__',        # Python 缓存
-        ])
+        return [(drive, max_depth) for drive in get_scan_partitions()]
+    
+    def search_ue_projects(self, progress_callback=None, full_rescan=False, project_callback=None,
+                           job: Optional[ScanJob] = None) -> List[Dict]:
+        """搜索系统中的UE工程文件 - 各磁盘并行扫描，只重新读取修改过的目录
         
-        total_partitions = len(partitions)
+        project_callback会在扫描线程中对每个找到的工程调用一次，无需等待扫描结束。
+        未传入job时会创建新的扫描任务并取代正在进行的扫描；被取消的扫描返回部分结果，
+        且不会覆盖工程列表。
+        """
+        if job is None:
+            job = self.start_scan_job()
         
-        for i, partition in enumerate(partitions):
-            try:
-                # 跳过网络驱动器和光驱
-                if hasattr(partition, 'opts') and 'cdrom' in partition.opts:
-                    continue
-                if hasattr(partition, 'fstype') and partition.fstype == '':
-                    continue
-                    
-                drive = partition.mountpoint
-                print(f"正在搜索磁盘: {drive}")
+        try:
+            with self._scan_lock:
+                # 等待期间已被更新的扫描取代
+                if job.cancelled:
+                    return []
                 
-                # 搜索该磁盘下的.uproject文件
-                for root, dirs, files in os.walk(drive):
-                    # 检查是否在屏蔽路径列表中
-                    root_lower = root.lower()
-                    should_skip = False
-                    
-                    for excluded in exclude_paths:
-                        if excluded in root_lower:
-                            should_skip = True
-                            break
-                    
-                    if should_skip:
-                        dirs.clear()  # 不深入这些目录
-                        continue
-                    
-                    for file in files:
-                        if file.lower().endswith('.uproject'):
-                            project_path = os.path.join(root, file)
-                            
-                            # 再次检查完整路径是否包含屏蔽关键词
-                            project_path_lower = project_path.lower()
-                            is_excluded = False
-                            
-                            for excluded in exclude_paths:
-                                if excluded in project_path_lower:
-                                    is_excluded = True
-                                    break
-                            
-                            if not is_excluded:
-                                # 获取文件信息
-                                try:
-                                    stat = os.stat(project_path)
-                                    project_info = {
-                                        'name': os.path.splitext(file)[0],
-                                        'path': project_path,
-                                        'dir': root,
-                                        'size': stat.st_size,
-                                        'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                                        'created': datetime.fromtimestamp(stat.st_ctime).isoformat()
-                                    }
-                                    projects.append(project_info)
-                                    print(f"找到UE工程: {project_path}")
-                                except Exception as e:
-                                    print(f"获取文件信息失败 {project_path}: {e}")
-                    
-                    # 限制搜索深度，避免过深递归
-                    if root.count(os.sep) - drive.count(os.sep) > 6:
-                        dirs.clear()
+                settings = self.config.get("settings", {})
+                roots = self.get_scan_roots()
+                drives = [root for root, _ in roots]
                 
-                # 更新进度
-                if progress_callback:
-                    progress_callback((i + 1) / total_partitions)
-                    
-            except (PermissionError, OSError) as e:
-                print(f"无法访问磁盘 {partition.mountpoint}: {e}")
-                continue
+                # 获取排除路径设置
+                exclude_paths = settings.get("exclude_paths", DEFAULT_EXCLUDE_PATHS)
+                
+                # 索引缺失或损坏时load返回False，此时索引为空，相当于完整扫描
+                if full_rescan:
+                    self.index.clear()
+                elif not self.index.dirs:
+                    self.index.load()
+                
+                scanner = ProjectScanner(exclude_paths=exclude_paths, index=self.index,
+                                         time_budget=settings.get("scan_time_budget", 0),
+                                         entry_budget=settings.get("scan_entry_budget", 0))
+                projects = scanner.scan(roots, progress_callback, project_callback, job)
+                
+                if job.cancelled:
+                    # 只合并已访问的目录，不清理未访问到的索引记录
+                    self.index.save([])
+                    return projects
+                # 预算用尽时同样不清理未访问到的索引记录，但保留已找到的工程
+                self.index.save([] if scanner.budget_exhausted else drives)
+                
+                # 按修改时间排序
+                projects.sort(key=lambda x: x['modified'], reverse=True)
+                with self._projects_lock:
+                    self.projects = projects
+                self.scan_roots = drives
+                return projects
+        finally:
+            job.finished.set()
+    
+    def add_change_listener(self, listener):
+        """添加工程变化监听者 listener(event, project)，在监视线程中调用"""
+        if listener not in self._change_listeners:
+            self._change_listeners.append(listener)
+    
+    def remove_change_listener(self, listener):
+        """移除工程变化监听者"""
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+    
+    def start_watching(self, poll_interval: float = 5.0, wait: bool = True):
+        """监视当前工程列表和扫描根目录，工程变化时直接更新列表，无需重新扫描
+        
+        重启监视器需要等待旧的监视线程退出并逐个读取工程状态，wait为False时在后台线程中进行，
+        不阻塞界面线程。
+        """
+        generation = self._next_watch_generation()
+        self._run_watch_action(lambda: self._start_watcher(poll_interval), generation, wait)
+    
+    def stop_watching(self, wait: bool = True):
+        """停止监视工程目录，wait为False时在后台线程中等待监视线程退出"""
+        generation = self._next_watch_generation()
+        self._run_watch_action(self._stop_watcher, generation, wait)
+    
+    def _next_watch_generation(self) -> int:
+        with self._watch_lock:
+            self._watch_generation += 1
+            return self._watch_generation
+    
+    def _run_watch_action(self, action, generation: int, wait: bool):
+        def run():
+            with self._watch_lock:
+                # 之后又调用了start_watching或stop_watching时，以最后一次为准
+                if generation == self._watch_generation:
+                    action()
+        
+        if wait:
+            run()
+        else:
+            threading.Thread(target=run, name="ProjectWatcherControl", daemon=True).start()
+    
+    def _start_watcher(self, poll_interval: float):
+        if self.watcher is None:
+            self.watcher = ProjectWatcher(self._on_project_changed, poll_interval,
+                                          rescan=self._rescan_for_watcher, rescan_interval=self.RESCAN_INTERVAL)
+        max_depth = self.config.get("settings", {}).get("max_depth", DEFAULT_MAX_DEPTH)
+        self.watcher.start(list(self.projects), self.scan_roots, max_depth)
+    
+    def _stop_watcher(self):
+        job = self._rescan_job
+        if job is not None:
+            job.cancel()
+        if self.watcher is not None:
+            self.watcher.stop()
+    
+    def _rescan_for_watcher(self) -> Optional[List[Dict]]:
+        """轮询模式下由监视线程定期调用：使用扫描索引重新扫描（只重新读取修改过的目录），
+        有其他扫描正在进行或被取代时返回None"""
+        if self.is_scanning():
+            return None
+        job = self.start_scan_job()
+        self._rescan_job = job
+        try:
+            projects = self.search_ue_projects(job=job)
+        finally:
+            self._rescan_job = None
+        return None if job.cancelled else projects
+    
+    def watch_description(self) -> str:
+        """工程目录监视方式及其限制，供界面显示"""
+        max_depth = self.config.get("settings", {}).get("max_depth", DEFAULT_MAX_DEPTH)
+        if inotify_available():
+            return (f"扫描目录下新建的工程会自动显示（与扫描深度 {max_depth} 一致，"
+                    f"最多监视 {ProjectWatcher.MAX_WATCHES} 个目录），其他位置的工程请点击刷新")
+        return (f"已知工程的修改会自动更新；新建的工程每 {round(self.RESCAN_INTERVAL / 60)} 分钟"
+                f"重新扫描一次后显示，也可点击刷新")
+    
+    def _on_project_changed(self, event: str, project: Dict):
+        """工程新增、删除或修改时更新工程列表并通知监听者"""
+        with self._projects_lock:
+            projects = [p for p in self.projects if p['path'] != project['path']]
+            if event != "removed":
+                projects.append(project)
+                projects.sort(key=lambda x: x['modified'], reverse=True)
+            self.projects = projects
         
-        # 按修改时间排序
-        projects.sort(key=lambda x: x['modified'], reverse=True)
-        self.projects = projects
-        return projects
+        action = {"added": "新增", "removed": "删除", "modified": "修改"}.get(event, event)
+        print(f"工程{action}: {project['path']}")
+        for listener in list(self._change_listeners):
+            try:
+                listener(event, project)
+            except Exception as e:
+                print(f"工程变化通知出错: {e}")
     
     def get_projects(self) -> List[Dict]:
         """获取所有工程"""
-        # 如果还没有工程列表，先进行搜索
-        if not self.projects:
+        # 如果还没有工程列表，先进行搜索（已有扫描在进行时不重复搜索）
+        if not self.projects and not self.is_scanning():
             return self.refresh_projects()
         return self.projects
     
@@ -299,8 +415,6 @@ class ProjectManager:
             print(f"读取工程信息失败: {e}")
             return None
     
-    def refresh_projects(self, progress_callback=None):
+    def refresh_projects(self, progress_callback=None, full_rescan=False):
         """刷新工程列表"""
-        projects = self.search_ue_projects(progress_callback)
-        self.projects = projects  # 确保更新内部工程列表
-        return projects
\ No newline at end of file
+        return self.search_ue_projects(progress_callback, full_rescan)
\ No newline at end of file
@@ -0,0 +1,422 @@
+import os
+import time
+import string
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import List, Dict, Optional, Callable, Iterable, Tuple, Union
+from models.project_index import ProjectIndex
+from utils.path_matcher import PathMatcher
+
+# 默认屏蔽规则（目录名、相对路径片段、绝对路径前缀或通配符，见PathMatcher）
+DEFAULT_EXCLUDE_PATHS = [
+    'appdata\\roaming',  # 屏蔽 AppData\Roaming 目录
+    'appdata\\local',    # 屏蔽 AppData\Local 目录
+    'temp',               # 临时文件目录
+    '$recycle.bin',       # 回收站
+    'system volume information',  # 系统信息
+    'windows',            # Windows 系统目录
+    'program files',      # 程序安装目录
+    'programdata\\epic\\epicgameslauncher\\vaultcache',  # Epic 缓存目录
+    '.vs',                # Visual Studio 缓存
+    '.vscode',            # VS Code 缓存
+    'node_modules',       # Node.js 模块
+    '.git',               # Git 仓库
+    '__pycache__',        # Python 缓存
+]
+
+
+def get_scan_partitions() -> List[str]:
+    """获取需要扫描的磁盘挂载点列表"""
+    try:
+        # 尝试导入psutil，如果失败则使用备用方案
+        import psutil
+        partitions = psutil.disk_partitions()
+    except ImportError:
+        print("未安装psutil库，使用备用方案")
+        # 备用方案：只搜索常见的磁盘驱动器
+        partitions = []
+        for letter in string.ascii_uppercase:
+            drive = f"{letter}:\\"
+            if os.path.exists(drive):
+                partitions.append(type('Partition', (), {'mountpoint': drive, 'opts': '', 'fstype': 'NTFS'})())
+
+    drives = []
+    for partition in partitions:
+        # 跳过网络驱动器和光驱
+        if hasattr(partition, 'opts') and 'cdrom' in partition.opts:
+            continue
+        if hasattr(partition, 'fstype') and partition.fstype == '':
+            continue
+        if partition.mountpoint not in drives:
+            drives.append(partition.mountpoint)
+    return drives
+
+
+# 默认最大搜索深度（相对扫描根目录）
+DEFAULT_MAX_DEPTH = 6
+
+# 工程根目录（包含.uproject）下不可能包含其他工程的大型目录，扫描时跳过
+PROJECT_PRUNE_DIRS = frozenset(['content', 'intermediate', 'saved', 'deriveddatacache', 'binaries'])
+
+
+def get_default_project_dirs() -> List[str]:
+    """获取虚幻引擎默认的工程目录（文档/Unreal Projects）"""
+    home = os.path.expanduser("~")
+    return [
+        os.path.join(home, "Documents", "Unreal Projects"),
+        os.path.join(home, "OneDrive", "Documents", "Unreal Projects"),
+    ]
+
+
+def resolve_scan_roots(scan_paths: Iterable[Union[str, Dict]], recent_projects: Iterable[Dict] = (),
+                       default_depth: int = DEFAULT_MAX_DEPTH) -> List[Tuple[str, int]]:
+    """整理定向扫描的根目录，返回 [(根目录, 最大深度)]
+
+    scan_paths中每一项可以是路径字符串，也可以是 {"path": 路径, "max_depth": 深度}。
+    最近打开工程所在目录的上一级和默认工程目录也会加入扫描，不存在的目录会被忽略，
+    已被上级根目录的深度覆盖的子目录会被合并。
+    """
+    candidates = []
+    for item in scan_paths or []:
+        if isinstance(item, dict):
+            path = item.get("path")
+            depth = item.get("max_depth", default_depth)
+        else:
+            path, depth = item, default_depth
+        if path:
+            candidates.append((path, int(depth)))
+
+    # 最近打开的工程通常与其他工程放在同一个目录下，只需浅层扫描
+    for project in recent_projects or []:
+        project_dir = project.get('dir') or os.path.dirname(project.get('path', ''))
+        if project_dir:
+            candidates.append((os.path.dirname(project_dir), 2))
+
+    for path in get_default_project_dirs():
+        candidates.append((path, 2))
+
+    roots = {}
+    for path, depth in candidates:
+        path = os.path.normpath(os.path.expanduser(path))
+        if not os.path.isdir(path):
+            continue
+        roots[path] = max(depth, roots.get(path, depth))
+
+    result = []
+    for path, depth in roots.items():
+        covered = False
+        for other, other_depth in roots.items():
+            if other == path:
+                continue
+            prefix = other if other.endswith(os.sep) else other + os.sep
+            if path.startswith(prefix):
+                relative = path[len(prefix):].count(os.sep) + 1
+                if relative + depth <= other_depth:
+                    covered = True
+                    break
+        if not covered:
+            result.append((path, depth))
+    return result
+
+
+def _relative_depth(path: str, root: str) -> int:
+    """path相对root的深度，root的直接子目录为0（与原来从磁盘根目录扫描时一致）；
+    去掉结尾的分隔符再计算，磁盘根目录（C:\\、/）与普通目录（D:\\Projects）一致"""
+    return path.rstrip(os.sep).count(os.sep) - root.rstrip(os.sep).count(os.sep) - 1
+
+
+class ScanJob:
+    """工程扫描任务 - 支持取消、暂停和继续，扫描线程在每个目录之间检查状态"""
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+        self.finished = threading.Event()
+
+    def cancel(self):
+        """取消扫描（暂停中的扫描线程也会被唤醒并退出）"""
+        self._cancelled.set()
+        self._running.set()
+
+    def pause(self):
+        """暂停扫描"""
+        if not self._cancelled.is_set():
+            self._running.clear()
+
+    def resume(self):
+        """继续扫描"""
+        self._running.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    def checkpoint(self) -> bool:
+        """扫描检查点：暂停时在此等待，返回是否应继续扫描"""
+        self._running.wait()
+        return not self._cancelled.is_set()
+
+
+class ProjectScanner:
+    """并行工程扫描器 - 将每个磁盘及其顶层子目录分配到线程池中同时遍历"""
+
+    def __init__(self, exclude_paths: Optional[List[str]] = None, max_depth: int = DEFAULT_MAX_DEPTH,
+                 max_workers: Optional[int] = None, index: Optional[ProjectIndex] = None,
+                 time_budget: float = 0, entry_budget: int = 0, prune_project_dirs: bool = True):
+        # 屏蔽规则每次扫描只编译一次
+        self.exclude = PathMatcher(exclude_paths if exclude_paths is not None else DEFAULT_EXCLUDE_PATHS)
+        self.max_depth = max_depth
+        # 是否跳过工程根目录下的大型目录和插件目录
+        self.prune_project_dirs = prune_project_dirs
+        # 扫描预算：最长耗时（秒）和最多读取的目录数，0表示不限制
+        self.time_budget = time_budget
+        self.entry_budget = entry_budget
+        # 预算用尽时扫描提前结束，结果不完整
+        self.budget_exhausted = False
+        self._deadline = None
+        self._entry_counter = itertools.count(1)
+        # 遍历以IO为主，线程数可以超过CPU核数
+        self.max_workers = max_workers or min(16, (os.cpu_count() or 1) * 4)
+        # 增量扫描索引（可选），目录修改时间未变时复用上次的列表结果
+        self.index = index
+        self._project_callback = None
+        self._job = None
+        self._seen_paths = set()
+        self._seen_lock = threading.Lock()
+
+    def scan(self, drives: List[Union[str, Tuple[str, int]]],
+             progress_callback: Optional[Callable[[float], None]] = None,
+             project_callback: Optional[Callable[[Dict], None]] = None,
+             job: Optional[ScanJob] = None) -> List[Dict]:
+        """扫描所有磁盘（或指定的根目录），返回合并后的工程列表
+
+        drives中每一项可以是路径，也可以是(路径, 最大深度)，未指定深度时使用max_depth。
+        project_callback会在扫描线程中对每个新找到的工程调用一次，用于在扫描结束前
+        就把结果推送给界面。传入job时可以随时取消或暂停扫描，取消后返回已找到的部分结果。
+        """
+        projects = []
+        self._project_callback = project_callback
+        self._job = job
+        self.budget_exhausted = False
+        self._deadline = time.monotonic() + self.time_budget if self.time_budget else None
+        self._entry_counter = itertools.count(1)
+        roots = [item if isinstance(item, tuple) else (item, self.max_depth) for item in drives]
+        drives = [root for root, _ in roots]
+        # 挂载点可能互相嵌套，所有扫描线程共用一个已找到路径集合去重
+        self._seen_paths = set()
+
+        # 拆分扫描任务：每个磁盘的根目录直接处理，每个顶层子目录作为一个任务
+        tasks = []
+        for drive, max_depth in roots:
+            if not self._checkpoint():
+                return projects
+            print(f"正在搜索磁盘: {drive}")
+            tasks.extend(self._split_drive(drive, drives, projects, max_depth))
+
+        if not tasks:
+            if progress_callback:
+                progress_callback(1.0)
+            return projects
+
+        total_tasks = len(tasks)
+        finished = 0
+        workers = max(1, min(self.max_workers, total_tasks))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ProjectScan") as pool:
+            futures = [pool.submit(self._walk_task, *task) for task in tasks]
+            for future in as_completed(futures):
+                try:
+                    projects.extend(future.result())
+                except Exception as e:
+                    print(f"扫描任务出错: {e}")
+
+                # 更新进度
+                finished += 1
+                if progress_callback:
+                    progress_callback(finished / total_tasks)
+
+        return projects
+
+    def _checkpoint(self) -> bool:
+        """检查扫描任务状态和预算，返回是否应继续扫描"""
+        if self._job is not None and not self._job.checkpoint():
+            return False
+        if self.budget_exhausted:
+            return False
+        # itertools.count的next在多线程下是原子的
+        if self.entry_budget and next(self._entry_counter) > self.entry_budget:
+            print(f"已达到扫描目录数量上限 {self.entry_budget}，提前结束扫描")
+            self.budget_exhausted = True
+            return False
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            print(f"已达到扫描时间上限 {self.time_budget} 秒，提前结束扫描")
+            self.budget_exhausted = True
+            return False
+        return True
+
+    def _split_drive(self, drive: str, drives: List[str], root_projects: List[Dict],
+                     max_depth: int) -> List[tuple]:
+        """将磁盘拆分为多个可并行的扫描任务，同时收集根目录中的工程"""
+        if self.exclude.matches(drive):
+            return []
+
+        listing = self._list_dir(drive)
+        if listing is None:
+            print(f"无法访问磁盘 {drive}")
+            return []
+
+        subdirs, project_entries = listing
+        self._collect_projects(drive, project_entries, root_projects)
+
+        tasks = []
+        for name, mtime_ns in subdirs:
+            top = os.path.join(drive, name)
+            # 其他分区的挂载点由各自的任务负责
+            if top in drives or self.exclude.match_entry(top):
+                continue
+            tasks.append((top, drive, mtime_ns, max_depth))
+        return tasks
+
+    def _list_dir(self, root: str, mtime_ns: Optional[int] = None):
+        """列出目录中的子目录和.uproject文件
+
+        返回 ([(子目录名, 修改时间)], [(工程文件名, 文件状态)])，修改时间和文件状态
+        直接取自DirEntry的缓存，未知时为None。启用索引且目录修改时间未变时直接使用索引缓存。
+        返回的子目录已去掉不需要进入的目录（见_prune_subdirs）。
+        """
+        if self.index is not None:
+            if mtime_ns is None:
+                try:
+                    mtime_ns = os.stat(root).st_mtime_ns
+                except OSError:
+                    return None
+
+            cached = self.index.lookup(root, mtime_ns)
+            if cached is not None:
+                subdir_names, project_files = cached
+                return [(name, None) for name in subdir_names], [(name, None) for name in project_files]
+
+        subdirs = []
+        project_entries = []
+        is_plugin = False
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    try:
+                        # is_dir使用目录项自带的类型信息，通常不需要额外的系统调用
+                        if entry.is_dir(follow_symlinks=False):
+                            # 子目录的修改时间只在启用索引时需要
+                            child_mtime = entry.stat(follow_symlinks=False).st_mtime_ns if self.index is not None else None
+                            subdirs.append((entry.name, child_mtime))
+                        else:
+                            name = entry.name.lower()
+                            if name.endswith('.uproject'):
+                                project_entries.append((entry.name, entry.stat()))
+                            elif name.endswith('.uplugin'):
+                                is_plugin = True
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+
+        if self.prune_project_dirs:
+            subdirs = self._prune_subdirs(subdirs, bool(project_entries), is_plugin)
+
+        if self.index is not None:
+            self.index.store(root, mtime_ns,
+                             [name for name, _ in subdirs],
+                             [name for name, _ in project_entries])
+        return subdirs, project_entries
+
+    @staticmethod
+    def _prune_subdirs(subdirs: List[tuple], is_project: bool, is_plugin: bool) -> List[tuple]:
+        """去掉不可能包含工程的子目录
+
+        插件目录（包含.uplugin）中不会再有工程，整个目录不再深入；工程根目录只跳过
+        Content、Intermediate等大型目录，Source、Config和Plugins仍会检查。
+        """
+        if is_plugin:
+            return []
+        if is_project:
+            return [item for item in subdirs if item[0].lower() not in PROJECT_PRUNE_DIRS]
+        return subdirs
+
+    def _walk_task(self, top: str, drive: str, mtime_ns: Optional[int] = None,
+                   max_depth: Optional[int] = None) -> List[Dict]:
+        """遍历单个子树并收集.uproject文件"""
+        projects = []
+        # 栈元素：(目录路径, 相对磁盘根目录的深度, 目录修改时间)
+        stack = [(top, _relative_depth(top, drive), mtime_ns)]
+        if max_depth is None:
+            max_depth = self.max_depth
+
+        while stack:
+            # 每个目录之间检查是否被取消或暂停
+            if not self._checkpoint():
+                break
+            root, depth, root_mtime = stack.pop()
+
+            listing = self._list_dir(root, root_mtime)
+            if listing is None:
+                continue
+
+            subdirs, project_entries = listing
+            self._collect_projects(root, project_entries, projects)
+
+            # 限制搜索深度，避免过深递归
+            if depth > max_depth:
+                continue
+
+            for name, child_mtime in reversed(subdirs):
+                path = os.path.join(root, name)
+                # 进入目录前检查屏蔽规则，被屏蔽的目录不会被读取
+                if self.exclude.match_entry(path):
+                    continue
+                stack.append((path, depth + 1, child_mtime))
+
+        return projects
+
+    def _collect_projects(self, root: str, project_entries: List[tuple], projects: List[Dict]):
+        """从工程文件列表中收集工程信息"""
+        for file, stat in project_entries:
+            project_path = os.path.join(root, file)
+            # 上级目录均已检查，只需匹配文件名本身
+            if self.exclude.match_entry(project_path):
+                continue
+
+            with self._seen_lock:
+                if project_path in self._seen_paths:
+                    continue
+                self._seen_paths.add(project_path)
+
+            # 获取文件信息（扫描时已获取的状态直接复用）
+            try:
+                if stat is None:
+                    stat = os.stat(project_path)
+                project = make_project_info(project_path, root, stat)
+            except Exception as e:
+                print(f"获取文件信息失败 {project_path}: {e}")
+                continue
+
+            projects.append(project)
+            print(f"找到UE工程: {project_path}")
+            if self._project_callback:
+                self._project_callback(project)
+
+
+def make_project_info(project_path: str, root: str, stat) -> Dict:
+    """根据文件状态构建工程信息字典"""
+    return {
+        'name': os.path.splitext(os.path.basename(project_path))[0],
+        'path': project_path,
+        'dir': root,
+        'size': stat.st_size,
+        'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
+        'created': datetime.fromtimestamp(stat.st_ctime).isoformat()
+    }
@@ -0,0 +1,385 @@
+import os
+import sys
+import errno
+import ctypes
+import ctypes.util
+import select
+import struct
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from models.project_scanner import make_project_info, DEFAULT_MAX_DEPTH
+
+# inotify事件掩码（见 linux/inotify.h）
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+              IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def inotify_available() -> bool:
+    """当前系统是否支持inotify（不支持时监视器使用轮询模式）"""
+    return _load_inotify() is not None
+
+
+def _load_inotify():
+    """加载libc中的inotify函数，不支持时返回None"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class ProjectWatcher:
+    """工程目录监视器 - 在后台监视已知工程，工程新增、删除或修改时回调
+
+    Linux上使用inotify监视工程目录、工程所在的上级目录和扫描根目录下扫描会读取的各级目录
+    （与扫描深度一致，工程目录内部除外，最多MAX_WATCHES个），之后新建的目录同样逐层加入监视。
+    其他平台每隔poll_interval秒检查已知工程目录的修改时间，其他目录中新建的工程由rescan
+    每隔rescan_interval秒重新扫描（使用扫描索引，未修改的目录不重新读取）发现。
+    回调on_change(event, project)在监视线程中调用，event为"added"、"removed"或"modified"。
+    工程文件按(修改时间ns, 大小)判断是否修改。
+    """
+
+    # 刚读取过的工程文件在这段时间内的写入完成事件视为创建的一部分，不报告为修改
+    SYNC_GRACE = 1.0
+    # inotify监视数量上限，避免新建大量目录时耗尽系统的监视配额
+    MAX_WATCHES = 4096
+
+    def __init__(self, on_change: Callable[[str, Dict], None], poll_interval: float = 5.0,
+                 use_inotify: Optional[bool] = None,
+                 rescan: Optional[Callable[[], Optional[Iterable[Dict]]]] = None, rescan_interval: float = 300.0):
+        """
+        Args:
+            rescan: 轮询模式下定期调用，重新扫描根目录并返回找到的工程；返回None表示本次跳过
+        """
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.rescan = rescan
+        self.rescan_interval = rescan_interval
+        self._libc = _load_inotify() if use_inotify is not False else None
+        # {工程文件路径: (修改时间ns, 大小)}
+        self.known: Dict[str, Tuple[int, int]] = {}
+        # {工程目录: 目录的(修改时间ns, 大小)}，轮询模式使用
+        self._dir_mtimes: Dict[str, Optional[Tuple[int, int]]] = {}
+        # inotify监视：{wd: (目录, 继续监视新建子目录的层数)}，层数为0时只监视其中的工程文件
+        self._watches: Dict[int, tuple] = {}
+        self._watched_dirs = set()
+        # {_sync_dir读取到的工程文件: 读取时间}
+        self._synced: Dict[str, float] = {}
+        self._max_depth = DEFAULT_MAX_DEPTH
+        self._fd = -1
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._libc is not None else "poll"
+
+    def start(self, projects: Iterable[Dict], roots: Iterable[str] = (), max_depth: Optional[int] = None):
+        """开始监视给定的工程和扫描根目录，max_depth为扫描深度（新建目录逐层监视的层数）"""
+        self.stop()
+        # 每次启动使用新的停止标志，上一次未及时退出的监视线程（如正在重新扫描）不会被重新唤醒
+        self._stop = threading.Event()
+        self.known = {}
+        self._dir_mtimes = {}
+        self._synced = {}
+        self._max_depth = DEFAULT_MAX_DEPTH if max_depth is None else max_depth
+        for project in projects:
+            path = project.get('path', '')
+            signature = self._signature(path)
+            if signature is not None:
+                self.known[path] = signature
+        project_dirs = {os.path.dirname(path) for path in self.known}
+
+        if self._libc is not None and self._start_inotify(project_dirs, roots):
+            target = self._inotify_loop
+        else:
+            self._libc = None
+            for project_dir in project_dirs:
+                self._dir_mtimes[project_dir] = self._signature(project_dir)
+            target = self._poll_loop
+
+        self._thread = threading.Thread(target=target, name="ProjectWatcher", daemon=True)
+        self._thread.start()
+        print(f"开始监视 {len(self.known)} 个工程（{self.backend}）")
+
+    def stop(self):
+        """停止监视"""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._watches = {}
+        self._watched_dirs = set()
+
+    # ---- 公共处理 ----
+
+    @staticmethod
+    def _signature(path: str, stat: Optional[os.stat_result] = None) -> Optional[Tuple[int, int]]:
+        """文件的(修改时间ns, 大小)，同一时间戳内的改写也能通过大小区分"""
+        if stat is None:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _emit(self, event: str, path: str):
+        """更新已知工程并回调"""
+        if event == "removed":
+            if self.known.pop(path, None) is None:
+                return
+            project = {'name': os.path.splitext(os.path.basename(path))[0],
+                       'path': path, 'dir': os.path.dirname(path)}
+        else:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return self._emit("removed", path)
+            signature = self._signature(path, stat)
+            if path in self.known:
+                if self.known[path] == signature:
+                    return
+                event = "modified"
+            else:
+                event = "added"
+            self.known[path] = signature
+            project = make_project_info(path, os.path.dirname(path), stat)
+
+        try:
+            self.on_change(event, project)
+        except Exception as e:
+            print(f"工程变化回调出错: {e}")
+
+    def _sync_dir(self, directory: str):
+        """重新读取目录中的.uproject文件，与已知工程比较"""
+        found = set()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.lower().endswith('.uproject') and entry.is_file():
+                        found.add(entry.path)
+        except OSError:
+            pass
+
+        for path in [p for p in self.known if os.path.dirname(p) == directory and p not in found]:
+            self._emit("removed", path)
+        now = time.monotonic()
+        self._synced = {path: synced for path, synced in self._synced.items() if now - synced < self.SYNC_GRACE}
+        for path in found:
+            self._synced[path] = now
+            self._emit("added", path)
+        return found
+
+    def _remove_under(self, directory: str):
+        """目录被删除或移走时，移除其中的工程"""
+        prefix = directory + os.sep
+        for path in [p for p in self.known if p.startswith(prefix)]:
+            self._emit("removed", path)
+
+    # ---- 轮询模式 ----
+
+    def _poll_loop(self):
+        stop = self._stop
+        next_rescan = time.monotonic() + self.rescan_interval
+        while not stop.wait(self.poll_interval):
+            self.poll()
+            if self.rescan is not None and time.monotonic() >= next_rescan:
+                self.rescan_roots(stop)
+                next_rescan = time.monotonic() + self.rescan_interval
+
+    def rescan_roots(self, stop: Optional[threading.Event] = None):
+        """重新扫描根目录，报告其中新建的工程（轮询模式只检查已知工程目录，发现不了这些工程）"""
+        try:
+            projects = self.rescan()
+        except Exception as e:
+            print(f"重新扫描工程目录出错: {e}")
+            return
+        if projects is None or (stop is not None and stop.is_set()):
+            return
+        for project in projects:
+            path = project.get('path', '')
+            if path and path not in self.known:
+                directory = os.path.dirname(path)
+                if directory not in self._dir_mtimes:
+                    self._dir_mtimes[directory] = self._signature(directory)
+                self._emit("added", path)
+
+    def poll(self):
+        """检查一次已知工程目录的变化"""
+        for directory, old_mtime in list(self._dir_mtimes.items()):
+            mtime = self._signature(directory)
+            if mtime is None:
+                self._remove_under(directory)
+                del self._dir_mtimes[directory]
+                continue
+            if mtime != old_mtime:
+                self._dir_mtimes[directory] = mtime
+                self._sync_dir(directory)
+
+        # 工程文件内容修改不会改变目录的修改时间
+        for path, old_signature in list(self.known.items()):
+            if self._signature(path) != old_signature:
+                self._emit("added", path)
+
+    # ---- inotify模式 ----
+
+    def _start_inotify(self, project_dirs, roots) -> bool:
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            print("inotify初始化失败，改为轮询模式")
+            return False
+
+        # 已知工程目录及其上级目录先加入监视（上级目录中新建的目录只监视其中的工程文件），
+        # 再按层监视扫描根目录下已有的目录，达到监视上限时优先保留较浅的目录
+        for directory in project_dirs:
+            self._add_watch(directory, 0)
+        for directory in {os.path.dirname(d) for d in project_dirs}:
+            self._add_watch(directory, 1)
+        for root in roots:
+            self._watch_tree(os.path.normpath(root), self._root_levels())
+        return True
+
+    def _root_levels(self) -> int:
+        """根目录下继续监视的层数：扫描时根目录的直接子目录深度为0，深度不超过max_depth的目录
+        还会读取其子目录，因此会读取到根目录下第max_depth + 2层"""
+        return self._max_depth + 2
+
+    def _watch_tree(self, root: str, levels: int):
+        """按层监视已有的目录（不读取其中的工程文件，已知工程由扫描结果提供）"""
+        project_dirs = {os.path.dirname(path) for path in self.known}
+        queue = [(root, levels)]
+        while queue:
+            next_queue = []
+            for directory, remaining in queue:
+                if directory not in self._watched_dirs and len(self._watches) >= self.MAX_WATCHES:
+                    print(f"监视的目录已达上限 {self.MAX_WATCHES}，{root} 下更深的目录不再监视")
+                    return
+                self._add_watch(directory, remaining)
+                if remaining <= 0 or directory in project_dirs:
+                    # 工程目录内部（Content、Saved等）不再逐层监视
+                    continue
+                try:
+                    with os.scandir(directory) as entries:
+                        next_queue.extend((entry.path, remaining - 1) for entry in entries
+                                          if entry.is_dir(follow_symlinks=False))
+                except OSError:
+                    continue
+            queue = next_queue
+
+    def _add_watch(self, directory: str, levels: int):
+        if not os.path.isdir(directory):
+            return
+        if directory not in self._watched_dirs and len(self._watches) >= self.MAX_WATCHES:
+            print(f"监视的目录已达上限 {self.MAX_WATCHES}，不再监视 {directory}")
+            return
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            print(f"无法监视目录 {directory}: {os.strerror(ctypes.get_errno())}")
+            return
+        previous = self._watches.get(wd)
+        # 同一目录按多种身份加入时取最大的层数
+        self._watches[wd] = (directory, max(levels, previous[1] if previous is not None else 0))
+        self._watched_dirs.add(directory)
+
+    def _watch_new_dir(self, directory: str, levels: int):
+        """监视新建（或移入）的目录：先监视再检查，避免漏掉监视前创建的工程文件和子目录"""
+        self._add_watch(directory, levels)
+        if self._sync_dir(directory) or levels <= 0:
+            # 工程目录内部（Content、Saved等）不再逐层监视
+            return
+        try:
+            with os.scandir(directory) as entries:
+                subdirs = [entry.path for entry in entries if entry.is_dir(follow_symlinks=False)]
+        except OSError:
+            return
+        for subdir in subdirs:
+            self._watch_new_dir(subdir, levels - 1)
+
+    def _is_project_dir(self, directory: str) -> bool:
+        return any(os.path.dirname(path) == directory for path in self.known)
+
+    def _inotify_loop(self):
+        stop = self._stop
+        while not stop.is_set():
+            try:
+                ready, _, _ = select.select([self._fd], [], [], 0.5)
+                if not ready:
+                    continue
+                data = os.read(self._fd, 64 * 1024)
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EINTR):
+                    continue
+                break
+            self._handle_events(data)
+
+    def _handle_events(self, data: bytes):
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # 事件队列溢出，重新检查所有监视的目录
+                for directory, _ in list(self._watches.values()):
+                    self._sync_dir(directory)
+                continue
+
+            watch = self._watches.get(wd)
+            if watch is None:
+                continue
+            directory, levels = watch
+
+            if mask & IN_IGNORED:
+                del self._watches[wd]
+                self._watched_dirs.discard(directory)
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                self._remove_under(directory)
+                continue
+
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._remove_under(path)
+                elif mask & (IN_CREATE | IN_MOVED_TO) and levels > 0 and not self._is_project_dir(directory):
+                    self._watch_new_dir(path, levels - 1)
+            elif name.lower().endswith('.uproject'):
+                if mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._synced.pop(path, None)
+                    self._emit("removed", path)
+                elif mask & IN_CLOSE_WRITE and self._just_synced(path):
+                    # 新建目录时读取到的工程文件随后写完，只更新记录，不报告为修改
+                    signature = self._signature(path)
+                    if signature is not None and path in self.known:
+                        self.known[path] = signature
+                elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                    self._emit("added", path)
+
+    def _just_synced(self, path: str) -> bool:
+        synced = self._synced.pop(path, None)
+        return synced is not None and time.monotonic() - synced < self.SYNC_GRACE
@@ -0,0 +1,215 @@
+import os
+import uuid
+import itertools
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional
+from models.search_index import SearchIndex, resource_short_text
+
+
+class ResourceStore:
+    """资源存储 - 为每个资源分配稳定的id，并维护按id、路径、分类和名称的哈希索引
+
+    用法与列表相同（遍历、len、下标、in、append、remove），增删改查的耗时与资源数量无关。
+    资源字典中的name、path、category需要通过update修改，以保持索引同步。
+    同时维护搜索倒排索引（见SearchIndex）。批量加载的资源需要调用build_search_index建立索引
+    （可在后台线程中进行），索引建立完成前搜索逐个比较资源。
+    search可以在后台线程中调用，与增删改之间通过锁互斥。
+    """
+
+    INDEXED_FIELDS = ('path', 'category', 'name')
+
+    def __init__(self, resources: Optional[Iterable[Dict]] = None):
+        # {id: 资源}，字典保持插入顺序
+        self._by_id: Dict[str, Dict] = {}
+        # {字段: {值: {id: None}}}，内层字典作为有序集合使用
+        self._indexes: Dict[str, Dict[str, Dict[str, None]]] = {field: {} for field in self.INDEXED_FIELDS}
+        self._ordered: Optional[List[Dict]] = None
+        # {id: 添加顺序}，用于按原顺序返回搜索结果
+        self._positions: Dict[str, int] = {}
+        self._counter = itertools.count()
+        self.search_index = SearchIndex()
+        self._lock = threading.RLock()
+        # 加载时是否为旧数据补充了id（需要保存）
+        self.assigned_ids = False
+        for resource in resources or []:
+            self._add(resource, index_search=False)
+        if self._by_id:
+            self.search_index.ready = False
+
+    @staticmethod
+    def normalize_path(path: str) -> str:
+        """规范化路径，用于按路径查找"""
+        return os.path.normcase(os.path.normpath(path)) if path else ""
+
+    def _key(self, field: str, value) -> str:
+        value = value or ""
+        return self.normalize_path(value) if field == 'path' else value
+
+    def _index_add(self, resource: Dict, fields: Iterable[str] = INDEXED_FIELDS):
+        for field in fields:
+            key = self._key(field, resource.get(field))
+            self._indexes[field].setdefault(key, {})[resource['id']] = None
+
+    def _index_remove(self, resource: Dict, fields: Iterable[str] = INDEXED_FIELDS):
+        for field in fields:
+            key = self._key(field, resource.get(field))
+            ids = self._indexes[field].get(key)
+            if ids is not None:
+                ids.pop(resource['id'], None)
+                if not ids:
+                    del self._indexes[field][key]
+
+    def _lookup(self, field: str, value) -> List[Dict]:
+        ids = self._indexes[field].get(self._key(field, value), {})
+        return [self._by_id[resource_id] for resource_id in ids]
+
+    # ---- 列表接口 ----
+
+    def append(self, resource: Dict):
+        """添加资源，没有id或id重复时分配新的id"""
+        self._add(resource, index_search=True)
+
+    def extend(self, resources: Iterable[Dict]):
+        """批量添加资源（如后台分批加载），之后需要调用build_search_index建立搜索索引"""
+        with self._lock:
+            for resource in resources:
+                self._add(resource, index_search=False)
+                self.search_index.ready = False
+
+    def _add(self, resource: Dict, index_search: bool):
+        with self._lock:
+            if not resource.get('id') or resource['id'] in self._by_id:
+                resource['id'] = uuid.uuid4().hex
+                self.assigned_ids = True
+            self._by_id[resource['id']] = resource
+            self._positions[resource['id']] = next(self._counter)
+            self._index_add(resource)
+            if index_search:
+                self.search_index.add(resource)
+            self._ordered = None
+
+    def remove(self, resource: Dict):
+        """移除资源，资源不存在时抛出ValueError（与list.remove一致）"""
+        with self._lock:
+            if resource not in self:
+                raise ValueError("资源不在存储中")
+            del self._by_id[resource['id']]
+            del self._positions[resource['id']]
+            self._index_remove(resource)
+            self.search_index.remove(resource['id'])
+            self._ordered = None
+
+    def clear(self):
+        with self._lock:
+            self._by_id.clear()
+            self._positions.clear()
+            for index in self._indexes.values():
+                index.clear()
+            self.search_index = SearchIndex()
+            self._ordered = None
+
+    def to_list(self) -> List[Dict]:
+        """按添加顺序返回资源列表（用于保存）"""
+        with self._lock:
+            if self._ordered is None:
+                self._ordered = list(self._by_id.values())
+            return self._ordered
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.to_list())
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __getitem__(self, index):
+        return self.to_list()[index]
+
+    def __contains__(self, resource) -> bool:
+        return isinstance(resource, dict) and self._by_id.get(resource.get('id')) is resource
+
+    # ---- 索引查询 ----
+
+    def get(self, resource_id: str) -> Optional[Dict]:
+        """按id获取资源"""
+        return self._by_id.get(resource_id)
+
+    def get_by_path(self, path: str) -> Optional[Dict]:
+        """按路径获取资源"""
+        resources = self._lookup('path', path)
+        return resources[0] if resources else None
+
+    def get_by_name(self, name: str) -> List[Dict]:
+        """按名称获取资源"""
+        return self._lookup('name', name)
+
+    def get_by_category(self, category: str) -> List[Dict]:
+        """获取分类中的资源"""
+        return self._lookup('category', category)
+
+    def has_path(self, path: str) -> bool:
+        return self._key('path', path) in self._indexes['path']
+
+    def has_name(self, name: str) -> bool:
+        return (name or "") in self._indexes['name']
+
+    def count_in_category(self, category: str) -> int:
+        return len(self._indexes['category'].get(category or "", {}))
+
+    def update(self, resource: Dict, **fields):
+        """修改资源字段并更新索引"""
+        with self._lock:
+            if resource not in self:
+                raise ValueError("资源不在存储中")
+            fields.pop('id', None)
+            # 只重建值发生变化的索引，资源在其他索引中的顺序保持不变
+            changed = [field for field in self.INDEXED_FIELDS
+                       if field in fields and self._key(field, fields[field]) != self._key(field, resource.get(field))]
+            self._index_remove(resource, changed)
+            resource.update(fields)
+            self._index_add(resource, changed)
+            if changed or 'doc' in fields:
+                self.search_index.add(resource)
+
+    # ---- 搜索 ----
+
+    def search(self, search_term: str = "", category: Optional[str] = None, fuzzy: bool = False) -> List[Dict]:
+        """按搜索词和分类过滤资源，结果保持添加顺序；category为None时不限分类
+
+        fuzzy为True时容许拼写错误并按相关度排序，相关度相同时保持添加顺序。
+        """
+        with self._lock:
+            return self._search(search_term, category, fuzzy)
+
+    def _search(self, search_term: str, category: Optional[str], fuzzy: bool) -> List[Dict]:
+        if not search_term.strip():
+            return list(self.to_list()) if category is None else self.get_by_category(category)
+
+        # 索引建立完成前退回逐个比较（不支持模糊匹配）
+        if not self.search_index.ready:
+            terms = search_term.lower().split()
+            resources = self.to_list() if category is None else self.get_by_category(category)
+            return [resource for resource in resources
+                    if all(term in resource_short_text(resource) for term in terms)]
+
+        candidates = None
+        if category is not None:
+            candidates = self._indexes['category'].get(category or "", {}).keys()
+        if fuzzy:
+            scores = self.search_index.search_ranked(search_term, candidates)
+            # 先按添加顺序排列，再按得分稳定排序
+            ordered = self._ids_in_order(scores)
+            ordered.sort(key=scores.__getitem__, reverse=True)
+            return [self._by_id[resource_id] for resource_id in ordered]
+        return [self._by_id[resource_id] for resource_id in
+                self._ids_in_order(self.search_index.search(search_term, candidates))]
+
+    def _ids_in_order(self, ids) -> List[str]:
+        """按添加顺序排列id"""
+        # 命中较多时按顺序遍历比排序更快
+        if len(ids) * 8 > len(self._by_id):
+            return [resource_id for resource_id in self._by_id if resource_id in ids]
+        return sorted(ids, key=self._positions.__getitem__)
+
+    def build_search_index(self):
+        """为批量加载的资源建立搜索索引，包括README内容（读取文件较慢，可在后台线程中调用）"""
+        self.search_index.build(list(self._by_id.values()), self._by_id.__contains__)
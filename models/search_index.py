@@ -0,0 +1,287 @@
+import re
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from models.fuzzy_search import FuzzyIndex
+
+# 名称和分类按3个字符的片段（trigram）建立索引
+GRAM_SIZE = 3
+# README只读取开头部分建立索引
+MAX_DOC_CHARS = 64 * 1024
+# 新单词较少时直接插入有序单词表，较多时在查询前统一排序
+MAX_INSORT = 64
+# 模糊搜索命中超过这个数量时不再计算相关度（按添加顺序返回），避免短查询词逐个打分
+MAX_RANKED = 2000
+TOKEN_PATTERN = re.compile(r"\w+")
+# 短查询词比较路径时，每个单词前加上这个标记，"标记+查询词"出现在文本中即查询词是某个单词的前缀
+TOKEN_MARK = "\x01"
+
+
+def _grams(text: str) -> Set[str]:
+    """生成文本中所有长度为GRAM_SIZE的片段"""
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+def _tokens(text: str) -> Set[str]:
+    """将文本拆分为小写单词"""
+    return set(TOKEN_PATTERN.findall(text.lower()))
+
+
+def resource_text(resource: Dict) -> str:
+    """资源的名称和分类文本（小写），子串匹配基于此文本"""
+    return f"{resource.get('name', '')} {resource.get('category', '')}".lower()
+
+
+def _marked_tokens(text: str) -> str:
+    """将文本中的单词拼接为短查询词比较用的文本，每个单词前加TOKEN_MARK"""
+    return "".join(TOKEN_MARK + token for token in sorted(_tokens(text)))
+
+
+def resource_short_text(resource: Dict) -> str:
+    """未建立索引时逐个比较的文本：名称、分类和路径"""
+    return f"{resource_text(resource)}\0{(resource.get('path', '') or '').lower()}"
+
+
+class SearchIndex:
+    """资源搜索倒排索引
+
+    - 名称和分类：按trigram建立索引，查询词是名称或分类的子串即命中，与原来的子串匹配一致
+    - 路径各级目录名和README内容：按单词建立索引，查询词是某个单词的前缀即命中
+
+    查询词按空格拆分，所有词都命中的资源才会返回。索引随资源增删改增量更新。
+    少于3个字符的查询词命中范围很大，直接逐个比较：名称或分类的子串、路径中某个单词的前缀
+    （与较长的查询词规则一致，README内容不参与）；
+    输入过程中查询词逐字加长时，只在上一次的结果中比较。
+    search_ranked额外匹配拼写错误和首字母缩写，并按相关度返回得分（见FuzzyIndex），
+    命中超过MAX_RANKED个时不计算相关度。
+    """
+
+    def __init__(self):
+        # 批量建立索引完成前为False，此时由调用方自行过滤
+        self.ready = True
+        # {片段: {资源id}}
+        self._grams: Dict[str, Set[str]] = {}
+        # {单词: {资源id}}，以及用于前缀查找的有序单词表
+        self._tokens: Dict[str, Set[str]] = {}
+        self._vocab: List[str] = []
+        self._pending_vocab: List[str] = []
+        # 每个资源的名称分类文本，以及短查询词比较用的路径单词（见_marked_tokens）
+        self._texts: Dict[str, str] = {}
+        self._path_marks: Dict[str, str] = {}
+        # 每个资源被索引的单词，用于移除
+        self._doc_tokens: Dict[str, Set[str]] = {}
+        # 上一次全量比较短查询词的结果：(查询词, 资源id)，资源变化时清空
+        self._short_cache: Optional[tuple] = None
+        self.fuzzy = FuzzyIndex()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    # ---- 建立索引 ----
+
+    def add(self, resource: Dict, index_doc: bool = True):
+        """添加或重新索引资源，index_doc为False时不读取README"""
+        doc_tokens = self._read_doc_tokens(resource) if index_doc else set()
+        with self._lock:
+            self._add_locked(resource, doc_tokens)
+
+    def _add_locked(self, resource: Dict, doc_tokens: Set[str]):
+        resource_id = resource['id']
+        self.remove(resource_id)
+        self._short_cache = None
+        text = resource_text(resource)
+        self._texts[resource_id] = text
+        path_text = resource.get('path', '') or ''
+        self._path_marks[resource_id] = _marked_tokens(path_text)
+        self.fuzzy.add(resource)
+        grams = self._grams
+        for gram in _grams(text):
+            ids = grams.get(gram)
+            if ids is None:
+                grams[gram] = {resource_id}
+            else:
+                ids.add(resource_id)
+        self._add_tokens(resource_id, _tokens(path_text) | doc_tokens)
+
+    def build(self, resources: Iterable[Dict], is_current: Callable[[str], bool]):
+        """批量建立索引（可在后台线程中调用），先索引名称和路径，完成后再补充README内容
+
+        is_current用于判断资源是否仍然存在，建立索引期间被移除的资源不会留在索引中。
+        """
+        resources = list(resources)
+        for resource in resources:
+            with self._lock:
+                if is_current(resource['id']) and resource['id'] not in self._texts:
+                    self._add_locked(resource, set())
+        self.ready = True
+
+        for resource in resources:
+            tokens = self._read_doc_tokens(resource)
+            if not tokens:
+                continue
+            with self._lock:
+                if resource['id'] in self._texts:
+                    self._add_tokens(resource['id'], tokens)
+
+    def remove(self, resource_id: str):
+        """移除资源"""
+        with self._lock:
+            text = self._texts.pop(resource_id, None)
+            if text is None:
+                return
+            self._short_cache = None
+            del self._path_marks[resource_id]
+            self.fuzzy.remove(resource_id)
+            for gram in _grams(text):
+                ids = self._grams.get(gram)
+                if ids is not None:
+                    ids.discard(resource_id)
+                    if not ids:
+                        del self._grams[gram]
+            for token in self._doc_tokens.pop(resource_id, ()):
+                ids = self._tokens.get(token)
+                if ids is not None:
+                    ids.discard(resource_id)
+                    if not ids:
+                        # 单词表中的残留项在查询时跳过，下次统一排序时清除
+                        del self._tokens[token]
+
+    def _add_tokens(self, resource_id: str, tokens: Set[str]):
+        indexed = self._doc_tokens.setdefault(resource_id, set())
+        for token in tokens - indexed:
+            ids = self._tokens.get(token)
+            if ids is None:
+                self._tokens[token] = {resource_id}
+                self._pending_vocab.append(token)
+            else:
+                ids.add(resource_id)
+        indexed |= tokens
+
+    def _sorted_vocab(self) -> List[str]:
+        """返回有序单词表，合并新增的单词"""
+        if self._pending_vocab:
+            if len(self._pending_vocab) <= MAX_INSORT:
+                for token in self._pending_vocab:
+                    index = bisect.bisect_left(self._vocab, token)
+                    if index == len(self._vocab) or self._vocab[index] != token:
+                        self._vocab.insert(index, token)
+            else:
+                self._vocab = sorted(self._tokens)
+            self._pending_vocab = []
+        return self._vocab
+
+    @staticmethod
+    def _read_doc_tokens(resource: Dict) -> Set[str]:
+        doc_path = resource.get('doc', '')
+        if not doc_path:
+            return set()
+        try:
+            with open(doc_path, 'r', encoding='utf-8', errors='ignore') as f:
+                return _tokens(f.read(MAX_DOC_CHARS))
+        except OSError:
+            return set()
+
+    # ---- 查询 ----
+
+    def search(self, search_term: str, candidates: Optional[Iterable[str]] = None) -> Set[str]:
+        """返回所有查询词都命中的资源id，candidates用于限定范围（如分类过滤）"""
+        terms = search_term.lower().split()
+        with self._lock:
+            result = set(candidates) if candidates is not None else None
+            if not terms:
+                return result if result is not None else set(self._texts)
+
+            # 长查询词使用索引，结果通常较少；短查询词最后在剩余的资源中一次比较完
+            short_terms = [term for term in terms if len(term) < GRAM_SIZE]
+            for term in sorted(set(terms) - set(short_terms), key=len, reverse=True):
+                ids = self._match_text(term) | self._match_prefix(term)
+                result = ids if result is None else result & ids
+                if not result:
+                    return set()
+            if short_terms:
+                result = self._scan_short_terms(short_terms, result)
+            return result
+
+    def search_ranked(self, search_term: str, candidates: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """模糊搜索：除search的匹配外，名称单词有1处拼写错误或首字母缩写匹配的资源也命中
+
+        返回{资源id: 相关度得分}，所有查询词都需要以某种方式命中。
+        """
+        terms = list(dict.fromkeys(search_term.lower().split()))
+        if not terms:
+            return {}
+        with self._lock:
+            scope = set(candidates) if candidates is not None else None
+            typo_ids = {}
+            for term in sorted(terms, key=len, reverse=True):
+                if len(term) < GRAM_SIZE:
+                    ids = self._scan_short_terms([term], scope) | self.fuzzy.match_initials(term)
+                else:
+                    typo_ids[term] = self.fuzzy.match_typos(term)
+                    ids = (self._match_text(term) | self._match_prefix(term)
+                           | typo_ids[term] | self.fuzzy.match_initials(term))
+                scope = ids if scope is None else scope & ids
+                if not scope:
+                    return {}
+            if len(scope) > MAX_RANKED:
+                # 命中范围太大时相关度排序意义不大，得分相同即保持添加顺序
+                return dict.fromkeys(scope, 0.0)
+            return self.fuzzy.score(terms, scope, typo_ids)
+
+    def _scan_short_terms(self, terms: List[str], scope: Optional[Set[str]]) -> Set[str]:
+        """短查询词：比较名称和分类的子串、路径单词的前缀，所有词在一次遍历中比较完"""
+        if scope is None:
+            cached = self._short_cache
+            if cached is not None and cached[0] == tuple(terms):
+                return set(cached[1])
+            # 上次的每个词都是本次某个词的前缀时（输入过程中逐字加长），本次的结果一定在上次的结果中
+            if cached is not None and all(any(term.startswith(old) for term in terms) for old in cached[0]):
+                result = self._scan_ids(terms, cached[1])
+            else:
+                result = self._scan_ids(terms, None)
+            self._short_cache = (tuple(terms), result)
+            return set(result)
+        return self._scan_ids(terms, scope)
+
+    def _scan_ids(self, terms: List[str], scope: Optional[Set[str]]) -> Set[str]:
+        texts = self._texts
+        path_marks = self._path_marks
+        marked = [(term, TOKEN_MARK + term) for term in terms]
+        ids = texts.keys() if scope is None else texts.keys() & scope
+        if len(marked) == 1:
+            term, mark = marked[0]
+            return {resource_id for resource_id in ids
+                    if term in texts[resource_id] or mark in path_marks[resource_id]}
+        return {resource_id for resource_id in ids
+                if all(term in texts[resource_id] or mark in path_marks[resource_id]
+                       for term, mark in marked)}
+
+    def _match_text(self, term: str) -> Set[str]:
+        """名称或分类中包含term的资源"""
+        postings = []
+        for gram in _grams(term):
+            ids = self._grams.get(gram)
+            if not ids:
+                return set()
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates &= ids
+        if len(term) == GRAM_SIZE:
+            return candidates
+        # 片段都存在不代表连续出现，需要校验
+        return {resource_id for resource_id in candidates if term in self._texts[resource_id]}
+
+    def _match_prefix(self, term: str) -> Set[str]:
+        """路径或README中有以term开头的单词的资源"""
+        result = set()
+        vocab = self._sorted_vocab()
+        index = bisect.bisect_left(vocab, term)
+        while index < len(vocab) and vocab[index].startswith(term):
+            ids = self._tokens.get(vocab[index])
+            if ids:
+                result |= ids
+            index += 1
+        return result
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+配置文件编解码性能测试脚本
+生成包含指定数量资源的资产库配置，对各JSON编解码器的缩进/紧凑格式统计
+ConfigManager完整保存和加载的耗时以及文件大小，结果可保存为JSON
+
+用法:
+    python scripts/benchmark_config_codec.py
+    python scripts/benchmark_config_codec.py --sizes 1000,10000,100000 --repeat 5
+    python scripts/benchmark_config_codec.py --codecs json,orjson --output codec.json
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import shutil
+import argparse
+import tempfile
+from datetime import datetime
+
+# 添加项目根目录到Python路径
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from utils.config_manager import ConfigManager
+from utils.json_codec import CODEC_PREFERENCE, get_codec
+
+CATEGORIES = ["默认", "建筑", "植被", "道具", "角色", "特效"]
+
+
+def build_config(count, seed):
+    """生成包含count个资源的资产库配置"""
+    rng = random.Random(seed)
+    resources = []
+    for i in range(count):
+        category = rng.choice(CATEGORIES)
+        name = f"{category}_Asset_{i:06d}"
+        resources.append({
+            "id": uuid.UUID(int=rng.getrandbits(128)).hex,
+            "name": name,
+            "path": f"D:\\UE\\Library\\{category}\\{name}",
+            "category": category,
+            "cover": f"D:\\UE\\Library\\{category}\\{name}\\cover.png",
+            "doc": f"D:\\UE\\Library\\{category}\\{name}\\README.md" if i % 3 == 0 else "",
+            "date_added": "2024-01-01 12:00:00",
+        })
+    return {"resources": resources, "categories": CATEGORIES,
+            "category_paths": {category: [f"D:\\UE\\Library\\{category}"] for category in CATEGORIES},
+            "settings": {"fuzzy_search": True}, "version": "1.0.0"}
+
+
+def _best(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_case(base, config, codec, compact, repeat):
+    """用指定的编解码器和格式完整保存、加载配置，返回最好成绩"""
+    config_file = os.path.join(base, f"{codec}_{'compact' if compact else 'indent'}.json")
+    manager = ConfigManager(config_file, "1.0.0", {"resources": []}, compact=compact, codec=codec)
+    save_s = _best(lambda: manager._write_snapshot(config), repeat)
+    load_s = _best(lambda: ConfigManager(config_file, "1.0.0", {"resources": []}, codec=codec).load_config(),
+                   repeat)
+    loaded = ConfigManager(config_file, "1.0.0", {"resources": []}, codec=codec).load_config()
+    assert loaded == config, f"{codec} 读写结果不一致"
+    return {
+        "codec": codec,
+        "format": "compact" if compact else "indent",
+        "resources": len(config["resources"]),
+        "save_s": round(save_s, 4),
+        "load_s": round(load_s, 4),
+        "file_bytes": os.path.getsize(config_file),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="配置文件编解码性能测试")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="资源数量，逗号分隔")
+    parser.add_argument("--codecs", help="只测试指定的编解码器，逗号分隔（默认测试已安装的全部）")
+    parser.add_argument("--repeat", type=int, default=3, help="每项计时的重复次数")
+    parser.add_argument("--seed", type=int, default=1, help="随机种子")
+    parser.add_argument("--output", help="将结果保存为JSON文件")
+    args = parser.parse_args()
+
+    names = args.codecs.split(',') if args.codecs else CODEC_PREFERENCE
+    # 标准库排在最前，作为对比基准
+    codecs = sorted((name for name in names if get_codec(name).name == name), key=lambda name: name != "json")
+    skipped = [name for name in names if name not in codecs]
+    if skipped:
+        print(f"未安装，跳过: {', '.join(skipped)}")
+
+    base = tempfile.mkdtemp(prefix="ue_codec_bench_")
+    results = []
+    try:
+        for size in (int(size) for size in args.sizes.split(',')):
+            config = build_config(size, args.seed)
+            print(f"\n{size:,} 个资源")
+            baseline = None
+            for codec in codecs:
+                for compact in (False, True):
+                    result = run_case(base, config, codec, compact, args.repeat)
+                    # 以标准库缩进格式（原来的保存方式）为基准
+                    baseline = baseline or result
+                    results.append(result)
+                    print(f"  {codec:<7} {result['format']:<8} 保存 {result['save_s']:8.4f} s  "
+                          f"加载 {result['load_s']:8.4f} s  {result['file_bytes'] / 1024 / 1024:8.2f} MB  "
+                          f"加速比 保存 {baseline['save_s'] / result['save_s']:5.2f}x "
+                          f"加载 {baseline['load_s'] / result['load_s']:5.2f}x")
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+    if args.output:
+        report = {
+            "timestamp": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "params": {key: value for key, value in vars(args).items() if key != "output"},
+            "results": results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已保存: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+工程扫描性能测试脚本
+生成合成目录树（普通目录、深层嵌套、屏蔽目录和分散的工程），对各扫描引擎统计
+耗时、目录/秒、系统调用次数和内存峰值，结果可保存为JSON，便于不同版本之间对比
+
+用法:
+    python scripts/benchmark_project_scan.py --dirs 500000
+    python scripts/benchmark_project_scan.py --dirs 100000 --output after.json --compare before.json
+    python scripts/benchmark_project_scan.py --engines legacy,manager-warm
+"""
+
+import os
+import sys
+import io
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+import tracemalloc
+import contextlib
+import subprocess
+from collections import Counter, deque
+from datetime import datetime
+
+# 添加项目根目录到Python路径
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from models.project_scanner import ProjectScanner, DEFAULT_EXCLUDE_PATHS
+
+# 统计调用次数的os函数（DirEntry自带缓存的is_dir/stat不经过这些函数）
+COUNTED_CALLS = ('scandir', 'listdir', 'stat', 'lstat')
+
+# 合成工程中的大型目录，用于体现工程目录剪枝的效果
+PROJECT_HEAVY_DIRS = ('Content', 'Intermediate', 'Saved', 'DerivedDataCache', 'Binaries')
+
+# 放入屏蔽目录的名称（均命中默认屏蔽规则）
+EXCLUDED_DIR_NAMES = ('node_modules', '.git', '__pycache__', '.vs')
+
+
+def build_tree(base, total_dirs, fanout=8, project_every=0):
+    """按广度优先生成指定数量的目录，project_every大于0时每隔若干目录放置一个.uproject"""
+    queue = deque([base])
+    created = 0
+    leaves = []
+    while created < total_dirs:
+        parent = queue.popleft()
+        for i in range(fanout):
+            if created >= total_dirs:
+                break
+            path = os.path.join(parent, f"d{i}")
+            os.mkdir(path)
+            created += 1
+            if project_every and created % project_every == 0:
+                _write(os.path.join(path, f"Game{created}.uproject"))
+            queue.append(path)
+            leaves.append(path)
+    return created, leaves
+
+
+def _write(path, content="{}"):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def _make_subtree(root, count, fanout):
+    """在root下生成count个目录，返回实际生成数量"""
+    os.makedirs(root, exist_ok=True)
+    return build_tree(root, count, fanout)[0] + 1
+
+
+def build_synthetic_tree(base, args):
+    """生成合成目录树，返回目录树统计信息"""
+    rng = random.Random(args.seed)
+    os.makedirs(base)
+    total, dirs = build_tree(base, args.dirs, args.fanout)
+    stats = {"plain_dirs": total, "chain_dirs": 0, "excluded_dirs": 0, "project_dirs": 0, "projects": 0}
+
+    # 深层嵌套的目录链，底部放一个工程
+    for i in range(args.chains):
+        path = os.path.join(rng.choice(dirs), f"chain{i}")
+        for level in range(args.chain_depth):
+            path = os.path.join(path, f"level{level}")
+        os.makedirs(path)
+        stats["chain_dirs"] += args.chain_depth + 1
+        _write(os.path.join(path, f"Deep{i}.uproject"))
+        stats["projects"] += 1
+
+    # 屏蔽目录，其中的工程不应被找到
+    for i in range(args.excluded):
+        root = os.path.join(rng.choice(dirs), EXCLUDED_DIR_NAMES[i % len(EXCLUDED_DIR_NAMES)])
+        if os.path.exists(root):
+            continue
+        stats["excluded_dirs"] += _make_subtree(root, args.excluded_size, args.fanout)
+        _write(os.path.join(root, f"Hidden{i}.uproject"))
+
+    # 分散的工程，每个工程带有若干大型目录
+    for i in range(args.projects):
+        project_dir = os.path.join(rng.choice(dirs), f"Project{i}")
+        os.mkdir(project_dir)
+        _write(os.path.join(project_dir, f"Project{i}.uproject"))
+        stats["projects"] += 1
+        stats["project_dirs"] += 1
+        per_dir = max(1, args.project_size // len(PROJECT_HEAVY_DIRS))
+        for name in PROJECT_HEAVY_DIRS:
+            stats["project_dirs"] += _make_subtree(os.path.join(project_dir, name), per_dir, args.fanout)
+
+    stats["total_dirs"] = (stats["plain_dirs"] + stats["chain_dirs"] +
+                           stats["excluded_dirs"] + stats["project_dirs"])
+    return stats
+
+
+def legacy_walk(drive, exclude_paths, max_depth):
+    """旧版扫描逻辑：os.walk遍历，列出目录后再检查屏蔽规则，逐个os.stat工程文件"""
+    projects = []
+    for root, dirs, files in os.walk(drive):
+        root_lower = root.lower()
+        if any(excluded in root_lower for excluded in exclude_paths):
+            dirs.clear()
+            continue
+        for file in files:
+            if file.lower().endswith('.uproject'):
+                project_path = os.path.join(root, file)
+                if not any(excluded in project_path.lower() for excluded in exclude_paths):
+                    os.stat(project_path)
+                    projects.append(project_path)
+        if root.count(os.sep) - drive.count(os.sep) > max_depth:
+            dirs.clear()
+    return projects
+
+
+def make_project_manager(base, max_depth):
+    """创建扫描合成目录树的ProjectManager，配置和索引保存在测试目录中"""
+    # 避免读写用户真实的配置目录
+    config_home = os.path.join(base, "_config")
+    os.environ['APPDATA'] = config_home
+    os.environ['XDG_CONFIG_HOME'] = config_home
+
+    from models.project_manager import ProjectManager
+    manager = ProjectManager()
+    manager.config.setdefault("settings", {})["exclude_paths"] = DEFAULT_EXCLUDE_PATHS
+    tree = os.path.join(base, "tree")
+    manager.get_scan_roots = lambda: [(tree, max_depth)]
+    return manager
+
+
+def build_engines(base, max_depth):
+    """扫描引擎列表 [(名称, 扫描函数)]，新的扫描引擎在此注册"""
+    tree = os.path.join(base, "tree")
+    exclude_paths = DEFAULT_EXCLUDE_PATHS
+    manager = make_project_manager(base, max_depth)
+
+    return [
+        ("legacy", lambda: legacy_walk(tree, exclude_paths, max_depth)),
+        ("scanner-seq", lambda: ProjectScanner(exclude_paths, max_depth, max_workers=1).scan([tree])),
+        ("scanner-parallel", lambda: ProjectScanner(exclude_paths, max_depth).scan([tree])),
+        ("manager-cold", lambda: manager.search_ue_projects(full_rescan=True)),
+        ("manager-warm", lambda: manager.search_ue_projects()),
+    ]
+
+
+@contextlib.contextmanager
+def count_syscalls():
+    """统计os模块文件系统函数的调用次数"""
+    counts = Counter()
+    lock = threading.Lock()
+    originals = {name: getattr(os, name) for name in COUNTED_CALLS}
+
+    def wrap(name, func):
+        def counted(*args, **kwargs):
+            with lock:
+                counts[name] += 1
+            return func(*args, **kwargs)
+        return counted
+
+    for name, func in originals.items():
+        setattr(os, name, wrap(name, func))
+    try:
+        yield counts
+    finally:
+        for name, func in originals.items():
+            setattr(os, name, func)
+
+
+def run_engine(name, func, total_dirs, repeat):
+    """运行扫描引擎：先计时（取最好成绩），再单独运行一次统计系统调用和内存峰值"""
+    # 扫描器会打印找到的每个工程，测试时屏蔽输出
+    with contextlib.redirect_stdout(io.StringIO()):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            found = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        with count_syscalls() as counts:
+            tracemalloc.start()
+            try:
+                func()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+    result = {
+        "engine": name,
+        "wall_s": round(best, 4),
+        "dirs_per_s": round(total_dirs / best) if best else None,
+        "projects": len(found),
+        "syscalls": dict(counts),
+        "syscalls_total": sum(counts.values()),
+        "peak_mem_bytes": peak,
+    }
+    print(f"{name:<18} {best:8.3f} s  {result['dirs_per_s'] or 0:12,} 目录/秒  "
+          f"{result['syscalls_total']:10,} 次调用  {peak / 1024 / 1024:8.1f} MB  找到 {len(found)} 个工程")
+    return result
+
+
+def get_revision():
+    """获取当前代码版本（git提交），失败时返回None"""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(current, baseline_file):
+    """与之前保存的结果对比耗时和系统调用次数"""
+    try:
+        with open(baseline_file, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    except (IOError, json.JSONDecodeError) as e:
+        print(f"无法读取对比结果 {baseline_file}: {e}")
+        return
+
+    old_results = {r["engine"]: r for r in baseline.get("results", [])}
+    print(f"\n与 {baseline.get('revision') or baseline_file} 对比:")
+    for result in current["results"]:
+        old = old_results.get(result["engine"])
+        if not old or not result["wall_s"]:
+            continue
+        print(f"{result['engine']:<18} 加速比 {old['wall_s'] / result['wall_s']:6.2f}x  "
+              f"系统调用 {old['syscalls_total']:,} -> {result['syscalls_total']:,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="工程扫描性能测试")
+    parser.add_argument("--dirs", type=int, default=500000, help="普通目录数量")
+    parser.add_argument("--fanout", type=int, default=8, help="每个目录的子目录数量")
+    parser.add_argument("--chains", type=int, default=20, help="深层嵌套目录链数量")
+    parser.add_argument("--chain-depth", type=int, default=30, help="每条目录链的深度")
+    parser.add_argument("--excluded", type=int, default=20, help="屏蔽目录数量")
+    parser.add_argument("--excluded-size", type=int, default=2000, help="每个屏蔽目录中的目录数量")
+    parser.add_argument("--projects", type=int, default=50, help="分散的工程数量")
+    parser.add_argument("--project-size", type=int, default=2000, help="每个工程中大型目录的目录数量")
+    parser.add_argument("--max-depth", type=int, default=64, help="扫描深度")
+    parser.add_argument("--seed", type=int, default=1, help="随机种子")
+    parser.add_argument("--repeat", type=int, default=1, help="每个引擎计时的重复次数")
+    parser.add_argument("--engines", help="只运行指定的引擎，逗号分隔")
+    parser.add_argument("--output", help="将结果保存为JSON文件")
+    parser.add_argument("--compare", help="与之前保存的JSON结果对比")
+    parser.add_argument("--path", default=os.path.expanduser("~"),
+                        help="生成目录树的位置（默认用户目录，系统临时目录会命中temp屏蔽规则）")
+    parser.add_argument("--keep", action="store_true", help="测试结束后保留目录树")
+    args = parser.parse_args()
+
+    base = tempfile.mkdtemp(prefix="ue_scan_bench_", dir=args.path)
+    try:
+        print(f"正在生成合成目录树: {base}")
+        start = time.perf_counter()
+        tree_stats = build_synthetic_tree(os.path.join(base, "tree"), args)
+        print(f"生成完成，共 {tree_stats['total_dirs']:,} 个目录、{tree_stats['projects']} 个工程，"
+              f"耗时 {time.perf_counter() - start:.1f} s\n")
+
+        engines = build_engines(base, args.max_depth)
+        if args.engines:
+            selected = set(args.engines.split(','))
+            engines = [(name, func) for name, func in engines if name in selected]
+
+        results = [run_engine(name, func, tree_stats["total_dirs"], args.repeat) for name, func in engines]
+
+        report = {
+            "revision": get_revision(),
+            "timestamp": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "params": {key: value for key, value in vars(args).items()
+                       if key not in ("output", "compare", "path", "keep")},
+            "tree": tree_stats,
+            "results": results,
+        }
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            print(f"\n结果已保存: {args.output}")
+        if args.compare:
+            compare_results(report, args.compare)
+    finally:
+        if args.keep:
+            print(f"目录树已保留: {base}")
+        else:
+            shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
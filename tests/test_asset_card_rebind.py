@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试资产卡片重新绑定时只更新变化的内容
+"""
+
+import os
+import sys
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from widgets.asset_card import AssetCard
+from utils.image_utils import ImageUtils
+
+
+class FakeLabel:
+    """记录configure调用的标签"""
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    def configure(self, **kwargs):
+        self.calls.append(kwargs)
+
+
+def _make_card(image_utils):
+    # 不创建Tk组件，只测试绑定逻辑
+    card = AssetCard.__new__(AssetCard)
+    card.asset = None
+    card.image_utils = image_utils
+    card._rendered = (None, None, None, None)
+    card.calls = []
+    card.img_label = FakeLabel(card.calls)
+    card.name_label = FakeLabel(card.calls)
+    card.category_label = FakeLabel(card.calls)
+    card.date_label = FakeLabel(card.calls)
+    return card
+
+
+def test_format_asset():
+    """测试卡片显示内容的格式"""
+    print("=== 测试卡片内容格式 ===")
+
+    cover, name, category, date = AssetCard.format_asset(
+        {"name": "Medieval_Castle_Kit_Deluxe", "category": "建筑", "date_added": "2024-05-06 10:00:00"})
+    assert cover is None
+    assert name == "Medieval_Castle_Kit_" + "..."
+    assert category == "建筑" and date == "05-06"
+    assert AssetCard.format_asset({})[1:] == ("未命名", "未分类", "")
+    print("✅ 卡片内容格式测试通过")
+
+
+def test_rebind_updates_only_changes():
+    """测试重新绑定只更新不同的标签，默认缩略图共用"""
+    print("=== 测试卡片重新绑定 ===")
+
+    image_utils = ImageUtils()
+    card = _make_card(image_utils)
+    rock = {"name": "Rock", "category": "默认", "date_added": "2024-05-06 10:00:00"}
+    tree = {"name": "Tree", "category": "默认", "date_added": "2024-05-06 12:00:00"}
+
+    card.set_asset(rock)
+    assert len(card.calls) == 4 and card.asset is rock
+
+    # 只有名称不同
+    card.calls.clear()
+    card.set_asset(tree)
+    assert card.calls == [{"text": "Tree"}] and card.asset is tree
+
+    # 绑定到同一个资产不更新，资产被修改后只更新修改的部分
+    card.calls.clear()
+    card.set_asset(tree)
+    assert card.calls == []
+    tree["category"] = "植被"
+    card.set_asset(tree)
+    assert card.calls == [{"text": "植被"}]
+
+    # 没有封面的资产共用同一张默认缩略图
+    assert image_utils.load_thumbnail(None, AssetCard.THUMBNAIL_SIZE) is \
+        image_utils.load_thumbnail("", AssetCard.THUMBNAIL_SIZE)
+    print("✅ 卡片重新绑定测试通过")
+
+
+if __name__ == "__main__":
+    print("开始测试资产卡片重新绑定...")
+
+    test_format_asset()
+    test_rebind_updates_only_changes()
+
+    print("🎉 所有测试通过")
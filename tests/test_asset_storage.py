@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试资产库存储后端：SQLite存储、JSON迁移和按需加载
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.asset_storage import AssetStorage, JsonAssetStorage, SqliteAssetStorage, migrate_json_to_sqlite
+from models.resource_store import ResourceStore
+
+DEFAULT_CONFIG = {"resources": [], "categories": ["默认"], "category_paths": {}, "settings": {"fuzzy_search": True}}
+CATEGORIES = ["建筑", "植被", "道具"]
+
+
+def _resource(i):
+    return {"id": f"id{i}", "name": f"Asset_{i}", "path": f"/assets/{CATEGORIES[i % 3]}/Asset_{i}",
+            "category": CATEGORIES[i % 3], "cover": "", "doc": "", "date_added": "2024-01-01 00:00:00"}
+
+
+def test_sqlite_storage():
+    """测试SQLite存储只写入变化的行，搜索结果与内存中逐个比较一致"""
+    print("=== 测试SQLite存储 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="asset_storage_test_")
+    db_file = os.path.join(test_dir, "ue_assets.db")
+    try:
+        storage = SqliteAssetStorage(db_file, DEFAULT_CONFIG)
+        assert storage._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        config = storage.load_config()
+        assert config["categories"] == ["默认"] and "resources" not in config
+
+        config["resources"] = [_resource(i) for i in range(300)]
+        config["categories"] = ["默认"] + CATEGORIES
+        assert storage.save_config(config)
+
+        # 修改一个资源、删除一个：只写入这两行（及其全文索引），而不是全部300行
+        changes = storage._conn.total_changes
+        config["resources"][5] = dict(config["resources"][5], name="Castle_Gate")
+        del config["resources"][7]
+        assert storage.save_config(config)
+        assert storage._conn.total_changes - changes < 30
+        # 没有修改时不写入
+        changes = storage._conn.total_changes
+        assert storage.save_config(config)
+        assert storage._conn.total_changes == changes
+        storage.close()
+
+        storage = SqliteAssetStorage(db_file, DEFAULT_CONFIG)
+        loaded = storage.load_config()
+        assert loaded["categories"] == config["categories"]
+        assert storage.count() == 299
+        assert storage.load_resources(0, 10) == config["resources"][:10]
+        assert storage.load_resources(10) == config["resources"][10:]
+
+        # 与内存中逐个比较的结果一致（保持添加顺序）
+        resources = ResourceStore([dict(resource) for resource in config["resources"]])
+        for term, category in [("castle", None), ("asset_1", None), ("/植被/", None), ("s", "道具"),
+                               ("set_2 建筑", None), ("", "植被"), ("100%", None), ("不存在", None)]:
+            expected = [resource["id"] for resource in resources.search(term, category)]
+            assert [resource["id"] for resource in storage.query(term, category)] == expected, term
+
+        # 子串查询使用trigram索引（带ESCAPE的LIKE会退化为扫描整个全文索引）
+        assert storage.has_fts
+        for term in ("castle", "asset_49", "gate 建筑物"):
+            sql, params = storage._query_sql(term, None)
+            plan = " ".join(row[-1] for row in storage._conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+            assert "VIRTUAL TABLE INDEX 0:L" in plan, plan
+        storage.close()
+        print("✅ SQLite存储测试通过")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_json_storage():
+    """测试JSON存储的搜索与内存中逐个比较一致，日志模式需要开启，存储基类不能直接实例化"""
+    print("=== 测试JSON存储 ===")
+
+    try:
+        AssetStorage()
+        assert False, "存储基类是抽象类"
+    except TypeError:
+        pass
+
+    test_dir = tempfile.mkdtemp(prefix="asset_storage_test_")
+    try:
+        storage = JsonAssetStorage(os.path.join(test_dir, "ue_assets.json"), DEFAULT_CONFIG)
+        config = storage.load_config()
+        config["resources"] = [_resource(i) for i in range(30)]
+        assert storage.save_config(config)
+        resources = ResourceStore([dict(resource) for resource in config["resources"]])
+        for term, category in [("asset_1", None), ("s", "道具"), ("", "植被")]:
+            expected = [resource["id"] for resource in resources.search(term, category)]
+            assert [resource["id"] for resource in storage.query(term, category)] == expected, term
+
+        # 日志模式默认关闭，修改重写整个文件；开启后只追加到日志
+        journal_file = storage.config_manager.journal_file
+        config["resources"][0] = dict(config["resources"][0], name="Renamed")
+        assert storage.save_config(config) and not os.path.exists(journal_file)
+        storage = JsonAssetStorage(os.path.join(test_dir, "ue_assets.json"), DEFAULT_CONFIG, journal=True)
+        config = storage.load_config()
+        config["resources"] = storage.load_resources()
+        config["resources"][1] = dict(config["resources"][1], name="Renamed")
+        assert storage.save_config(config) and os.path.exists(journal_file)
+        print("✅ JSON存储测试通过")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_migrate_json():
+    """测试从ue_assets.json一次性迁移"""
+    print("=== 测试JSON迁移 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="asset_storage_test_")
+    json_file = os.path.join(test_dir, "ue_assets.json")
+    db_file = os.path.join(test_dir, "ue_assets.db")
+    try:
+        old_resource = _resource(1)
+        del old_resource["id"]
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump({"resources": [_resource(0), old_resource], "categories": ["默认", "建筑"],
+                       "category_paths": {"建筑": ["/assets/建筑"]}, "version": "1.0.0"}, f)
+
+        assert migrate_json_to_sqlite(json_file, db_file, DEFAULT_CONFIG) == 2
+        assert os.path.exists(json_file)
+
+        storage = SqliteAssetStorage(db_file, DEFAULT_CONFIG)
+        config = storage.load_config()
+        assert config["category_paths"] == {"建筑": ["/assets/建筑"]}
+        resources = storage.load_resources()
+        assert [resource["name"] for resource in resources] == ["Asset_0", "Asset_1"]
+        # 没有id的资源补充了id
+        assert resources[1]["id"]
+        storage.close()
+
+        try:
+            migrate_json_to_sqlite(json_file, db_file, DEFAULT_CONFIG)
+            assert False, "数据库已存在时不应重复导入"
+        except FileExistsError:
+            pass
+        print("✅ JSON迁移测试通过")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+class GatedStorage(SqliteAssetStorage):
+    """首屏之后的资源等待测试放行后才读取"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gate = threading.Event()
+
+    def load_resources(self, offset=0, limit=None):
+        if offset:
+            self.gate.wait(5)
+        return super().load_resources(offset, limit)
+
+
+def test_asset_manager_lazy_load():
+    """测试AssetManager启动时只读取首屏，读取完成前搜索在数据库中进行"""
+    print("=== 测试按需加载 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="asset_storage_test_")
+    old_xdg = os.environ.get('XDG_CONFIG_HOME')
+    old_appdata = os.environ.get('APPDATA')
+    os.environ['XDG_CONFIG_HOME'] = test_dir
+    os.environ['APPDATA'] = test_dir
+    manager = None
+    try:
+        from models.asset_manager import AssetManager, DEFAULT_ASSETS_CONFIG
+        db_file = os.path.join(test_dir, "assets.db")
+        seed = SqliteAssetStorage(db_file, DEFAULT_ASSETS_CONFIG)
+        seed.save_config({"resources": [_resource(i) for i in range(500)], "categories": ["默认"] + CATEGORIES})
+        seed.close()
+
+        storage = GatedStorage(db_file, DEFAULT_ASSETS_CONFIG)
+        manager = AssetManager(storage=storage)
+        assert len(manager.resources) == AssetManager.FIRST_SCREEN_RESOURCES
+        assert not manager.is_loaded() and manager.resource_count() == 500
+        # 首屏直接显示已读取的资源，搜索在数据库中进行
+        assert len(manager.get_filtered_resources("全部", "")) == AssetManager.FIRST_SCREEN_RESOURCES
+        found = manager.get_filtered_resources("全部", "asset_49")
+        assert [resource["name"] for resource in found] == ["Asset_49"] + [f"Asset_{i}" for i in range(490, 500)]
+        assert found[0] is manager.get_resource("id49")
+        assert len(manager.get_filtered_resources("植被", "")) == 167
+
+        storage.gate.set()
+        assert len(manager.get_resources()) == 500 and manager.is_loaded()
+        assert manager.get_filtered_resources("全部", "asset_499")[0] is manager.get_resource("id499")
+
+        # 修改写回数据库
+        assert manager.set_resource_category(manager.get_resource("id3"), "植被")
+        manager.flush()
+        reader = SqliteAssetStorage(db_file, DEFAULT_ASSETS_CONFIG)
+        assert "id3" in [resource["id"] for resource in reader.query("", "植被")]
+        reader.close()
+        print("✅ 按需加载测试通过")
+    finally:
+        # 删除测试目录前写入未保存的修改
+        if manager is not None:
+            manager.close()
+        for key, value in (('XDG_CONFIG_HOME', old_xdg), ('APPDATA', old_appdata)):
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("开始测试资产库存储...")
+
+    test_sqlite_storage()
+    test_json_storage()
+    test_migrate_json()
+    test_asset_manager_lazy_load()
+
+    print("🎉 所有测试通过")
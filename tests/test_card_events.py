@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试卡片事件通过共用的bindtag分发
+"""
+
+import os
+import sys
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.card_events import CardEventDispatcher
+
+
+class FakeInterp:
+    """模拟Tcl解释器，记录类绑定"""
+
+    def __init__(self):
+        self.class_bindings = {}
+
+
+class FakeWidget:
+    """模拟Tk组件的路径、子组件和bindtags"""
+
+    def __init__(self, master, name, interp=None):
+        self.master = master
+        self.tk = interp or master.tk
+        self.path = f"{master.path if master else ''}.{name}"
+        self.children = []
+        self.tags = (self.path, "Frame", ".", "all")
+        self.cursor = None
+        if master:
+            master.children.append(self)
+
+    def __str__(self):
+        return self.path
+
+    def winfo_children(self):
+        return list(self.children)
+
+    def bindtags(self, tags=None):
+        if tags is None:
+            return self.tags
+        self.tags = tags
+
+    def configure(self, **kwargs):
+        self.cursor = kwargs.get("cursor", self.cursor)
+
+    def bind_class(self, tag, sequence, func, add=None):
+        self.tk.class_bindings.setdefault((tag, sequence), []).append(func)
+
+
+class FakeEvent:
+    def __init__(self, widget):
+        self.widget = widget
+
+
+def fire(widget, sequence):
+    """按bindtags顺序触发事件（只处理类绑定）"""
+    for tag in widget.bindtags():
+        for func in widget.tk.class_bindings.get((tag, sequence), []):
+            func(FakeEvent(widget))
+
+
+def _make_card(root, name):
+    card = FakeWidget(root, name)
+    label = FakeWidget(FakeWidget(card, "info"), "label")
+    button = FakeWidget(card, "button")
+    button_text = FakeWidget(button, "text")
+    return card, label, button, button_text
+
+
+def test_dispatch_to_card():
+    """测试事件分发到所属卡片，所有卡片共用一组类绑定"""
+    print("=== 测试卡片事件分发 ===")
+
+    root = FakeWidget(None, "grid", FakeInterp())
+    clicks = []
+    events = CardEventDispatcher("Card", {"<Button-1>": lambda data, event: clicks.append(data)})
+
+    cards = [_make_card(root, f"card{i}") for i in range(50)]
+    for i, (card, label, button, button_text) in enumerate(cards):
+        events.attach(card, f"asset{i}", skip=lambda widget: widget.path.endswith("button"), cursor="hand2")
+
+    # 50张卡片只注册一次：点击事件和销毁事件
+    assert len(root.tk.class_bindings) == 2
+    assert all(len(funcs) == 1 for funcs in root.tk.class_bindings.values())
+
+    card, label, button, button_text = cards[7]
+    assert label.bindtags()[0] == events.tag and label.cursor == "hand2"
+    # 跳过的组件本身不处理，其子组件仍然处理
+    assert events.tag not in button.bindtags() and button.cursor is None
+    assert button_text.bindtags()[0] == events.tag
+
+    fire(label, "<Button-1>")
+    fire(card, "<Button-1>")
+    fire(root, "<Button-1>")
+    assert clicks == ["asset7", "asset7"]
+    assert events.resolve(root) is None
+
+    # 重复attach不会重复添加bindtag
+    events.attach(card, "asset7-new")
+    assert card.bindtags().count(events.tag) == 1
+    fire(label, "<Button-1>")
+    assert clicks[-1] == "asset7-new"
+    print("✅ 卡片事件分发测试通过")
+
+
+def test_destroy_forgets_card():
+    """测试卡片销毁后不再分发"""
+    print("=== 测试卡片销毁 ===")
+
+    root = FakeWidget(None, "list", FakeInterp())
+    clicks = []
+    events = CardEventDispatcher("Card", {"<Button-3>": lambda data, event: clicks.append(data)})
+    card, label, button, button_text = _make_card(root, "card")
+    events.attach(card, "project")
+
+    fire(label, "<Destroy>")
+    fire(card, "<Destroy>")
+    fire(label, "<Button-3>")
+    assert clicks == []
+
+    # 不同分发器使用不同的bindtag
+    assert CardEventDispatcher("Card", {}).tag != events.tag
+    print("✅ 卡片销毁测试通过")
+
+
+if __name__ == "__main__":
+    print("开始测试卡片事件分发...")
+
+    test_dispatch_to_card()
+    test_destroy_forgets_card()
+
+    print("🎉 所有测试通过")
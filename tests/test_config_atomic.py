@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试配置管理器的原子写入和备份恢复
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config_manager import ConfigManager
+
+DEFAULT_CONFIG = {"resources": [], "categories": ["默认"]}
+
+
+def _manager(test_dir, journal=False):
+    return ConfigManager(os.path.join(test_dir, "ue_assets.json"), "1.0.0", DEFAULT_CONFIG,
+                         journal=journal, keyed_lists={"resources": "id"})
+
+
+def _config(count):
+    return {"resources": [{"id": f"id{i}", "name": f"Asset{i}"} for i in range(count)],
+            "categories": ["默认"], "version": "1.0.0"}
+
+
+def test_rotating_backups():
+    """测试每次重写配置文件时轮换备份，不留下临时文件"""
+    print("=== 测试备份轮换 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="config_atomic_test_")
+    try:
+        manager = _manager(test_dir)
+        manager.load_config()
+        for count in range(1, 6):
+            assert manager.save_config(_config(count))
+
+        # .bak1是上一次保存的内容，只保留BACKUP_COUNT份
+        for index in range(1, ConfigManager.BACKUP_COUNT + 1):
+            with open(manager._backup_file(index), 'r', encoding='utf-8') as f:
+                assert len(json.load(f)["resources"]) == 5 - index
+        assert not os.path.exists(manager._backup_file(ConfigManager.BACKUP_COUNT + 1))
+        assert not os.path.exists(manager.config_file + ConfigManager.TEMP_SUFFIX)
+        print("✅ 备份轮换测试通过")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_recover_from_backup():
+    """测试配置文件损坏时从最新的可用备份恢复"""
+    print("=== 测试备份恢复 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="config_atomic_test_")
+    try:
+        manager = _manager(test_dir)
+        manager.load_config()
+        for count in (10, 20, 30):
+            manager.save_config(_config(count))
+        # 日志中的修改在恢复的备份上重放
+        manager = _manager(test_dir, journal=True)
+        config = manager.load_config()
+        config["categories"].append("植被")
+        manager.save_config(config)
+        assert os.path.exists(manager.journal_file)
+
+        # 写到一半的配置文件，且最新的备份也损坏
+        with open(manager.config_file, 'w', encoding='utf-8') as f:
+            f.write('{"resources": [{"id": "id0", "na')
+        with open(manager._backup_file(1), 'w', encoding='utf-8') as f:
+            f.write('')
+
+        recovered = _manager(test_dir, journal=True).load_config()
+        assert [resource["id"] for resource in recovered["resources"]] == [f"id{i}" for i in range(10)]
+        assert recovered["categories"] == ["默认", "植被"]
+        assert os.path.exists(manager.config_file + ".corrupt")
+        assert _manager(test_dir).load_config() == recovered
+
+        # 没有可用备份时使用默认配置
+        for index in range(1, ConfigManager.BACKUP_COUNT + 1):
+            if os.path.exists(manager._backup_file(index)):
+                os.remove(manager._backup_file(index))
+        with open(manager.config_file, 'w', encoding='utf-8') as f:
+            f.write('[')
+        assert _manager(test_dir).load_config()["resources"] == []
+        print("✅ 备份恢复测试通过")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_concurrent_reader():
+    """测试写入过程中读取方始终读到完整的配置"""
+    print("=== 测试并发读取 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="config_atomic_test_")
+    try:
+        manager = _manager(test_dir)
+        manager.load_config()
+        manager.save_config(_config(2000))
+        done = threading.Event()
+        errors = []
+
+        def read():
+            while not done.is_set():
+                try:
+                    with open(manager.config_file, 'r', encoding='utf-8') as f:
+                        assert len(json.load(f)["resources"]) >= 2000
+                except Exception as e:
+                    errors.append(e)
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        for count in range(2000, 2020):
+            manager.save_config(_config(count))
+        done.set()
+        reader.join()
+        assert not errors, errors
+        print("✅ 并发读取测试通过")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("开始测试配置原子写入...")
+
+    test_rotating_backups()
+    test_recover_from_backup()
+    test_concurrent_reader()
+
+    print("🎉 所有测试通过")
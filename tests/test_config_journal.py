@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试配置管理器的追加日志模式
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config_manager import ConfigManager
+
+DEFAULT_CONFIG = {"resources": [], "categories": ["默认"], "settings": {"fuzzy_search": True}}
+
+
+def _resource(i):
+    return {"id": f"id{i}", "name": f"Asset{i}", "path": f"/assets/Asset{i}", "category": "默认"}
+
+
+def _manager(test_dir, journal=True):
+    return ConfigManager(os.path.join(test_dir, "ue_assets.json"), "1.0.0", DEFAULT_CONFIG,
+                         journal=journal, keyed_lists={"resources": "id"})
+
+
+def _journal_lines(manager):
+    if not os.path.exists(manager.journal_file):
+        return []
+    with open(manager.journal_file, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_journal_records():
+    """测试修改只追加记录，重新加载时重放"""
+    print("=== 测试追加日志 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="config_journal_test_")
+    try:
+        manager = _manager(test_dir)
+        config = manager.load_config()
+        config["resources"] = [_resource(i) for i in range(1000)]
+        assert manager.save_config(config)
+        # 大部分列表项都变了，直接重写快照
+        assert _journal_lines(manager) == []
+        with open(manager.config_file, 'rb') as f:
+            snapshot = f.read()
+
+        # 修改一个资源、删除一个、添加一个、修改设置
+        config["resources"][10] = dict(config["resources"][10], name="Renamed")
+        del config["resources"][20]
+        config["resources"].append(_resource(1000))
+        config["settings"]["fuzzy_search"] = False
+        assert manager.save_config(config)
+
+        with open(manager.config_file, 'rb') as f:
+            assert f.read() == snapshot
+        ops = sorted((record["op"], record["key"]) for record in _journal_lines(manager))
+        assert ops == [("del", "resources"), ("put", "resources"), ("put", "resources"), ("set", "settings")]
+
+        # 没有修改时不追加
+        assert manager.save_config(config)
+        assert len(_journal_lines(manager)) == 4
+
+        assert _manager(test_dir).load_config() == config
+        print("✅ 追加日志测试通过")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_compaction_and_recovery():
+    """测试日志过大时压缩，损坏的记录被跳过，关闭日志模式后合并回配置文件"""
+    print("=== 测试日志压缩 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="config_journal_test_")
+    try:
+        manager = _manager(test_dir)
+        manager.COMPACT_MIN_BYTES = 0
+        config = manager.load_config()
+        config["resources"] = [_resource(i) for i in range(20)]
+        manager.save_config(config)
+
+        compacted = False
+        for i in range(200):
+            config["resources"][i % 20]["name"] = f"Edit{i}"
+            manager.save_config(config)
+            size = os.path.getsize(manager.journal_file) if os.path.exists(manager.journal_file) else 0
+            assert size <= os.path.getsize(manager.config_file)
+            compacted = compacted or size == 0
+        assert compacted
+        assert _manager(test_dir).load_config() == config
+
+        # 顺序变化无法按键表示时记录整个列表
+        config["resources"].reverse()
+        manager.save_config(config)
+        assert _manager(test_dir).load_config() == config
+
+        # 写入中断留下的不完整记录
+        config["categories"].append("植被")
+        manager.save_config(config)
+        with open(manager.journal_file, 'a', encoding='utf-8') as f:
+            f.write('{"op":"set","key":"categ')
+        assert _manager(test_dir).load_config() == config
+
+        # 关闭日志模式：日志合并回配置文件
+        assert _manager(test_dir, journal=False).load_config() == config
+        assert not os.path.exists(manager.journal_file)
+        with open(manager.config_file, 'r', encoding='utf-8') as f:
+            assert json.load(f) == config
+        print("✅ 日志压缩测试通过")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_truncated_journal_then_save():
+    """测试日志末尾有写入中断的记录时，之后保存的修改不会丢失"""
+    print("=== 测试中断后继续追加 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="config_journal_test_")
+    try:
+        manager = _manager(test_dir)
+        config = manager.load_config()
+        config["resources"] = [_resource(i) for i in range(10)]
+        manager.save_config(config)
+        config["resources"].append(_resource(10))
+        manager.save_config(config)
+
+        # 截断最后一条记录（没有结尾的换行）
+        with open(manager.journal_file, 'rb') as f:
+            data = f.read()
+        with open(manager.journal_file, 'wb') as f:
+            f.write(data[:len(data) // 2])
+
+        manager = _manager(test_dir)
+        config = manager.load_config()
+        assert [resource["id"] for resource in config["resources"]] == [f"id{i}" for i in range(10)]
+        config["resources"].append(_resource(11))
+        assert manager.save_config(config)
+
+        reloaded = _manager(test_dir).load_config()
+        assert reloaded == config
+        assert reloaded["resources"][-1]["id"] == "id11"
+        print("✅ 中断后继续追加测试通过")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_replay_keeps_records():
+    """测试快照中有缺少键的列表项或有无法应用的记录时，其他记录照常重放，日志不被删除"""
+    print("=== 测试重放保留记录 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="config_journal_test_")
+    try:
+        manager = _manager(test_dir)
+        config = manager.load_config()
+        config["resources"] = [_resource(i) for i in range(10)]
+        manager.save_config(config)
+        config["resources"].append(_resource(10))
+        manager.save_config(config)
+
+        # 快照中的一个资源没有id
+        with open(manager.config_file, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        del snapshot["resources"][3]["id"]
+        with open(manager.config_file, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f)
+        # 一条能解码但无法应用的记录
+        with open(manager.journal_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({"op": "put", "key": "resources", "value": {"name": "NoId"},
+                                "gen": snapshot[ConfigManager.GENERATION_KEY]}) + "\n")
+
+        loaded = _manager(test_dir).load_config()
+        ids = [resource.get("id") for resource in loaded["resources"]]
+        assert ids == [f"id{i}" for i in range(3)] + [None] + [f"id{i}" for i in range(4, 11)], ids
+        assert os.path.exists(manager.journal_file)
+        assert os.path.exists(manager.journal_file + ".corrupt")
+        assert any(record.get("value", {}).get("id") == "id10" for record in _journal_lines(manager))
+        print("✅ 重放保留记录测试通过")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+def test_stale_journal_after_snapshot():
+    """测试重写快照后、删除日志前中断时，旧日志不会覆盖快照中较新的修改"""
+    print("=== 测试过期日志 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="config_journal_test_")
+    try:
+        manager = _manager(test_dir)
+        config = manager.load_config()
+        config["resources"] = [_resource(i) for i in range(10)]
+        manager.save_config(config)
+        config["resources"][0] = dict(config["resources"][0], name="Old")
+        manager.save_config(config)
+        with open(manager.journal_file, 'rb') as f:
+            old_journal = f.read()
+
+        # 修改后重写快照，然后模拟删除日志前中断：旧日志还在
+        config["resources"][0] = dict(config["resources"][0], name="New")
+        manager._write_snapshot(config)
+        with open(manager.journal_file, 'wb') as f:
+            f.write(old_journal)
+
+        manager = _manager(test_dir)
+        loaded = manager.load_config()
+        assert loaded["resources"][0]["name"] == "New"
+        assert manager.GENERATION_KEY not in loaded
+        # 之后追加的记录照常重放
+        loaded["resources"][1] = dict(loaded["resources"][1], name="Later")
+        manager.save_config(loaded)
+        assert _manager(test_dir).load_config() == loaded
+        print("✅ 过期日志测试通过")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("开始测试配置日志...")
+
+    test_journal_records()
+    test_compaction_and_recovery()
+    test_truncated_journal_then_save()
+    test_replay_keeps_records()
+    test_stale_journal_after_snapshot()
+
+    print("🎉 所有测试通过")
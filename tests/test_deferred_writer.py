@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试延迟写入合并连续的修改
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.deferred_writer import DeferredWriter, _open_writers
+
+
+def test_coalesce_and_flush():
+    """测试连续修改只写入一次，flush立即写入"""
+    print("=== 测试合并写入 ===")
+
+    writes = []
+    writer = DeferredWriter(lambda: writes.append(1) or True, delay=60)
+    try:
+        for _ in range(500):
+            writer.mark_dirty()
+        assert writer.dirty and writes == []
+
+        assert writer.flush()
+        assert writes == [1] and not writer.dirty
+        # 没有新的修改时不再写入
+        assert writer.flush()
+        assert writes == [1]
+        print("✅ 合并写入测试通过")
+    finally:
+        writer.close()
+
+
+def test_background_write():
+    """测试安静期后由后台线程写入，写入失败时保留修改"""
+    print("=== 测试后台写入 ===")
+
+    written = threading.Event()
+    threads = []
+    results = [False, True]
+
+    def write():
+        threads.append(threading.current_thread())
+        written.set()
+        return results.pop(0)
+
+    writer = DeferredWriter(write, delay=0.05, max_delay=0.05)
+    try:
+        writer.mark_dirty()
+        assert written.wait(5)
+        assert threads[0] is not threading.current_thread()
+
+        # 第一次写入失败，修改仍未保存，flush时重试
+        deadline = time.time() + 5
+        while not writer.dirty and time.time() < deadline:
+            time.sleep(0.01)
+        assert writer.failed
+        assert writer.flush()
+        assert not writer.dirty and not writer.failed and len(threads) == 2
+
+        # 没有修改时后台线程退出
+        deadline = time.time() + 5
+        while writer._worker is not None and time.time() < deadline:
+            time.sleep(0.01)
+        assert writer._worker is None and not threads[0].is_alive()
+        print("✅ 后台写入测试通过")
+    finally:
+        writer.close()
+    # 关闭后不再需要在退出时写入
+    assert writer not in _open_writers
+
+
+def test_asset_manager_batch():
+    """测试AssetManager批量修改只写入少量几次"""
+    print("=== 测试AssetManager合并写入 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="deferred_writer_test_")
+    old_xdg = os.environ.get('XDG_CONFIG_HOME')
+    old_appdata = os.environ.get('APPDATA')
+    os.environ['XDG_CONFIG_HOME'] = test_dir
+    os.environ['APPDATA'] = test_dir
+    manager = None
+    try:
+        from models.asset_manager import AssetManager
+        manager = AssetManager()
+        manager.flush()
+        writes_before = manager.writer.write_count
+
+        for i in range(200):
+            assert manager.add_category_path("默认", os.path.join(test_dir, f"folder{i}"))
+        assert manager.writer.write_count - writes_before <= 3
+
+        # 从文件重新加载
+        manager.load_data()
+        assert len(manager.category_paths["默认"]) == 200
+
+        # 重新加载前先写入未保存的修改
+        manager.add_category("新分类")
+        manager.load_data()
+        assert "新分类" in manager.categories
+        print("✅ AssetManager合并写入测试通过")
+    finally:
+        # 删除测试目录前写入未保存的修改
+        if manager is not None:
+            manager.close()
+        for key, value in (('XDG_CONFIG_HOME', old_xdg), ('APPDATA', old_appdata)):
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("开始测试延迟写入...")
+
+    test_coalesce_and_flush()
+    test_background_write()
+    test_asset_manager_batch()
+
+    print("🎉 所有测试通过")
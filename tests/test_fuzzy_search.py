@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试模糊搜索和相关度排序
+"""
+
+import os
+import sys
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.fuzzy_search import within_one_edit, split_words
+from models.resource_store import ResourceStore
+
+
+def _make_store(names, dates=None):
+    resources = []
+    for i, name in enumerate(names):
+        resource = {"name": name, "category": "默认", "path": os.path.join(os.sep, "assets", name)}
+        if dates:
+            resource["date_added"] = dates[i]
+        resources.append(resource)
+    store = ResourceStore(resources)
+    store.build_search_index()
+    return store
+
+
+def _fuzzy(store, term):
+    return [r["name"] for r in store.search(term, fuzzy=True)]
+
+
+def test_edit_distance():
+    """测试单词拆分和1处编辑的判断"""
+    print("=== 测试编辑距离 ===")
+
+    assert [m.group() for m in split_words("Medieval_CastleKit 02")] == ["Medieval", "Castle", "Kit", "02"]
+    assert [m.group() for m in split_words("HDRIPack")] == ["HDRI", "Pack"]
+
+    assert within_one_edit("castle", "castle")
+    assert within_one_edit("castel", "castle")   # 相邻交换
+    assert within_one_edit("casle", "castle")    # 缺少字符
+    assert within_one_edit("casttle", "castle")  # 多出字符
+    assert within_one_edit("cistle", "castle")   # 替换
+    assert not within_one_edit("cstel", "castle")
+    assert not within_one_edit("castle", "cattle_x")
+    print("✅ 编辑距离测试通过")
+
+
+def test_ranking():
+    """测试拼写容错、首字母缩写和相关度排序"""
+    print("=== 测试相关度排序 ===")
+
+    store = _make_store(["Medieval_Castle_Kit", "ModularCastle", "Castle", "CastleWalls", "Rock_Pack"])
+
+    # 完全相同 > 名称开头 > 单词开头
+    assert _fuzzy(store, "castle") == ["Castle", "CastleWalls", "ModularCastle", "Medieval_Castle_Kit"]
+    # 拼写错误仍能找到，名称越短越靠前
+    assert _fuzzy(store, "castel")[0] == "Castle"
+    assert _fuzzy(store, "rokc") == ["Rock_Pack"]
+    # 首字母缩写
+    assert _fuzzy(store, "mck") == ["Medieval_Castle_Kit"]
+    # 多个词都需要命中
+    assert _fuzzy(store, "castel kit") == ["Medieval_Castle_Kit"]
+    assert _fuzzy(store, "castle rock") == []
+
+    # 关闭模糊搜索时保持原来的子串匹配和添加顺序
+    assert [r["name"] for r in store.search("castle")] == \
+        ["Medieval_Castle_Kit", "ModularCastle", "Castle", "CastleWalls"]
+    assert store.search("castel") == []
+    print("✅ 相关度排序测试通过")
+
+
+def test_recency_and_updates():
+    """测试最近添加优先，以及资源修改后模糊索引同步"""
+    print("=== 测试添加时间和索引更新 ===")
+
+    store = _make_store(["Rock_Old", "Rock_New"], ["2020-01-01 10:00:00", "2099-01-01 10:00:00"])
+    assert _fuzzy(store, "rock") == ["Rock_New", "Rock_Old"]
+
+    old = store.get_by_name("Rock_Old")[0]
+    store.update(old, name="Stone_Old", path=os.path.join(os.sep, "assets", "Stone_Old"))
+    assert _fuzzy(store, "rock") == ["Rock_New"]
+    assert _fuzzy(store, "ston") == ["Stone_Old"]
+    assert _fuzzy(store, "stine") == ["Stone_Old"]
+
+    store.remove(old)
+    assert _fuzzy(store, "stone") == []
+    print("✅ 添加时间和索引更新测试通过")
+
+
+if __name__ == "__main__":
+    print("开始测试模糊搜索...")
+
+    test_edit_distance()
+    test_ranking()
+    test_recency_and_updates()
+
+    print("🎉 所有测试通过")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试卡片悬停动画只跟踪一张卡片并合并重绘
+"""
+
+import os
+import sys
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.hover_animator import HoverAnimator
+
+COLORS = {"white": (255, 255, 255), "black": (0, 0, 0)}
+
+
+class FakeWindow:
+    """模拟顶层窗口的after/after_cancel，由测试手动推进"""
+
+    def __init__(self):
+        self.timers = {}
+        self.next_id = 0
+
+    def after(self, delay_ms, callback):
+        self.next_id += 1
+        self.timers[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, timer_id):
+        self.timers.pop(timer_id, None)
+
+    def fire_timers(self):
+        timers, self.timers = self.timers, {}
+        for callback in timers.values():
+            callback()
+
+
+class FakeCard:
+    """记录configure调用的卡片"""
+
+    def __init__(self, window, name):
+        self.window = window
+        self.name = name
+        self.calls = []
+        self.exists = True
+
+    def winfo_toplevel(self):
+        return self.window
+
+    def winfo_exists(self):
+        return self.exists
+
+    def winfo_rgb(self, color):
+        return tuple(value * 257 for value in COLORS[color])
+
+    def configure(self, **kwargs):
+        self.calls.append(kwargs)
+
+
+NORMAL = {"fg_color": ("white", "black"), "border_width": 1}
+HOVER = {"fg_color": ("black", "white"), "border_width": 3}
+
+
+def test_transition():
+    """测试进入和离开的颜色过渡"""
+    print("=== 测试悬停过渡 ===")
+
+    window = FakeWindow()
+    card = FakeCard(window, "rock")
+    animator = HoverAnimator(NORMAL, HOVER, steps=4)
+
+    animator.enter(card)
+    assert animator.hovered is card and len(window.timers) == 1 and card.calls == []
+    window.fire_timers()
+    assert card.calls == [{"fg_color": ("#bfbfbf", "#404040"), "border_width": 2}]
+    for _ in range(3):
+        window.fire_timers()
+    # 过渡完成后使用原样式，定时器停止
+    assert card.calls[-1] == HOVER and len(card.calls) == 4
+    assert not window.timers
+
+    animator.leave(card)
+    for _ in range(4):
+        window.fire_timers()
+    assert card.calls[-1] == NORMAL and len(card.calls) == 8
+    assert animator.hovered is None and not window.timers
+    print("✅ 悬停过渡测试通过")
+
+
+def test_children_and_sweep():
+    """测试子组件之间移动不重绘，快速划过多张卡片只有少量重绘"""
+    print("=== 测试合并重绘 ===")
+
+    window = FakeWindow()
+    animator = HoverAnimator(NORMAL, HOVER, steps=4)
+    card = FakeCard(window, "tree")
+
+    animator.enter(card)
+    for _ in range(4):
+        window.fire_timers()
+    card.calls.clear()
+
+    # 卡片内的Leave紧跟同一张卡片的Enter
+    for _ in range(20):
+        animator.leave(card)
+        animator.enter(card)
+    window.fire_timers()
+    assert card.calls == [] and animator.hovered is card
+
+    # 两帧之间划过一整排卡片：中间的卡片不做任何配置
+    row = [FakeCard(window, f"card{i}") for i in range(30)]
+    for other in row:
+        animator.leave(animator.hovered)
+        animator.enter(other)
+    assert len(window.timers) == 1
+    while window.timers:
+        window.fire_timers()
+    assert all(not other.calls for other in row[:-1])
+    assert len(row[-1].calls) == 4 and len(card.calls) == 4
+    assert card.calls[-1] == NORMAL and row[-1].calls[-1] == HOVER
+
+    # 已销毁的卡片被忽略
+    row[-1].exists = False
+    animator.leave(row[-1])
+    window.fire_timers()
+    assert len(row[-1].calls) == 4 and not window.timers
+    print("✅ 合并重绘测试通过")
+
+
+if __name__ == "__main__":
+    print("开始测试悬停动画...")
+
+    test_transition()
+    test_children_and_sweep()
+
+    print("🎉 所有测试通过")
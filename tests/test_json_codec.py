@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试JSON编解码器选择和配置文件的紧凑格式
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.json_codec import CODEC_PREFERENCE, get_codec
+from utils.config_manager import ConfigManager
+
+CONFIG = {"resources": [{"id": "a1", "name": "城堡", "path": "D:\\UE\\城堡/Content", "size": 2 ** 40}],
+          "settings": {"fuzzy_search": True, "ratio": 0.5, "empty": None}, "version": "1.0.0"}
+
+
+def _codecs():
+    return [get_codec(name) for name in CODEC_PREFERENCE if get_codec(name).name == name]
+
+
+def test_codecs():
+    """测试各编解码器编码结果相同、可以互相读取"""
+    print("=== 测试编解码器 ===")
+
+    assert get_codec().name == next(name for name in CODEC_PREFERENCE if get_codec(name).name == name)
+    assert get_codec("not-installed").name == "json"
+    stdlib = get_codec("json")
+    for codec in _codecs():
+        for indent in (False, True):
+            data = codec.dumps(CONFIG, indent)
+            assert isinstance(data, bytes)
+            assert "城堡".encode("utf-8") in data
+            assert (b"\n" in data) == indent
+            assert stdlib.loads(data) == CONFIG
+            assert codec.loads(data) == codec.loads(data.decode("utf-8")) == CONFIG
+        # 不支持的内容退回标准库
+        assert codec.loads(codec.dumps({"n": 2 ** 70})) == {"n": 2 ** 70}
+        try:
+            codec.loads(b'{"resources": [')
+            assert False, "格式错误应抛出异常"
+        except json.JSONDecodeError:
+            pass
+    print("✅ 编解码器测试通过")
+
+
+def test_config_format():
+    """测试配置文件按大小选择格式，导出为缩进格式"""
+    print("=== 测试配置文件格式 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="json_codec_test_")
+    config_file = os.path.join(test_dir, "config.json")
+    try:
+        manager = ConfigManager(config_file, "1.0.0", {"resources": []})
+        manager.load_config()
+        manager.save_config(CONFIG)
+        with open(config_file, 'rb') as f:
+            assert b'\n  "resources"' in f.read()
+
+        # 超过阈值时不缩进
+        manager.COMPACT_FORMAT_BYTES = 10
+        manager.save_config(CONFIG)
+        with open(config_file, 'rb') as f:
+            data = f.read()
+        assert b"\n" not in data
+        for codec in _codecs():
+            assert ConfigManager(config_file, "1.0.0", {}, codec=codec.name).load_config() == CONFIG
+
+        export_file = os.path.join(test_dir, "export.json")
+        assert manager.export_config(CONFIG, export_file)
+        with open(export_file, 'r', encoding='utf-8') as f:
+            text = f.read()
+        assert '\n  "resources"' in text and json.loads(text) == CONFIG
+
+        # 指定格式
+        ConfigManager(config_file, "1.0.0", {}, compact=False).save_config(CONFIG)
+        with open(config_file, 'rb') as f:
+            assert b"\n" in f.read()
+        print("✅ 配置文件格式测试通过")
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("开始测试JSON编解码...")
+
+    test_codecs()
+    test_config_format()
+
+    print("🎉 所有测试通过")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试路径屏蔽规则匹配
+"""
+
+import os
+import sys
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.path_matcher import PathMatcher
+
+
+def test_component_and_prefix_rules():
+    """测试目录名、相对路径片段和绝对路径前缀规则"""
+    print("=== 测试目录名和路径前缀规则 ===")
+
+    matcher = PathMatcher(["node_modules", "AppData\\Local", "C:\\Windows", "/proc"])
+
+    # 目录名规则只匹配完整的目录名，不再是子串匹配
+    assert matcher.match_entry("D:\\Work\\node_modules")
+    assert not matcher.match_entry("D:\\Work\\node_modules_backup")
+
+    # 相对路径片段规则匹配任意位置
+    assert matcher.match_entry("C:\\Users\\dev\\AppData\\Local")
+    assert not matcher.match_entry("C:\\Users\\dev\\Local")
+
+    # 绝对路径前缀只匹配该路径，大小写和分隔符不敏感
+    assert matcher.match_entry("c:/windows")
+    assert not matcher.match_entry("D:\\Windows")
+    assert matcher.match_entry("/proc")
+    assert not matcher.match_entry("/home/proc_data")
+
+    # matches检查所有上级目录
+    assert matcher.matches("C:\\Windows\\System32\\drivers")
+    assert matcher.matches("D:\\Web\\node_modules\\pkg\\Game.uproject")
+    assert not matcher.matches("D:\\Projects\\MyGame\\MyGame.uproject")
+    print("✅ 目录名和路径前缀规则测试通过")
+
+
+def test_glob_rules():
+    """测试通配符规则"""
+    print("=== 测试通配符规则 ===")
+
+    matcher = PathMatcher(["*.tmp", "Backup?", "D:\\Archive\\**\\Cache", "[._]cache"])
+
+    assert matcher.match_entry("C:\\Work\\build.tmp")
+    assert matcher.match_entry("C:\\Work\\Backup1")
+    assert not matcher.match_entry("C:\\Work\\Backup12")
+    assert matcher.match_entry("D:\\Archive\\2023\\UE\\Cache")
+    assert not matcher.match_entry("E:\\Archive\\2023\\Cache")
+    assert matcher.match_entry("/home/dev/.cache")
+    assert matcher.match_entry("/home/dev/_cache")
+    assert not matcher.match_entry("/home/dev/xcache")
+    print("✅ 通配符规则测试通过")
+
+
+def test_empty_matcher():
+    """测试没有规则时不屏蔽任何路径"""
+    matcher = PathMatcher([])
+    assert not matcher.matches("C:\\Windows\\System32")
+    assert not PathMatcher(None).match_entry("/")
+
+
+if __name__ == "__main__":
+    print("开始测试路径屏蔽规则...")
+
+    test_component_and_prefix_rules()
+    test_glob_rules()
+    test_empty_matcher()
+
+    print("🎉 所有测试通过")
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试工程扫描器
+"""
+
+import os
+import sys
+import tempfile
+import shutil
+import threading
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.project_scanner import ProjectScanner, ScanJob, resolve_scan_roots
+from models import project_index
+from models.project_index import ProjectIndex
+
+
+def _touch(path, content="{}"):
+    """创建文件（自动创建父目录）"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def _make_drives(base):
+    """创建两个模拟磁盘"""
+    drive_a = os.path.join(base, "DriveA")
+    drive_b = os.path.join(base, "DriveB")
+    _touch(os.path.join(drive_a, "RootGame.uproject"))
+    _touch(os.path.join(drive_a, "Work", "ShooterGame", "ShooterGame.uproject"))
+    _touch(os.path.join(drive_a, "Work", "node_modules", "Hidden", "Hidden.uproject"))
+    _touch(os.path.join(drive_b, "Projects", "Deep", "A", "B", "RPG", "RPG.uproject"))
+    _touch(os.path.join(drive_b, "IgnoreMe", "Cached", "Cached.uproject"))
+    return drive_a, drive_b
+
+
+def test_parallel_scan_merges_all_drives():
+    """测试多磁盘并行扫描并合并结果"""
+    print("=== 测试多磁盘并行扫描 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="scanner_test_")
+    try:
+        drives = list(_make_drives(test_dir))
+        progress = []
+        scanner = ProjectScanner(exclude_paths=['node_modules', 'ignoreme'], max_workers=4)
+        projects = scanner.scan(drives, progress.append)
+
+        names = sorted(p['name'] for p in projects)
+        assert names == ["RPG", "RootGame", "ShooterGame"], names
+        assert progress and progress[-1] == 1.0
+        assert all(a <= b for a, b in zip(progress, progress[1:]))
+
+        shooter = [p for p in projects if p['name'] == "ShooterGame"][0]
+        assert shooter['dir'] == os.path.join(drives[0], "Work", "ShooterGame")
+        assert shooter['size'] == 2
+        print("✅ 多磁盘并行扫描测试通过")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def test_scan_depth_and_duplicates():
+    """测试深度限制和嵌套挂载点去重"""
+    print("=== 测试深度限制和去重 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="scanner_test_")
+    try:
+        drive_a, drive_b = _make_drives(test_dir)
+        scanner = ProjectScanner(exclude_paths=[], max_depth=1)
+        # DriveB中的RPG位于第5层，超出深度限制
+        projects = scanner.scan([drive_b])
+        assert [p['name'] for p in projects] == ["Cached"]
+
+        # 结尾带分隔符的根目录（如 C:\\）与不带的深度相同，根目录的直接子目录深度为0：
+        # RPG目录（Projects/Deep/A/B/RPG）在深度3的目录B中，与原来从磁盘根目录扫描时的最大深度一致
+        for root in (drive_b, drive_b + os.sep):
+            scanner = ProjectScanner(exclude_paths=[], max_depth=3)
+            assert sorted(p['name'] for p in scanner.scan([root])) == ["Cached", "RPG"], root
+            scanner = ProjectScanner(exclude_paths=[], max_depth=2)
+            assert [p['name'] for p in scanner.scan([root])] == ["Cached"], root
+
+        # 同一磁盘重复出现时结果不应重复
+        scanner = ProjectScanner(exclude_paths=[])
+        projects = scanner.scan([drive_a, drive_a])
+        paths = [p['path'] for p in projects]
+        assert len(paths) == len(set(paths)) == 3
+        print("✅ 深度限制和去重测试通过")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def test_streaming_callback():
+    """测试找到工程时立即回调，且每个工程只回调一次"""
+    print("=== 测试工程结果流式回调 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="scanner_test_")
+    try:
+        drive_a, drive_b = _make_drives(test_dir)
+        streamed = []
+        scanner = ProjectScanner(exclude_paths=['node_modules'])
+        projects = scanner.scan([drive_a, drive_b, drive_a], project_callback=streamed.append)
+
+        assert sorted(p['path'] for p in streamed) == sorted(p['path'] for p in projects)
+        assert len(streamed) == 4
+        print("✅ 工程结果流式回调测试通过")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def test_incremental_index():
+    """测试增量索引：未修改的目录不重新读取"""
+    print("=== 测试增量索引 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="scanner_test_")
+    original_scandir = os.scandir
+    listed = []
+
+    def counting_scandir(path):
+        listed.append(path)
+        return original_scandir(path)
+
+    try:
+        drive_a, drive_b = _make_drives(test_dir)
+        index_file = os.path.join(test_dir, "index.json")
+
+        # 冷启动：完整扫描并保存索引
+        index = ProjectIndex(index_file)
+        assert not index.load()
+        projects = ProjectScanner(exclude_paths=['node_modules'], index=index).scan([drive_a])
+        assert len(projects) == 2
+        assert index.save([drive_a])
+
+        # 热刷新：所有目录都命中索引，不再读取目录内容
+        index = ProjectIndex(index_file)
+        assert index.load()
+        os.scandir = counting_scandir
+        try:
+            projects = ProjectScanner(exclude_paths=['node_modules'], index=index).scan([drive_a])
+        finally:
+            os.scandir = original_scandir
+        assert len(projects) == 2
+        assert listed == []
+
+        # 新增工程后只重新读取发生变化的目录
+        _touch(os.path.join(drive_a, "Work", "NewGame.uproject"))
+        os.scandir = counting_scandir
+        try:
+            projects = ProjectScanner(exclude_paths=['node_modules'], index=index).scan([drive_a])
+        finally:
+            os.scandir = original_scandir
+        assert sorted(p['name'] for p in projects) == ["NewGame", "RootGame", "ShooterGame"]
+        assert listed == [os.path.join(drive_a, "Work")]
+        index.save([drive_a])
+
+        # 索引损坏时回退到完整扫描
+        with open(index_file, 'w', encoding='utf-8') as f:
+            f.write("{broken")
+        index = ProjectIndex(index_file)
+        assert not index.load()
+        projects = ProjectScanner(exclude_paths=['node_modules'], index=index).scan([drive_a])
+        assert len(projects) == 3
+        print("✅ 增量索引测试通过")
+    finally:
+        os.scandir = original_scandir
+        shutil.rmtree(test_dir)
+
+
+def test_index_save_is_atomic():
+    """测试保存索引中途出错时保留原来的索引文件"""
+    print("=== 测试索引原子保存 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="scanner_test_")
+    original_dump = project_index.json.dump
+
+    def failing_dump(obj, f, **kwargs):
+        f.write('{"version": 2, "dirs": {')
+        raise IOError("磁盘已满")
+
+    try:
+        drive_a, drive_b = _make_drives(test_dir)
+        index_file = os.path.join(test_dir, "index.json")
+        index = ProjectIndex(index_file)
+        ProjectScanner(exclude_paths=['node_modules'], index=index).scan([drive_a])
+        assert index.save([drive_a])
+
+        index = ProjectIndex(index_file)
+        assert index.load()
+        saved = dict(index.dirs)
+        ProjectScanner(exclude_paths=['node_modules'], index=index).scan([drive_b])
+        project_index.json.dump = failing_dump
+        try:
+            assert not index.save([drive_b])
+        finally:
+            project_index.json.dump = original_dump
+        assert not os.path.exists(index_file + project_index.TEMP_SUFFIX)
+
+        index = ProjectIndex(index_file)
+        assert index.load() and index.dirs == saved
+        print("✅ 索引原子保存测试通过")
+    finally:
+        project_index.json.dump = original_dump
+        shutil.rmtree(test_dir)
+
+
+def test_cancel_scan():
+    """测试取消扫描：已取消的任务立即返回，找到工程后取消只返回部分结果"""
+    print("=== 测试取消扫描 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="scanner_test_")
+    try:
+        drive_a, drive_b = _make_drives(test_dir)
+
+        job = ScanJob()
+        job.cancel()
+        assert ProjectScanner(exclude_paths=[]).scan([drive_a, drive_b], job=job) == []
+
+        # 找到第一个工程后取消，单线程扫描不会再进入新的目录
+        job = ScanJob()
+        projects = ProjectScanner(exclude_paths=[], max_workers=1).scan(
+            [drive_a, drive_b], project_callback=lambda project: job.cancel(), job=job)
+        assert [p['name'] for p in projects] == ["RootGame"]
+        print("✅ 取消扫描测试通过")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def test_pause_and_resume_scan():
+    """测试暂停扫描后继续，结果与完整扫描一致"""
+    print("=== 测试暂停和继续扫描 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="scanner_test_")
+    try:
+        drive_a, drive_b = _make_drives(test_dir)
+        job = ScanJob()
+        job.pause()
+        assert job.paused
+
+        result = []
+        thread = threading.Thread(
+            target=lambda: result.extend(ProjectScanner(exclude_paths=[]).scan([drive_a, drive_b], job=job)))
+        thread.start()
+        thread.join(0.2)
+        # 暂停期间扫描线程停在检查点
+        assert thread.is_alive() and result == []
+
+        job.resume()
+        thread.join(5)
+        assert not thread.is_alive()
+        assert len(result) == 5
+
+        # 暂停中的扫描被取消时也应立即退出
+        job = ScanJob()
+        job.pause()
+        thread = threading.Thread(target=lambda: ProjectScanner(exclude_paths=[]).scan([drive_a], job=job))
+        thread.start()
+        job.cancel()
+        thread.join(5)
+        assert not thread.is_alive() and not job.paused
+        print("✅ 暂停和继续扫描测试通过")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def test_resolve_scan_roots():
+    """测试定向扫描根目录：配置路径、最近工程目录、不存在的目录和嵌套目录合并"""
+    print("=== 测试定向扫描根目录 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="scanner_test_")
+    try:
+        drive_a, drive_b = _make_drives(test_dir)
+        recent = [{'path': os.path.join(drive_a, "Work", "ShooterGame", "ShooterGame.uproject"),
+                   'dir': os.path.join(drive_a, "Work", "ShooterGame")}]
+        roots = resolve_scan_roots(
+            [drive_b, {"path": os.path.join(drive_b, "Projects"), "max_depth": 3},
+             os.path.join(test_dir, "Missing")],
+            recent, default_depth=6)
+
+        # Projects位于DriveB下一级，1 + 3 <= 6，已被DriveB覆盖
+        assert sorted(roots) == sorted([(drive_b, 6), (os.path.join(drive_a, "Work"), 2)]), roots
+
+        # 嵌套目录需要的深度超出上级目录时保留
+        roots = resolve_scan_roots([{"path": drive_b, "max_depth": 1},
+                                    {"path": os.path.join(drive_b, "Projects"), "max_depth": 4}])
+        assert len(roots) == 2
+        print("✅ 定向扫描根目录测试通过")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def test_targeted_scan_and_budget():
+    """测试按根目录深度扫描，以及目录数量预算用尽时提前结束"""
+    print("=== 测试定向扫描和扫描预算 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="scanner_test_")
+    try:
+        drive_a, drive_b = _make_drives(test_dir)
+        scanner = ProjectScanner(exclude_paths=['ignoreme'])
+        projects = scanner.scan([(os.path.join(drive_a, "Work"), 0),
+                                 (os.path.join(drive_b, "Projects"), 1)])
+        # 根目录的直接子目录深度为0：Work下深度1的node_modules/Hidden仍会读取；
+        # RPG所在目录位于Projects下深度3，超出该根目录的深度限制
+        assert sorted(p['name'] for p in projects) == ["Hidden", "ShooterGame"]
+        assert not scanner.budget_exhausted
+
+        scanner = ProjectScanner(exclude_paths=[], max_workers=1, entry_budget=2)
+        projects = scanner.scan([drive_b])
+        assert scanner.budget_exhausted
+        assert projects == []
+        print("✅ 定向扫描和扫描预算测试通过")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def test_prune_project_dirs():
+    """测试跳过工程根目录下的大型目录和插件目录"""
+    print("=== 测试工程目录剪枝 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="scanner_test_")
+    original_scandir = os.scandir
+    listed = []
+
+    def counting_scandir(path):
+        listed.append(os.path.relpath(path, test_dir))
+        return original_scandir(path)
+
+    try:
+        game = os.path.join(test_dir, "Work", "Game")
+        _touch(os.path.join(game, "Game.uproject"))
+        _touch(os.path.join(game, "Content", "Maps", "Sample", "Sample.uproject"))
+        _touch(os.path.join(game, "Saved", "Autosaves", "Old.uproject"))
+        _touch(os.path.join(game, "Source", "Tools", "Tool.uproject"))
+        _touch(os.path.join(game, "Plugins", "MyPlugin", "MyPlugin.uplugin"))
+        _touch(os.path.join(game, "Plugins", "MyPlugin", "Demo", "Demo.uproject"))
+
+        os.scandir = counting_scandir
+        try:
+            projects = ProjectScanner(exclude_paths=[]).scan([test_dir])
+        finally:
+            os.scandir = original_scandir
+        assert sorted(p['name'] for p in projects) == ["Game", "Tool"]
+        assert not any(path.startswith(os.path.join("Work", "Game", "Content")) for path in listed), listed
+        assert os.path.join("Work", "Game", "Plugins", "MyPlugin", "Demo") not in listed
+
+        # 关闭剪枝时找到所有工程
+        projects = ProjectScanner(exclude_paths=[], prune_project_dirs=False).scan([test_dir])
+        assert len(projects) == 5
+        print("✅ 工程目录剪枝测试通过")
+    finally:
+        os.scandir = original_scandir
+        shutil.rmtree(test_dir)
+
+
+if __name__ == "__main__":
+    print("开始测试工程扫描器...")
+
+    test_parallel_scan_merges_all_drives()
+    test_scan_depth_and_duplicates()
+    test_streaming_callback()
+    test_incremental_index()
+    test_index_save_is_atomic()
+    test_cancel_scan()
+    test_pause_and_resume_scan()
+    test_resolve_scan_roots()
+    test_targeted_scan_and_budget()
+    test_prune_project_dirs()
+
+    print("🎉 所有测试通过")
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试工程目录监视器
+"""
+
+import os
+import sys
+import time
+import queue
+import threading
+import tempfile
+import shutil
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.project_watcher import ProjectWatcher, EVENT_HEADER, IN_CLOSE_WRITE
+
+
+def _touch(path, content="{}"):
+    """创建文件（自动创建父目录）"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def _project(path):
+    return {'name': os.path.splitext(os.path.basename(path))[0], 'path': path, 'dir': os.path.dirname(path)}
+
+
+def _bump_mtime(path, seconds):
+    """修改文件的修改时间，避免依赖文件系统的时间精度"""
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + seconds))
+
+
+def test_polling_watcher():
+    """测试轮询模式：只检查已知工程目录"""
+    print("=== 测试轮询模式 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="watcher_test_")
+    events = []
+    watcher = ProjectWatcher(lambda event, project: events.append((event, project['name'])),
+                             poll_interval=3600, use_inotify=False)
+    try:
+        game = os.path.join(test_dir, "Game", "Game.uproject")
+        other = os.path.join(test_dir, "Other", "Other.uproject")
+        _touch(game)
+        _touch(other)
+        watcher.start([_project(game), _project(other)])
+        assert watcher.backend == "poll"
+
+        watcher.poll()
+        assert events == []
+
+        # 工程目录中新增工程文件，目录修改时间随之变化
+        _touch(os.path.join(test_dir, "Game", "GameCopy.uproject"))
+        _bump_mtime(os.path.join(test_dir, "Game"), 10)
+        _bump_mtime(game, 10)
+        watcher.poll()
+        assert sorted(events) == [("added", "GameCopy"), ("modified", "Game")], events
+
+        events.clear()
+        shutil.rmtree(os.path.join(test_dir, "Other"))
+        watcher.poll()
+        assert events == [("removed", "Other")]
+
+        # 修改时间相同的改写通过文件大小发现
+        events.clear()
+        mtime_ns = os.stat(game).st_mtime_ns
+        _touch(game, '{"FileVersion": 3}')
+        os.utime(game, ns=(mtime_ns, mtime_ns))
+        watcher.poll()
+        assert events == [("modified", "Game")], events
+        print("✅ 轮询模式测试通过")
+    finally:
+        watcher.stop()
+        shutil.rmtree(test_dir)
+
+
+def test_inotify_watcher():
+    """测试inotify模式：新建工程目录、删除和修改工程（仅Linux）"""
+    print("=== 测试inotify模式 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="watcher_test_")
+    events = queue.Queue()
+    watcher = ProjectWatcher(lambda event, project: events.put((event, project['name'])))
+    if watcher.backend != "inotify":
+        print("当前系统不支持inotify，跳过")
+        shutil.rmtree(test_dir)
+        return
+
+    def wait_event(timeout=5):
+        return events.get(timeout=timeout)
+
+    try:
+        game = os.path.join(test_dir, "Game", "Game.uproject")
+        _touch(game)
+        watcher.start([_project(game)], [test_dir])
+        assert watcher.backend == "inotify"
+
+        # 在扫描根目录下新建的工程会被发现
+        _touch(os.path.join(test_dir, "NewGame", "NewGame.uproject"))
+        assert wait_event() == ("added", "NewGame")
+
+        # 多层新建目录中的工程也会被发现
+        _touch(os.path.join(test_dir, "Studio", "Team", "Deep", "Deep.uproject"))
+        assert wait_event() == ("added", "Deep")
+
+        # 内容长度变化，不依赖文件系统的时间精度
+        _touch(game, '{"FileVersion": 3}')
+        assert wait_event() == ("modified", "Game")
+
+        shutil.rmtree(os.path.join(test_dir, "NewGame"))
+        assert wait_event() == ("removed", "NewGame")
+
+        os.remove(game)
+        assert wait_event() == ("removed", "Game")
+
+        time.sleep(0.2)
+        assert events.empty()
+        print("✅ inotify模式测试通过")
+    finally:
+        watcher.stop()
+        shutil.rmtree(test_dir)
+
+
+def test_close_write_after_sync():
+    """测试新建目录时读到写了一半的工程文件，随后的写入完成事件不报告为修改"""
+    print("=== 测试新建工程的写入完成事件 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="watcher_test_")
+    events = []
+    watcher = ProjectWatcher(lambda event, project: events.append((event, project['name'])),
+                             use_inotify=False)
+    try:
+        project_dir = os.path.join(test_dir, "NewGame")
+        path = os.path.join(project_dir, "NewGame.uproject")
+        _touch(path, "")
+        watcher._watches = {1: (project_dir, 0)}
+        watcher._sync_dir(project_dir)
+        assert events == [("added", "NewGame")]
+
+        _touch(path, '{"FileVersion": 3}')
+        name = b"NewGame.uproject\0\0\0\0"
+        close_write = EVENT_HEADER.pack(1, IN_CLOSE_WRITE, 0, len(name)) + name
+        watcher._handle_events(close_write)
+        assert events == [("added", "NewGame")], events
+
+        # 之后的修改正常报告
+        _touch(path, '{"FileVersion": 4, "Modules": []}')
+        watcher._handle_events(close_write)
+        assert events == [("added", "NewGame"), ("modified", "NewGame")], events
+        print("✅ 新建工程的写入完成事件测试通过")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def test_existing_subdirs_and_rescan():
+    """测试扫描根目录下已有的子目录中新建的工程会被发现：inotify按扫描深度监视已有目录，轮询模式定期重新扫描"""
+    print("=== 测试已有子目录中的新工程 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="watcher_test_")
+    events = queue.Queue()
+    watcher = ProjectWatcher(lambda event, project: events.put((event, project['name'])))
+    try:
+        game = os.path.join(test_dir, "Game", "Game.uproject")
+        _touch(game)
+        os.makedirs(os.path.join(test_dir, "Work", "UE"))
+        os.makedirs(os.path.join(test_dir, "Work", "UE", "Game2", "Content"))
+        if watcher.backend == "inotify":
+            # 深度1：Work为深度0，UE为深度1，其中新建的目录也会被读取
+            watcher.start([_project(game)], [test_dir], max_depth=1)
+            _touch(os.path.join(test_dir, "Work", "UE", "NewGame", "NewGame.uproject"))
+            assert events.get(timeout=5) == ("added", "NewGame")
+            # 超出扫描深度的目录不监视
+            _touch(os.path.join(test_dir, "Work", "UE", "Game2", "Content", "Deep", "Deep.uproject"))
+            time.sleep(0.3)
+            assert events.empty()
+            watcher.stop()
+        else:
+            print("当前系统不支持inotify，跳过inotify部分")
+
+        # 轮询模式：重新扫描找到的新工程报告为新增，之后按已知工程检查
+        found = [_project(game)]
+        watcher = ProjectWatcher(lambda event, project: events.put((event, project['name'])),
+                                 poll_interval=3600, use_inotify=False, rescan=lambda: list(found))
+        watcher.start([_project(game)], [test_dir])
+        other = os.path.join(test_dir, "Work", "UE", "Other", "Other.uproject")
+        _touch(other)
+        watcher.rescan_roots()
+        assert events.empty()
+        found.append(_project(other))
+        watcher.rescan_roots()
+        assert events.get_nowait() == ("added", "Other")
+        watcher.rescan_roots()
+        assert events.empty()
+        _touch(other, '{"FileVersion": 3}')
+        watcher.poll()
+        assert events.get_nowait() == ("modified", "Other")
+        print("✅ 已有子目录中的新工程测试通过")
+    finally:
+        watcher.stop()
+        shutil.rmtree(test_dir)
+
+
+def _wait_watch_control():
+    """等待后台启动或停止监视器的线程结束"""
+    for thread in threading.enumerate():
+        if thread.name == "ProjectWatcherControl":
+            thread.join(5)
+
+
+def test_manager_watching_in_background():
+    """测试在后台线程中启动和停止监视器时以最后一次调用为准"""
+    print("=== 测试后台启动监视器 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="watcher_test_")
+    old_xdg = os.environ.get('XDG_CONFIG_HOME')
+    old_appdata = os.environ.get('APPDATA')
+    os.environ['XDG_CONFIG_HOME'] = test_dir
+    os.environ['APPDATA'] = test_dir
+    manager = None
+    try:
+        from models.project_manager import ProjectManager
+        manager = ProjectManager()
+        game = os.path.join(test_dir, "Projects", "Game", "Game.uproject")
+        _touch(game)
+        manager.projects = [_project(game)]
+
+        manager.start_watching(wait=False)
+        _wait_watch_control()
+        assert manager.watcher._thread is not None and game in manager.watcher.known
+
+        # 停止在启动之后调用：无论后台线程的执行顺序如何，最后都是停止状态
+        for _ in range(3):
+            manager.start_watching(wait=False)
+            manager.stop_watching(wait=False)
+        _wait_watch_control()
+        assert manager.watcher._thread is None
+
+        manager.stop_watching(wait=False)
+        manager.start_watching(wait=False)
+        _wait_watch_control()
+        assert manager.watcher._thread is not None
+        print("✅ 后台启动监视器测试通过")
+    finally:
+        if manager is not None:
+            manager.stop_watching()
+        for key, value in (('XDG_CONFIG_HOME', old_xdg), ('APPDATA', old_appdata)):
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print("开始测试工程目录监视器...")
+
+    test_polling_watcher()
+    test_inotify_watcher()
+    test_close_write_after_sync()
+    test_existing_subdirs_and_rescan()
+    test_manager_watching_in_background()
+
+    print("🎉 所有测试通过")
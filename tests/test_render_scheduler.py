@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试分帧渲染的时间预算、顺序和取消
+"""
+
+import io
+import os
+import sys
+import contextlib
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.render_scheduler import RenderScheduler
+
+
+class FakeWidget:
+    """模拟Tk的after/after_cancel，由测试手动推进"""
+
+    def __init__(self):
+        self.timers = {}
+        self.next_id = 0
+
+    def after(self, delay_ms, callback):
+        self.next_id += 1
+        self.timers[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, timer_id):
+        self.timers.pop(timer_id, None)
+
+    def fire_timers(self):
+        timers, self.timers = self.timers, {}
+        for callback in timers.values():
+            callback()
+
+
+class FakeClock:
+    """由测试推进的时钟（秒）"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_time_budget():
+    """测试每批不超过时间预算，第一批立即渲染"""
+    print("=== 测试分帧渲染 ===")
+
+    widget = FakeWidget()
+    clock = FakeClock()
+    rendered = []
+
+    def render(item):
+        rendered.append(item)
+        clock.now += 0.005  # 每项5毫秒
+
+    scheduler = RenderScheduler(widget, budget_ms=12, clock=clock)
+    scheduler.start(range(10), render)
+    # 第一批立即渲染：5、10毫秒未超预算，15毫秒后停止
+    assert rendered == [0, 1, 2]
+    assert scheduler.active and len(widget.timers) == 1
+
+    widget.fire_timers()
+    assert rendered == list(range(6))
+    widget.fire_timers()
+    widget.fire_timers()
+    assert rendered == list(range(10))
+    assert not scheduler.active and not widget.timers
+
+    # 单项超过预算时每批仍至少渲染一项
+    rendered.clear()
+    scheduler.start(["big", "bigger"], lambda item: render(item) or render(item) or render(item))
+    assert rendered == ["big"] * 3
+    widget.fire_timers()
+    assert rendered == ["big"] * 3 + ["bigger"] * 3
+    print("✅ 分帧渲染测试通过")
+
+
+def test_cancel_and_supersede():
+    """测试取消和新渲染取代旧渲染，出错的项不影响其余项"""
+    print("=== 测试取消渲染 ===")
+
+    widget = FakeWidget()
+    clock = FakeClock()
+    rendered = []
+
+    def render(item):
+        rendered.append(item)
+        clock.now += 0.005
+
+    scheduler = RenderScheduler(widget, budget_ms=12, clock=clock)
+    scheduler.start(["a1", "a2", "a3", "a4", "a5"], render)
+    # 新的过滤结果取代旧结果，旧的剩余项不再渲染
+    scheduler.start(["b1", "b2", "b3", "b4"], render)
+    assert len(widget.timers) == 1
+    widget.fire_timers()
+    assert rendered == ["a1", "a2", "a3", "b1", "b2", "b3", "b4"]
+
+    rendered.clear()
+    scheduler.start(range(6), render)
+    scheduler.cancel()
+    assert not widget.timers and not scheduler.active
+    assert rendered == [0, 1, 2]
+
+    # 渲染过程中取消（如render触发了界面刷新）
+    rendered.clear()
+
+    def render_and_cancel(item):
+        render(item)
+        if item == 1:
+            scheduler.cancel()
+
+    scheduler.start(range(6), render_and_cancel)
+    assert rendered == [0, 1] and not widget.timers
+
+    # 单项出错时继续渲染其余项
+    rendered.clear()
+
+    def render_or_fail(item):
+        if item == 0:
+            raise ValueError("损坏的缩略图")
+        render(item)
+
+    scheduler.start(range(3), render_or_fail)
+    widget.fire_timers()
+    assert rendered == [1, 2]
+    print("✅ 取消渲染测试通过")
+
+
+def test_failing_item_keeps_batch_going():
+    """测试中间某项出错时输出调用栈，同一批和后续批次的其余项照常渲染"""
+    print("=== 测试渲染出错 ===")
+
+    widget = FakeWidget()
+    clock = FakeClock()
+    rendered = []
+
+    def render(item):
+        clock.now += 0.005
+        if item == 1:
+            raise ValueError("损坏的缩略图")
+        rendered.append(item)
+
+    scheduler = RenderScheduler(widget, budget_ms=12, clock=clock)
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        scheduler.start(range(6), render)
+        # 出错的项同样计入时间预算，第一批在第3项后停止
+        assert rendered == [0, 2]
+        widget.fire_timers()
+    assert rendered == [0, 2, 3, 4, 5]
+    assert not scheduler.active and not widget.timers
+    assert "渲染组件出错: 损坏的缩略图" in stdout.getvalue()
+    assert "Traceback" in stderr.getvalue() and "ValueError: 损坏的缩略图" in stderr.getvalue()
+    print("✅ 渲染出错测试通过")
+
+
+if __name__ == "__main__":
+    print("开始测试分帧渲染...")
+
+    test_time_budget()
+    test_cancel_and_supersede()
+    test_failing_item_keeps_batch_going()
+
+    print("🎉 所有测试通过")
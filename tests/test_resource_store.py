@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试资源存储及其索引
+"""
+
+import os
+import sys
+import json
+import tempfile
+import shutil
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.resource_store import ResourceStore
+
+
+def _resource(name, category="默认", path=None):
+    return {"name": name, "category": category, "path": path or os.path.join(os.sep, "assets", name)}
+
+
+def test_list_interface():
+    """测试与列表兼容的接口"""
+    print("=== 测试列表接口 ===")
+
+    store = ResourceStore([_resource("Rock"), _resource("Tree", "植被")])
+    assert len(store) == 2
+    assert store[0]["name"] == "Rock"
+    assert [r["name"] for r in store] == ["Rock", "Tree"]
+
+    grass = _resource("Grass", "植被")
+    store.append(grass)
+    assert grass in store and grass["id"]
+    assert store[-1] is grass
+
+    # 内容相同但不是同一个资源时不视为存在
+    assert dict(grass, id="other") not in store
+
+    store.remove(grass)
+    assert grass not in store and len(store) == 2
+    try:
+        store.remove(grass)
+        assert False, "重复移除应抛出ValueError"
+    except ValueError:
+        pass
+    print("✅ 列表接口测试通过")
+
+
+def test_indexes_stay_in_sync():
+    """测试增删改后按id、路径、分类、名称的索引保持同步"""
+    print("=== 测试索引同步 ===")
+
+    rock, tree = _resource("Rock"), _resource("Tree", "植被")
+    store = ResourceStore([rock, tree])
+
+    assert store.get(rock["id"]) is rock
+    assert store.get_by_path(rock["path"]) is rock
+    assert store.has_path(rock["path"] + os.sep)
+    assert store.get_by_category("植被") == [tree]
+    assert store.has_name("Tree") and not store.has_name("Bush")
+
+    store.update(tree, name="Bush", category="默认", path=os.path.join(os.sep, "assets", "Bush"))
+    assert not store.has_name("Tree") and store.get_by_name("Bush") == [tree]
+    assert store.count_in_category("植被") == 0
+    assert store.get_by_category("默认") == [rock, tree]
+    assert not store.has_path(os.path.join(os.sep, "assets", "Tree"))
+
+    # 只修改名称时分类中的顺序不变
+    store.update(rock, name="Stone")
+    assert store.get_by_category("默认") == [rock, tree]
+
+    store.remove(rock)
+    assert store.get(rock["id"]) is None
+    assert store.get_by_category("默认") == [tree]
+    print("✅ 索引同步测试通过")
+
+
+def test_stable_ids():
+    """测试已有id保持不变，缺失或重复的id被重新分配"""
+    print("=== 测试稳定id ===")
+
+    saved = ResourceStore([_resource("Rock"), _resource("Tree")])
+    assert saved.assigned_ids
+    data = json.loads(json.dumps(list(saved)))
+
+    loaded = ResourceStore(data)
+    assert not loaded.assigned_ids
+    assert [r["id"] for r in loaded] == [r["id"] for r in saved]
+
+    duplicate = dict(data[0], name="Copy")
+    loaded.append(duplicate)
+    assert duplicate["id"] != data[0]["id"] and loaded.assigned_ids
+    print("✅ 稳定id测试通过")
+
+
+def test_asset_manager_persists_ids():
+    """测试AssetManager为旧数据补充id并保存"""
+    print("=== 测试AssetManager资源id ===")
+
+    test_dir = tempfile.mkdtemp(prefix="resource_store_test_")
+    old_xdg = os.environ.get('XDG_CONFIG_HOME')
+    old_appdata = os.environ.get('APPDATA')
+    os.environ['XDG_CONFIG_HOME'] = test_dir
+    os.environ['APPDATA'] = test_dir
+    manager = None
+    try:
+        from models.asset_manager import AssetManager
+        manager = AssetManager()
+        with open(manager.data_file, 'w', encoding='utf-8') as f:
+            json.dump({"resources": [_resource("Rock")], "categories": ["默认"], "version": "1.0.0"}, f)
+
+        manager.load_data()
+        resource_id = manager.resources[0]["id"]
+        with open(manager.data_file, 'r', encoding='utf-8') as f:
+            assert json.load(f)["resources"][0]["id"] == resource_id
+
+        manager.load_data()
+        assert manager.get_resource(resource_id)["name"] == "Rock"
+        assert manager.remove_resource(manager.get_resource(resource_id))
+        assert len(manager.resources) == 0
+        print("✅ AssetManager资源id测试通过")
+    finally:
+        # 删除测试目录前写入未保存的修改
+        if manager is not None:
+            manager.close()
+        for key, value in (('XDG_CONFIG_HOME', old_xdg), ('APPDATA', old_appdata)):
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(test_dir)
+
+
+if __name__ == "__main__":
+    print("开始测试资源存储...")
+
+    test_list_interface()
+    test_indexes_stay_in_sync()
+    test_stable_ids()
+    test_asset_manager_persists_ids()
+
+    print("🎉 所有测试通过")
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试资源搜索倒排索引
+"""
+
+import os
+import sys
+import tempfile
+import shutil
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import search_index
+from models.resource_store import ResourceStore
+
+
+def _names(resources):
+    return [r["name"] for r in resources]
+
+
+def _make_store(test_dir):
+    """创建带README的测试资源"""
+    doc = os.path.join(test_dir, "README.md")
+    with open(doc, 'w', encoding='utf-8') as f:
+        f.write("# Castle\n\nMedieval fortress with drawbridge")
+    resources = [
+        {"name": "Castle_Kit", "category": "建筑", "path": os.path.join(test_dir, "Env", "Castle"), "doc": doc},
+        {"name": "Oak Tree", "category": "植被", "path": os.path.join(test_dir, "Foliage", "Trees")},
+        {"name": "Rock_Pack", "category": "默认", "path": os.path.join(test_dir, "Env", "Rocks")},
+    ]
+    return ResourceStore(resources)
+
+
+def test_search_fields():
+    """测试名称/分类子串、路径和README单词前缀、多词组合"""
+    print("=== 测试搜索字段 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="search_index_test_")
+    try:
+        store = _make_store(test_dir)
+        store.build_search_index()
+
+        # 名称和分类：任意子串，大小写不敏感
+        assert _names(store.search("stle_k")) == ["Castle_Kit"]
+        assert _names(store.search("TREE")) == ["Oak Tree"]
+        assert _names(store.search("植被")) == ["Oak Tree"]
+        # 短查询词
+        assert _names(store.search("k")) == ["Castle_Kit", "Oak Tree", "Rock_Pack"]
+
+        # 路径单词前缀
+        assert _names(store.search("foli")) == ["Oak Tree"]
+        assert _names(store.search("env")) == ["Castle_Kit", "Rock_Pack"]
+
+        # README单词前缀
+        assert _names(store.search("drawbr")) == ["Castle_Kit"]
+
+        # 多个词需要全部命中
+        assert _names(store.search("env rock")) == ["Rock_Pack"]
+        assert store.search("env tree") == []
+
+        # 分类过滤
+        assert _names(store.search("env", "默认")) == ["Rock_Pack"]
+        assert _names(store.search("", "建筑")) == ["Castle_Kit"]
+        assert len(store.search("")) == 3
+        print("✅ 搜索字段测试通过")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def test_index_updates():
+    """测试资源增删改后索引同步更新"""
+    print("=== 测试索引增量更新 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="search_index_test_")
+    try:
+        store = _make_store(test_dir)
+        store.build_search_index()
+        rock = store.search("rock_pack")[0]
+
+        store.update(rock, name="Boulder", path=os.path.join(test_dir, "Stones"))
+        assert store.search("rock_pack") == []
+        assert store.search("stones") == [rock]
+        assert store.search("bould") == [rock]
+
+        fern = {"name": "Fern", "category": "植被", "path": os.path.join(test_dir, "Foliage", "Fern")}
+        store.append(fern)
+        assert _names(store.search("foliage")) == ["Oak Tree", "Fern"]
+
+        store.remove(fern)
+        assert _names(store.search("fern")) == []
+        assert _names(store.search("foliage")) == ["Oak Tree"]
+        print("✅ 索引增量更新测试通过")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def test_search_before_index_ready():
+    """测试索引建立前逐个比较，建立时跳过已移除的资源"""
+    print("=== 测试索引建立前的搜索 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="search_index_test_")
+    try:
+        store = _make_store(test_dir)
+        assert not store.search_index.ready
+        assert _names(store.search("castle")) == ["Castle_Kit"]
+        assert _names(store.search("env", "默认")) == ["Rock_Pack"]
+
+        rock = store.search("rock")[0]
+        store.remove(rock)
+        store.build_search_index()
+        assert store.search_index.ready
+        assert store.search("rock") == []
+        assert len(store.search_index) == 2
+        print("✅ 索引建立前的搜索测试通过")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def test_short_terms_while_typing():
+    """测试短查询词逐字加长时在上一次的结果中比较，资源变化后重新比较"""
+    print("=== 测试短查询词输入过程 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="search_index_test_")
+    try:
+        store = _make_store(test_dir)
+        store.build_search_index()
+        assert _names(store.search("r")) == ["Oak Tree", "Rock_Pack"]
+        assert _names(store.search("ro")) == ["Rock_Pack"]
+        assert _names(store.search("ro k")) == ["Rock_Pack"]
+        # 删除字符后不在缩小后的结果中查找
+        assert _names(store.search("e")) == ["Castle_Kit", "Oak Tree", "Rock_Pack"]
+        assert _names(store.search("oa")) == ["Oak Tree"]
+
+        fern = {"name": "Oak Fern", "category": "植被", "path": os.path.join(test_dir, "Foliage", "Fern")}
+        store.append(fern)
+        assert _names(store.search("oa")) == ["Oak Tree", "Oak Fern"]
+        store.update(fern, name="Fern")
+        assert _names(store.search("oa")) == ["Oak Tree"]
+        # 命中范围很大时模糊搜索不计算相关度，保持添加顺序
+        old_max = search_index.MAX_RANKED
+        search_index.MAX_RANKED = 3
+        try:
+            assert _names(store.search("e", fuzzy=True)) == ["Castle_Kit", "Oak Tree", "Rock_Pack", "Fern"]
+        finally:
+            search_index.MAX_RANKED = old_max
+        print("✅ 短查询词输入过程测试通过")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+def test_short_terms_match_path_word_prefixes():
+    """测试短查询词与较长的查询词一样只匹配路径单词的前缀，不匹配路径中任意位置的子串"""
+    print("=== 测试短查询词匹配路径单词前缀 ===")
+
+    test_dir = tempfile.mkdtemp(prefix="search_index_test_")
+    try:
+        store = _make_store(test_dir)
+        store.append({"name": "Lamp", "category": "道具", "path": os.path.join(test_dir, "Props", "Lab")})
+        store.build_search_index()
+        # 路径单词的前缀命中
+        assert _names(store.search("fo")) == ["Oak Tree"]
+        assert _names(store.search("la")) == ["Lamp"]
+        assert _names(store.search("en")) == ["Castle_Kit", "Rock_Pack"]
+        # 路径单词中间的子串不命中
+        assert _names(store.search("ab")) == []
+        assert _names(store.search("li")) == []
+        assert _names(store.search("ks")) == []
+        # 名称和分类仍是任意子串
+        assert _names(store.search("mp")) == ["Lamp"]
+        assert _names(store.search("具")) == ["Lamp"]
+        # 与较长的查询词组合
+        assert _names(store.search("en cas")) == ["Castle_Kit"]
+        # 逐字加长时只在前缀相同的上一次结果中比较
+        assert _names(store.search("p")) == ["Rock_Pack", "Lamp"]
+        assert _names(store.search("pr")) == ["Lamp"]
+        print("✅ 短查询词匹配路径单词前缀测试通过")
+    finally:
+        shutil.rmtree(test_dir)
+
+
+if __name__ == "__main__":
+    print("开始测试资源搜索索引...")
+
+    test_search_fields()
+    test_index_updates()
+    test_search_before_index_ready()
+    test_short_terms_while_typing()
+    test_short_terms_match_path_word_prefixes()
+
+    print("🎉 所有测试通过")
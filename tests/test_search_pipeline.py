@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试搜索流水线的防抖、后台执行和过期结果丢弃
+"""
+
+import os
+import sys
+import time
+import threading
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.search_pipeline import SearchPipeline
+
+
+class FakeWidget:
+    """模拟Tk的after/after_cancel，由测试手动推进"""
+
+    def __init__(self):
+        self.timers = {}
+        self.posted = []
+        self.lock = threading.Lock()
+        self.next_id = 0
+
+    def after(self, delay_ms, callback):
+        with self.lock:
+            if delay_ms == 0:
+                # 后台线程投递到Tk线程的回调
+                self.posted.append(callback)
+                return None
+            self.next_id += 1
+            self.timers[self.next_id] = callback
+            return self.next_id
+
+    def after_cancel(self, timer_id):
+        self.timers.pop(timer_id, None)
+
+    def fire_timers(self):
+        timers, self.timers = self.timers, {}
+        for callback in timers.values():
+            callback()
+
+    def run_posted(self, expected, timeout=5.0):
+        """等待后台线程投递expected个回调后在“Tk线程”中执行"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self.lock:
+                if len(self.posted) >= expected:
+                    posted, self.posted = self.posted, []
+                    break
+            time.sleep(0.01)
+        else:
+            raise AssertionError("等待搜索结果超时")
+        for callback in posted:
+            callback()
+
+
+def test_debounce():
+    """测试连续输入只搜索一次，内容相同时不重复搜索"""
+    print("=== 测试输入防抖 ===")
+
+    widget = FakeWidget()
+    searched, results = [], []
+    pipeline = SearchPipeline(widget, lambda q: searched.append(q) or q.upper(),
+                              lambda q, r: results.append(r))
+    try:
+        for i in range(1, 11):
+            pipeline.submit("castle_kit"[:i])
+        assert len(widget.timers) == 1 and not searched
+
+        widget.fire_timers()
+        widget.run_posted(1)
+        assert searched == ["castle_kit"]
+        assert results == ["CASTLE_KIT"]
+
+        # 输入后又改回原内容，界面上的结果仍然有效
+        pipeline.submit("castle_ki")
+        pipeline.submit("castle_kit")
+        assert not widget.timers
+
+        # 立即搜索不等待
+        pipeline.submit("rock", delay_ms=0)
+        widget.run_posted(1)
+        assert results[-1] == "ROCK"
+        print("✅ 输入防抖测试通过")
+    finally:
+        pipeline.stop()
+
+
+def test_stale_results_dropped():
+    """测试执行期间有新查询或被取消时，旧结果不会交给界面"""
+    print("=== 测试丢弃过期结果 ===")
+
+    widget = FakeWidget()
+    started = threading.Event()
+    release = threading.Event()
+    searched, results = [], []
+
+    def search(query):
+        searched.append(query)
+        if query == "slow":
+            started.set()
+            release.wait(5)
+        return query
+
+    pipeline = SearchPipeline(widget, search, lambda q, r: results.append(r))
+    try:
+        pipeline.submit("slow", delay_ms=0)
+        assert started.wait(5)
+        # 慢查询执行期间连续提交，中间的查询不会执行
+        pipeline.submit("a", delay_ms=0)
+        pipeline.submit("ab", delay_ms=0)
+        release.set()
+        widget.run_posted(1)
+        assert results == ["ab"]
+        assert searched == ["slow", "ab"]
+
+        # 结果回到界面前取消
+        pipeline.submit("rock", delay_ms=0)
+        deadline = time.time() + 5
+        while not widget.posted and time.time() < deadline:
+            time.sleep(0.01)
+        pipeline.cancel()
+        widget.run_posted(1)
+        assert results == ["ab"]
+        print("✅ 丢弃过期结果测试通过")
+    finally:
+        pipeline.stop()
+
+
+if __name__ == "__main__":
+    print("开始测试搜索流水线...")
+
+    test_debounce()
+    test_stale_results_dropped()
+
+    print("🎉 所有测试通过")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试虚拟化网格的布局计算
+"""
+
+import os
+import sys
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from widgets.virtual_grid import GridLayout, keyed_diff
+
+
+def test_positions():
+    """测试列数、格子位置和总高度"""
+    print("=== 测试网格位置 ===")
+
+    layout = GridLayout(180, 220, gap_x=15, gap_y=26, padding=17)
+    # 自动列数：2*17 + 4*180 + 3*15 = 799
+    assert layout.column_count(799) == 4
+    assert layout.column_count(798) == 3
+    assert layout.column_count(50) == 1
+    assert GridLayout(180, 220, columns=4).column_count(100) == 4
+
+    assert layout.position(0, 4) == (17, 17)
+    assert layout.position(5, 4) == (17 + 195, 17 + 246)
+    assert layout.content_height(0, 4) == 34
+    assert layout.content_height(8, 4) == 34 + 2 * 246 - 26
+    assert layout.content_height(9, 4) == 34 + 3 * 246 - 26
+    print("✅ 网格位置测试通过")
+
+
+def test_visible_range():
+    """测试可见范围只与视口大小有关"""
+    print("=== 测试可见范围 ===")
+
+    layout = GridLayout(180, 220, gap_x=15, gap_y=26, padding=17)
+    count = 100000
+
+    # 顶部：第0-2行可见，再加1行缓冲
+    assert layout.visible_range(0, 600, count, 4, overscan_rows=1) == (0, 16)
+    # 滚动到中间，范围大小不变
+    top = 17 + 5000 * 246
+    start, end = layout.visible_range(top, 600, count, 4, overscan_rows=1)
+    assert start == (5000 - 1) * 4 and end - start <= 5 * 4
+    # 末尾不超过数据项数量
+    assert layout.visible_range(10 ** 9, 600, 10, 4) == (10, 10)
+    assert layout.visible_range(0, 600, 6, 4) == (0, 6)
+    # 没有数据或视口不可见
+    assert layout.visible_range(0, 600, 0, 4) == (0, 0)
+    assert layout.visible_range(0, 0, count, 4) == (0, 0)
+    print("✅ 可见范围测试通过")
+
+
+def test_keyed_diff():
+    """测试按键比较新旧格子"""
+    print("=== 测试按键比较 ===")
+
+    old = {"rock": 0, "tree": 1, "bush": 2}
+    # 插入一个资源：后面的格子移动，其余保留
+    kept, inserted, removed = keyed_diff(old, [(0, "rock"), (1, "fern"), (2, "tree"), (3, "bush")])
+    assert kept == [("rock", 0, 0), ("tree", 1, 2), ("bush", 2, 3)]
+    assert inserted == [(1, "fern")] and removed == []
+
+    # 搜索词多一个字符：只移除不再匹配的
+    kept, inserted, removed = keyed_diff(old, [(0, "rock"), (1, "bush")])
+    assert kept == [("rock", 0, 0), ("bush", 2, 1)]
+    assert inserted == [] and removed == ["tree"]
+
+    # 完全不同
+    kept, inserted, removed = keyed_diff(old, [(0, "fern")])
+    assert kept == [] and inserted == [(0, "fern")] and sorted(removed) == ["bush", "rock", "tree"]
+    print("✅ 按键比较测试通过")
+
+
+if __name__ == "__main__":
+    print("开始测试虚拟化网格...")
+
+    test_positions()
+    test_visible_range()
+    test_keyed_diff()
+
+    print("🎉 所有测试通过")
@@ -1,5 +1,6 @@
 from .image_utils import ImageUtils
 from .file_utils import FileUtils
 from .config_manager import ConfigManager
+from .path_matcher import PathMatcher
 
-__all__ = ['ImageUtils', 'FileUtils', 'ConfigManager']
\ No newline at end of file
+__all__ = ['ImageUtils', 'FileUtils', 'ConfigManager', 'PathMatcher']
\ No newline at end of file
@@ -0,0 +1,71 @@
+import itertools
+from typing import Any, Callable, Dict, Optional
+
+
+class CardEventDispatcher:
+    """卡片事件分发 - 同一类卡片共用一组类绑定（bindtag），不再为每个子组件单独bind
+
+    - 每种事件只通过bind_class注册一次，所有卡片共用这几个Tcl命令
+    - attach给卡片及其所有子组件加上bindtag，记录卡片路径对应的数据
+    - 事件发生时从事件组件的路径向上查找所属的卡片，调用handler(数据, event)
+    - 卡片销毁时自动移除记录
+
+    handlers为{事件序列: handler}，如{'<Button-1>': lambda card, event: card.on_click(event)}。
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, name: str, handlers: Dict[str, Callable[[Any, Any], Any]]):
+        # 每个分发器使用独立的bindtag，不同界面的分发器互不影响
+        self.tag = f"{name}{next(self._ids)}"
+        self.handlers = handlers
+        # {卡片路径: 数据}
+        self._cards: Dict[str, Any] = {}
+        # 已注册类绑定的Tcl解释器
+        self._interp = None
+
+    def attach(self, card, data, skip: Optional[Callable[[Any], bool]] = None, cursor: Optional[str] = None):
+        """让卡片及其子组件的事件分发到data
+
+        skip(widget)为True的组件本身不处理事件（如卡片上的按钮，其内部的子组件仍会处理）；
+        cursor不为None时同时设置这些组件的鼠标指针。
+        """
+        if self._interp is not card.tk:
+            self._register(card)
+        self._cards[str(card)] = data
+        pending = [card]
+        while pending:
+            widget = pending.pop()
+            pending.extend(widget.winfo_children())
+            if skip is not None and skip(widget):
+                continue
+            tags = widget.bindtags()
+            if self.tag not in tags:
+                # 放在最前面，与直接bind到组件上的处理顺序相同
+                widget.bindtags((self.tag,) + tuple(tags))
+            if cursor is not None:
+                widget.configure(cursor=cursor)
+
+    def resolve(self, widget) -> Any:
+        """事件组件所属卡片的数据，不属于任何卡片时返回None"""
+        path = str(widget)
+        while path:
+            data = self._cards.get(path)
+            if data is not None:
+                return data
+            path = path.rpartition(".")[0]
+        return None
+
+    def _register(self, widget):
+        for sequence, handler in self.handlers.items():
+            widget.bind_class(self.tag, sequence, lambda event, h=handler: self._dispatch(h, event))
+        widget.bind_class(self.tag, "<Destroy>", self._on_destroy, add="+")
+        self._interp = widget.tk
+
+    def _dispatch(self, handler, event):
+        data = self.resolve(event.widget)
+        if data is not None:
+            return handler(data, event)
+
+    def _on_destroy(self, event):
+        self._cards.pop(str(event.widget), None)
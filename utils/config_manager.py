@@ -2,18 +2,51 @@
 # -*- coding: utf-8 -*-
 """
 配置管理模块
-提供JSON配置文件的版本控制和自动迁移功能
+提供JSON配置文件的版本控制和自动迁移功能，以及可选的追加日志模式
 """
 
+import copy
 import json
 import os
-from typing import Dict, Any, Optional
+import shutil
+from typing import Dict, Any, List, Optional, Tuple
+from utils.json_codec import get_codec
 
 
 class ConfigManager:
-    """配置管理器 - 支持版本控制和自动迁移"""
+    """配置管理器 - 支持版本控制和自动迁移
     
-    def __init__(self, config_file: str, current_version: str, default_config: Dict[str, Any]):
+    日志模式（journal=True）下，保存时只把与文件中内容不同的部分作为记录追加到
+    配置文件旁的.journal日志，加载时在快照（配置文件）上重放日志。
+    keyed_lists中的列表按键逐项比较（如资源按id），修改一项只追加一条记录。
+    日志超过快照大小（至少COMPACT_MIN_BYTES）、大部分列表项都变了或列表无法逐项记录时
+    重写快照并清空日志。每次重写快照时代数加一，代数写入快照（GENERATION_KEY）和每条记录，
+    重放时跳过比快照旧的记录（重写快照后、删除日志前中断时留下的旧日志）。
+    无法应用的记录被跳过，日志保留（另存一份.corrupt），不会因此丢失其他记录。
+    
+    配置文件先写入临时文件并fsync，再原子替换，读取方不会看到写了一半的文件。
+    替换前把原文件复制为备份（保留BACKUP_COUNT份，.bak1最新），
+    配置文件损坏时从最新的可用备份恢复。
+    
+    编解码使用已安装的最快的JSON库（见json_codec）。配置文件默认缩进便于阅读，
+    紧凑格式超过COMPACT_FORMAT_BYTES时不再缩进；需要阅读时可用export_config导出缩进格式。
+    """
+    
+    JOURNAL_SUFFIX = ".journal"
+    BACKUP_SUFFIX = ".bak"
+    TEMP_SUFFIX = ".tmp"
+    # 日志模式下快照中记录代数的键，读取时移除
+    GENERATION_KEY = "_journal_generation"
+    # 保留的备份数量
+    BACKUP_COUNT = 3
+    # 日志至少达到这个大小才压缩
+    COMPACT_MIN_BYTES = 64 * 1024
+    # 紧凑格式超过这个大小的配置文件不缩进
+    COMPACT_FORMAT_BYTES = 256 * 1024
+    
+    def __init__(self, config_file: str, current_version: str, default_config: Dict[str, Any],
+                 journal: bool = False, keyed_lists: Optional[Dict[str, str]] = None,
+                 compact: Optional[bool] = None, codec: Optional[str] = None):
         """
         初始化配置管理器
         
@@ -21,6 +54,10 @@ class ConfigManager:
             config_file: 配置文件路径
             current_version: 当前软件版本
             default_config: 默认配置字典
+            journal: 是否使用追加日志模式
+            keyed_lists: 按键逐项记录修改的列表 {配置键: 列表项的键字段}，如 {"resources": "id"}
+            compact: 配置文件是否使用紧凑格式，None表示按大小决定
+            codec: JSON编解码器名称（orjson、ujson、json），None表示自动选择
         """
         self.config_file = config_file
         self.current_version = current_version
@@ -28,6 +65,20 @@ class ConfigManager:
         # 确保默认配置包含版本字段
         self.default_config["version"] = current_version
         
+        self.journal = journal
+        self.journal_file = os.path.splitext(config_file)[0] + self.JOURNAL_SUFFIX
+        self.keyed_lists = keyed_lists or {}
+        self.compact = compact
+        self.codec = get_codec(codec)
+        # 文件中（快照+日志）的内容，用于计算需要追加的记录；None表示下次保存需要重写快照
+        self._persisted: Optional[Dict[str, Any]] = None
+        # keyed_lists中的列表：{配置键: (键的顺序, {键: 列表项})}
+        self._persisted_items: Dict[str, Any] = {}
+        self._snapshot_size = 0
+        self._journal_size = 0
+        # 快照的代数，追加的记录带有相同的代数
+        self._generation = 0
+        
         # 确保配置目录存在
         config_dir = os.path.dirname(config_file)
         if config_dir and not os.path.exists(config_dir):
@@ -46,13 +97,47 @@ class ConfigManager:
             return self.default_config.copy()
         
         # 读取现有配置
+        recovered = False
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"配置文件读取错误: {e}，使用默认配置")
-            self._create_default_config()
-            return self.default_config.copy()
+            config = self._read_config(self.config_file)
+            self._snapshot_size = os.path.getsize(self.config_file)
+        except (ValueError, IOError) as e:
+            print(f"配置文件读取错误: {e}")
+            config = self._recover_from_backup()
+            if config is None:
+                print("没有可用的备份，使用默认配置")
+                self._create_default_config()
+                return self.default_config.copy()
+            recovered = True
+        has_generation = self.GENERATION_KEY in config
+        generation = config.pop(self.GENERATION_KEY, 0)
+        self._generation = generation if isinstance(generation, int) else 0
+        
+        try:
+            replayed, damaged, failed = self._replay_journal(config)
+        except IOError as e:
+            print(f"配置日志读取错误: {e}")
+            replayed, damaged, failed = False, False, False
+        
+        if failed:
+            # 有无法应用的记录时保留日志，不重写快照
+            self._keep_failed_journal()
+            if self.journal:
+                self._remember(config)
+        elif recovered or damaged:
+            # 用恢复的内容重写配置文件（损坏的文件已移走，不会进入备份）；
+            # 日志中有不完整的记录或过期的记录时也重写并清空日志
+            try:
+                self._write_snapshot(config)
+            except IOError as e:
+                print(f"配置文件保存失败: {e}")
+                # 下次保存时重写快照
+                self._persisted = None
+        elif self.journal:
+            self._remember(config)
+        elif replayed or has_generation:
+            # 关闭日志模式后，把日志中的修改合并回配置文件（并移除快照中的代数）
+            self._write_snapshot(config)
         
         # 检查版本并执行迁移
         config_version = config.get("version", "0.0.0")
@@ -76,14 +161,263 @@ class ConfigManager:
             # 确保配置包含版本信息
             if "version" not in config:
                 config["version"] = self.current_version
-                
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
-            return True
+            
+            if self.journal and self._persisted is not None:
+                records = self._diff(config)
+                if records is not None:
+                    return self._append_journal(records, config)
+            return self._write_snapshot(config)
         except IOError as e:
             print(f"配置文件保存失败: {e}")
             return False
     
+    def _read_config(self, path: str) -> Dict[str, Any]:
+        with open(path, 'rb') as f:
+            config = self.codec.loads(f.read())
+        if not isinstance(config, dict):
+            raise json.JSONDecodeError("配置文件内容不是对象", "", 0)
+        return config
+    
+    def _backup_file(self, index: int) -> str:
+        return f"{self.config_file}{self.BACKUP_SUFFIX}{index}"
+    
+    def _recover_from_backup(self) -> Optional[Dict[str, Any]]:
+        """从最新的可用备份恢复，损坏的配置文件改名为.corrupt保留"""
+        for index in range(1, self.BACKUP_COUNT + 1):
+            backup_file = self._backup_file(index)
+            if not os.path.exists(backup_file):
+                continue
+            try:
+                config = self._read_config(backup_file)
+            except (ValueError, IOError) as e:
+                print(f"备份文件读取错误: {backup_file}: {e}")
+                continue
+            try:
+                os.replace(self.config_file, self.config_file + ".corrupt")
+            except OSError as e:
+                print(f"移走损坏的配置文件失败: {e}")
+            print(f"已从备份恢复配置: {backup_file}")
+            return config
+        return None
+    
+    def _rotate_backups(self):
+        """把当前配置文件复制为.bak1，较早的备份依次后移"""
+        if self.BACKUP_COUNT <= 0 or not os.path.exists(self.config_file):
+            return
+        for index in range(self.BACKUP_COUNT - 1, 0, -1):
+            if os.path.exists(self._backup_file(index)):
+                os.replace(self._backup_file(index), self._backup_file(index + 1))
+        # 复制而不是改名，替换前配置文件始终存在
+        shutil.copyfile(self.config_file, self._backup_file(1))
+    
+    def _encode(self, config: Dict[str, Any]) -> bytes:
+        if self.compact is False:
+            return self.codec.dumps(config, indent=True)
+        data = self.codec.dumps(config)
+        if self.compact is None and len(data) < self.COMPACT_FORMAT_BYTES:
+            data = self.codec.dumps(config, indent=True)
+        return data
+    
+    def _write_snapshot(self, config: Dict[str, Any]) -> bool:
+        """重写整个配置文件并清空日志（写入临时文件后原子替换）"""
+        temp_file = self.config_file + self.TEMP_SUFFIX
+        if self.journal:
+            # 新快照的代数更大，删除日志前中断时，旧日志中的记录重放时被跳过
+            generation = self._generation + 1
+            data = self._encode(dict(config, **{self.GENERATION_KEY: generation}))
+        else:
+            generation = 0
+            data = self._encode(config)
+        with open(temp_file, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._rotate_backups()
+        os.replace(temp_file, self.config_file)
+        self._generation = generation
+        self._snapshot_size = os.path.getsize(self.config_file)
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+        self._journal_size = 0
+        if self.journal:
+            self._remember(config)
+        return True
+    
+    def _append_journal(self, records: List[Dict[str, Any]], config: Dict[str, Any]) -> bool:
+        """追加记录，日志过大时改为重写快照（压缩）"""
+        if not records:
+            return True
+        data = b"".join(self.codec.dumps(dict(record, gen=self._generation)) + b"\n" for record in records)
+        if self._journal_size + len(data) > max(self.COMPACT_MIN_BYTES, self._snapshot_size):
+            return self._write_snapshot(config)
+        with open(self.journal_file, 'ab+') as f:
+            # 日志末尾是写入中断的不完整记录时另起一行，之后的记录不会接在后面而丢失
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_size += len(data)
+        self._remember(config)
+        return True
+    
+    def _remember(self, config: Dict[str, Any]):
+        """记录文件中的内容（列表项浅拷贝，资源等记录是扁平的字典）"""
+        self._persisted = {}
+        self._persisted_items = {}
+        for key, value in config.items():
+            field = self.keyed_lists.get(key)
+            if field and isinstance(value, list) and all(isinstance(item, dict) and field in item for item in value):
+                self._persisted_items[key] = ([item[field] for item in value],
+                                              {item[field]: dict(item) for item in value})
+            else:
+                self._persisted[key] = copy.deepcopy(value)
+    
+    def _diff(self, config: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        计算需要追加的记录
+        
+        Returns:
+            记录列表；大部分列表项都变了或需要重写整个列表时返回None，表示直接重写快照
+        """
+        records = []
+        changed_items = total_items = 0
+        for key, value in config.items():
+            if key in self._persisted_items and isinstance(value, list):
+                order, items = self._persisted_items[key]
+                item_records = self._diff_list(key, self.keyed_lists[key], order, items, value)
+                if item_records is not None:
+                    records.extend(item_records)
+                    changed_items += len(item_records)
+                    total_items += max(len(value), len(order))
+                    continue
+            elif key in self._persisted and self._persisted[key] == value:
+                continue
+            if key in self.keyed_lists:
+                # 整个列表重写时记录和快照差不多大
+                return None
+            records.append({"op": "set", "key": key, "value": value})
+        for key in list(self._persisted) + list(self._persisted_items):
+            if key not in config:
+                records.append({"op": "unset", "key": key})
+        
+        if changed_items and changed_items * 2 > total_items:
+            return None
+        return records
+    
+    def _diff_list(self, key: str, field: str, order: List[Any], items: Dict[Any, Dict],
+                   value: List[Any]) -> Optional[List[Dict[str, Any]]]:
+        """按键比较列表，返回put/del记录；无法按键表示（缺少键、重复、顺序变化）时返回None"""
+        ids = []
+        records = []
+        for item in value:
+            if not isinstance(item, dict) or field not in item:
+                return None
+            item_id = item[field]
+            ids.append(item_id)
+            if items.get(item_id) != item:
+                records.append({"op": "put", "key": key, "value": item})
+        new_ids = set(ids)
+        if len(new_ids) != len(ids):
+            return None
+        # 重放时已有的项原地替换，新项追加到末尾，顺序必须一致
+        expected = [item_id for item_id in order if item_id in new_ids]
+        expected.extend(item_id for item_id in ids if item_id not in items)
+        if expected != ids:
+            return None
+        records.extend({"op": "del", "key": key, "id": item_id} for item_id in order if item_id not in new_ids)
+        return records
+    
+    def _replay_journal(self, config: Dict[str, Any]) -> Tuple[bool, bool, bool]:
+        """
+        在快照上重放日志
+        
+        Returns:
+            (是否有日志, 是否有无法解码或过期的记录, 是否有无法应用的记录)
+        """
+        self._journal_size = 0
+        if not os.path.exists(self.journal_file):
+            return False, False, False
+        lists = {}
+        damaged = failed = False
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = self.codec.loads(line)
+                except ValueError:
+                    # 写入中断留下的不完整记录
+                    print(f"跳过损坏的日志记录: {self.journal_file}")
+                    damaged = True
+                    continue
+                if isinstance(record, dict) and record.get("gen", 0) < self._generation:
+                    # 重写快照后、删除日志前中断时留下的记录，内容已在快照中
+                    damaged = True
+                    continue
+                try:
+                    self._apply_record(config, lists, record)
+                except (KeyError, TypeError, AttributeError) as e:
+                    print(f"跳过无法应用的日志记录: {self.journal_file}: {e}")
+                    failed = True
+        for key, items in lists.items():
+            config[key] = list(items.values())
+        self._journal_size = os.path.getsize(self.journal_file)
+        return True, damaged, failed
+    
+    def _keep_failed_journal(self):
+        """有无法应用的记录时保留一份日志副本，之后压缩日志也不会丢失这些记录"""
+        try:
+            shutil.copyfile(self.journal_file, self.journal_file + ".corrupt")
+            print(f"日志中有无法应用的记录，已保留副本: {self.journal_file}.corrupt")
+        except OSError as e:
+            print(f"保留日志副本失败: {e}")
+    
+    def _apply_record(self, config: Dict[str, Any], lists: Dict[str, Dict], record: Dict[str, Any]):
+        """重放一条记录，keyed_lists中的列表暂存在lists中 {配置键: {键: 列表项}}"""
+        op, key = record["op"], record["key"]
+        if op == "set":
+            config[key] = record["value"]
+            lists.pop(key, None)
+        elif op == "unset":
+            config.pop(key, None)
+            lists.pop(key, None)
+        elif op in ("put", "del"):
+            field = self.keyed_lists.get(key, "id")
+            items = lists.get(key)
+            if items is None:
+                # 没有键字段的列表项原样保留（用各自的占位对象作为键，保持顺序）
+                items = {}
+                for item in config.get(key, []):
+                    item_id = item.get(field) if isinstance(item, dict) else None
+                    items[object() if item_id is None else item_id] = item
+                lists[key] = items
+            if op == "put":
+                items[record["value"][field]] = record["value"]
+            else:
+                items.pop(record["id"], None)
+    
+    def export_config(self, config: Dict[str, Any], export_file: str) -> bool:
+        """
+        把配置导出为缩进格式的JSON文件，便于阅读和比较
+        
+        Args:
+            config: 配置字典
+            export_file: 导出文件路径
+            
+        Returns:
+            是否导出成功
+        """
+        try:
+            with open(export_file, 'wb') as f:
+                f.write(self.codec.dumps(config, indent=True))
+            return True
+        except IOError as e:
+            print(f"配置导出失败: {e}")
+            return False
+    
     def _create_default_config(self):
         """创建默认配置文件"""
         try:
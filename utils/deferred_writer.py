@@ -0,0 +1,121 @@
+import atexit
+import threading
+import time
+import weakref
+from typing import Callable, Optional
+
+# 尚未关闭的写入器，程序退出时统一写入未保存的修改
+_open_writers = weakref.WeakSet()
+
+
+@atexit.register
+def _close_all():
+    for writer in list(_open_writers):
+        writer.close()
+
+
+class DeferredWriter:
+    """延迟写入 - 数据修改后只标记为脏，由后台线程在一段安静期后合并写入
+
+    - mark_dirty：标记有未保存的修改，delay秒内没有新的修改才写入，连续修改只写一次
+    - 一直有修改时，距第一次未保存的修改超过max_delay秒也会写入，避免长时间不保存
+    - flush：立即在当前线程写入未保存的修改（退出程序、重新加载前和测试中使用）
+    - 同一时间只有一个写入，flush返回时之前的修改都已写入
+    - 后台线程在没有修改时退出；程序退出时未关闭的写入器会自动close
+    - failed：最近一次写入是否失败（失败的修改保留，之后重试）
+
+    write_func()在后台线程或调用flush的线程中调用，返回是否写入成功。
+    """
+
+    QUIET_DELAY = 0.5
+    MAX_DELAY = 5.0
+
+    def __init__(self, write_func: Callable[[], bool], delay: Optional[float] = None,
+                 max_delay: Optional[float] = None):
+        self.write_func = write_func
+        self.delay = self.QUIET_DELAY if delay is None else delay
+        self.max_delay = self.MAX_DELAY if max_delay is None else max_delay
+        self.write_count = 0
+        self._dirty = False
+        self._first_change = 0.0
+        self._last_change = 0.0
+        self._condition = threading.Condition()
+        # 保证写入不会同时进行，flush能等到后台线程正在进行的写入完成
+        self._write_lock = threading.Lock()
+        self._worker = None
+        self._stopped = False
+        self._failed = False
+        _open_writers.add(self)
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    @property
+    def failed(self) -> bool:
+        return self._failed
+
+    def mark_dirty(self):
+        """标记有未保存的修改"""
+        with self._condition:
+            now = time.monotonic()
+            if not self._dirty:
+                self._dirty = True
+                self._first_change = now
+            self._last_change = now
+            if self._stopped:
+                return
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._work, daemon=True)
+                self._worker.start()
+            self._condition.notify()
+
+    def flush(self) -> bool:
+        """立即写入未保存的修改，没有修改时直接返回True"""
+        with self._write_lock:
+            with self._condition:
+                if not self._dirty:
+                    return True
+                self._dirty = False
+            return self._write()
+
+    def close(self) -> bool:
+        """停止后台线程并写入未保存的修改"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        _open_writers.discard(self)
+        return self.flush()
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while True:
+                    if self._stopped or not self._dirty:
+                        # 没有修改时退出，下次mark_dirty时重新启动
+                        self._worker = None
+                        return
+                    due = min(self._last_change + self.delay, self._first_change + self.max_delay)
+                    remaining = due - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+            self.flush()
+
+    def _write(self) -> bool:
+        self.write_count += 1
+        try:
+            if self.write_func():
+                self._failed = False
+                return True
+        except Exception as e:
+            print(f"写入数据失败: {e}")
+        self._failed = True
+        # 写入失败时保留脏标记，max_delay秒后（或flush时）重试
+        with self._condition:
+            if not self._dirty:
+                now = time.monotonic()
+                self._dirty = True
+                self._first_change = now
+                self._last_change = now + self.max_delay
+        return False
@@ -0,0 +1,139 @@
+from typing import Any, Dict, Optional, Tuple
+
+
+class HoverAnimator:
+    """卡片悬停动画 - 只跟踪一张悬停中的卡片，所有颜色过渡由一个共用的定时器推进
+
+    - enter/leave由卡片及其子组件的Enter/Leave事件调用
+    - 在同一张卡片的子组件之间移动时，Leave后紧跟同一张卡片的Enter，离开被抵消，不会重绘
+    - 离开在下一帧才生效，快速划过的卡片在下一帧前已经离开时不做任何配置
+    - 每帧每张正在过渡的卡片只调用一次configure，过渡完成后定时器停止
+
+    normal和hover为样式字典，如{'fg_color': ('gray90', 'gray25'), 'border_width': 1}，
+    颜色（字符串或(浅色, 深色)）按RGB插值，数字按比例取整。
+    """
+
+    FRAME_MS = 16
+    STEPS = 4
+
+    def __init__(self, normal: Dict[str, Any], hover: Dict[str, Any],
+                 steps: Optional[int] = None, interval_ms: Optional[int] = None):
+        self.normal = normal
+        self.hover = hover
+        self.steps = steps or self.STEPS
+        self.interval_ms = self.FRAME_MS if interval_ms is None else interval_ms
+        self.hovered = None
+        # 等待下一帧生效的离开
+        self._leaving = None
+        # {卡片: 当前帧}，0为默认样式（不记录），steps为悬停样式
+        self._progress: Dict[Any, int] = {}
+        # 正在过渡的卡片
+        self._animating = set()
+        self._timer = None
+        self._timer_owner = None
+        self._rgb_cache: Dict[str, Tuple[int, int, int]] = {}
+
+    def enter(self, card):
+        """鼠标进入卡片（或其子组件）"""
+        if self._leaving is card:
+            # 在同一张卡片的子组件之间移动
+            self._leaving = None
+        if card is self.hovered:
+            return
+        if self.hovered is not None:
+            self._animating.add(self.hovered)
+        self._leaving = None
+        self.hovered = card
+        self._animating.add(card)
+        self._schedule(card)
+
+    def leave(self, card):
+        """鼠标离开卡片（或其子组件），下一帧仍未进入同一张卡片时才算离开"""
+        if card is self.hovered:
+            self._leaving = card
+            self._schedule(card)
+
+    def cancel(self):
+        """停止定时器（如界面销毁时）"""
+        if self._timer is not None:
+            try:
+                self._timer_owner.after_cancel(self._timer)
+            except Exception:
+                pass
+            self._timer = None
+
+    def _schedule(self, card):
+        if self._timer is None:
+            # 定时器挂在顶层窗口上，不受单张卡片销毁的影响
+            self._timer_owner = card.winfo_toplevel()
+            self._timer = self._timer_owner.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        self._timer = None
+        if self._leaving is not None:
+            if self._leaving is self.hovered:
+                self.hovered = None
+            self._animating.add(self._leaving)
+            self._leaving = None
+
+        for card in list(self._animating):
+            target = self.steps if card is self.hovered else 0
+            current = self._progress.get(card, 0)
+            frame = min(target, current + 1) if current < target else max(target, current - 1)
+            if frame == target:
+                self._animating.discard(card)
+            if frame:
+                self._progress[card] = frame
+            else:
+                self._progress.pop(card, None)
+            if frame != current:
+                self._apply(card, frame / self.steps)
+
+        if self._animating:
+            self._timer = self._timer_owner.after(self.interval_ms, self._tick)
+
+    def _apply(self, card, progress):
+        try:
+            if not card.winfo_exists():
+                self._forget(card)
+                return
+            card.configure(**self.style_at(card, progress))
+        except Exception as e:
+            print(f"悬停动画出错: {e}")
+            self._forget(card)
+
+    def _forget(self, card):
+        self._animating.discard(card)
+        self._progress.pop(card, None)
+        if card is self.hovered:
+            self.hovered = None
+
+    def style_at(self, widget, progress: float) -> Dict[str, Any]:
+        """进度progress处的样式，两端直接使用原样式"""
+        if progress <= 0.0:
+            return self.normal
+        if progress >= 1.0:
+            return self.hover
+        style = {}
+        for name, start in self.normal.items():
+            end = self.hover.get(name, start)
+            if isinstance(start, (int, float)):
+                style[name] = round(start + (end - start) * progress)
+            elif isinstance(start, (tuple, list)):
+                style[name] = tuple(self._blend(widget, a, b, progress) for a, b in zip(start, end))
+            else:
+                style[name] = self._blend(widget, start, end, progress)
+        return style
+
+    def _blend(self, widget, start: str, end: str, progress: float) -> str:
+        a = self._rgb(widget, start)
+        b = self._rgb(widget, end)
+        return "#%02x%02x%02x" % tuple(round(x + (y - x) * progress) for x, y in zip(a, b))
+
+    def _rgb(self, widget, color: str) -> Tuple[int, int, int]:
+        rgb = self._rgb_cache.get(color)
+        if rgb is None:
+            # winfo_rgb返回16位分量，支持颜色名和#rrggbb
+            rgb = tuple(value >> 8 for value in widget.winfo_rgb(color))
+            self._rgb_cache[color] = rgb
+        return rgb
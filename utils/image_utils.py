@@ -28,9 +28,12 @@ class ImageUtils:
                 import logging
                 logging.error(f"加载缩略图错误: {e}")
         
-        # 返回默认图片
-        default_img = self.create_default_thumbnail(size)
-        return ctk.CTkImage(light_image=default_img, dark_image=default_img, size=size)
+        # 返回默认图片（同一尺寸共用一张，避免每张卡片重新绘制）
+        cache_key = f"<default>_{size[0]}_{size[1]}"
+        if cache_key not in self.thumbnail_cache:
+            default_img = self.create_default_thumbnail(size)
+            self.thumbnail_cache[cache_key] = ctk.CTkImage(light_image=default_img, dark_image=default_img, size=size)
+        return self.thumbnail_cache[cache_key]
 
     def create_rounded_thumbnail(self, img, size):
         """创建圆角矩形缩略图"""
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON编解码模块
+优先使用已安装的orjson或ujson，没有时使用标准库json，编码结果均为UTF-8字节
+"""
+
+import json
+from typing import Any, Dict, Optional, Union
+
+# 按优先顺序尝试的编解码器
+CODEC_PREFERENCE = ("orjson", "ujson", "json")
+
+
+class JsonCodec:
+    """标准库json编解码器，也是其他编解码器的兼容后备
+
+    - dumps(obj, indent=False)：编码为UTF-8字节，非ASCII字符不转义；
+      indent为False时输出紧凑格式，为True时缩进2格
+    - loads(data)：解码字节或字符串，格式错误时抛出json.JSONDecodeError
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any, indent: bool = False) -> bytes:
+        if indent:
+            text = json.dumps(obj, ensure_ascii=False, indent=2)
+        else:
+            text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+        return text.encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson编解码器，orjson不支持的内容（非字符串键、超过64位的整数）退回标准库"""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def dumps(self, obj: Any, indent: bool = False) -> bytes:
+        try:
+            return self._orjson.dumps(obj, option=self._orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            return super().dumps(obj, indent)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        # orjson.JSONDecodeError是json.JSONDecodeError的子类
+        return self._orjson.loads(data)
+
+
+class UjsonCodec(JsonCodec):
+    """ujson编解码器"""
+
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def dumps(self, obj: Any, indent: bool = False) -> bytes:
+        try:
+            text = self._ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False,
+                                     indent=2 if indent else 0)
+        except (TypeError, OverflowError):
+            return super().dumps(obj, indent)
+        return text.encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._ujson.loads(data)
+        except ValueError as e:
+            # 统一为json.JSONDecodeError，调用方只需捕获一种异常
+            if isinstance(data, bytes):
+                data = data.decode("utf-8", errors="replace")
+            raise json.JSONDecodeError(str(e), data, 0) from e
+
+
+_CODEC_CLASSES = {"orjson": OrjsonCodec, "ujson": UjsonCodec, "json": JsonCodec}
+# {名称: 编解码器}，未安装的为None
+_codecs: Dict[str, Optional[JsonCodec]] = {}
+
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    """
+    获取JSON编解码器
+
+    Args:
+        name: 编解码器名称（orjson、ujson、json），为None时使用已安装的最快的一个
+
+    Returns:
+        编解码器；指定的编解码器未安装时返回标准库json
+    """
+    names = CODEC_PREFERENCE if name is None else (name, "json")
+    for codec_name in names:
+        if codec_name not in _codecs:
+            try:
+                _codecs[codec_name] = _CODEC_CLASSES[codec_name]()
+            except (ImportError, KeyError):
+                _codecs[codec_name] = None
+        if _codecs[codec_name] is not None:
+            return _codecs[codec_name]
+    return JsonCodec()
@@ -0,0 +1,122 @@
+import re
+from typing import Iterable, Optional
+
+
+class PathMatcher:
+    """路径匹配器 - 将屏蔽规则一次性编译，供目录遍历时逐级匹配
+
+    支持三种规则（不区分大小写，/ 和 \\ 等价）：
+    - 绝对路径前缀，如 ``C:\\Windows``、``/proc``：匹配该目录及其下所有内容
+    - 目录名或相对路径片段，如 ``node_modules``、``AppData\\Local``：匹配任意位置的同名目录
+    - 通配符，如 ``*.tmp``、``Saved/Backup*``、``D:\\**\\Cache``：``*`` 不跨越目录，``**`` 可跨越
+    """
+
+    GLOB_CHARS = ('*', '?', '[')
+
+    def __init__(self, patterns: Optional[Iterable[str]] = None):
+        self.patterns = list(patterns or [])
+        # 单个目录名规则：{名称}
+        self.names = set()
+        # 多级相对路径规则：{最后一级名称: ["/前面各级/最后一级"]}
+        self.suffixes = {}
+        # 绝对路径前缀规则：{规范化路径}
+        self.anchored = set()
+        self.glob_regex = None
+
+        globs = []
+        for pattern in self.patterns:
+            norm = self.normalize(pattern)
+            if not norm:
+                continue
+
+            if any(ch in norm for ch in self.GLOB_CHARS):
+                regex = self._translate_glob(norm)
+                globs.append(regex if self._is_absolute(norm) else f"(?:.*/)?{regex}")
+            elif self._is_absolute(norm):
+                self.anchored.add(norm)
+            elif '/' in norm:
+                name = norm.rsplit('/', 1)[1]
+                self.suffixes.setdefault(name, []).append('/' + norm)
+            else:
+                self.names.add(norm)
+
+        if globs:
+            self.glob_regex = re.compile('|'.join(f"(?:{g})" for g in globs))
+
+    @staticmethod
+    def normalize(path: str) -> str:
+        """规范化路径：小写、统一使用 / 分隔、去掉末尾分隔符"""
+        norm = path.replace('\\', '/').lower()
+        if len(norm) > 1:
+            norm = norm.rstrip('/') or '/'
+        return norm
+
+    @staticmethod
+    def _is_absolute(norm: str) -> bool:
+        """是否为绝对路径（/开头或盘符开头）"""
+        return norm.startswith('/') or (len(norm) >= 2 and norm[1] == ':' and norm[0].isalpha())
+
+    @staticmethod
+    def _translate_glob(norm: str) -> str:
+        """将通配符转换为正则表达式"""
+        parts = []
+        i = 0
+        while i < len(norm):
+            ch = norm[i]
+            if ch == '*':
+                if norm.startswith('**', i):
+                    parts.append('.*')
+                    i += 2
+                    continue
+                parts.append('[^/]*')
+            elif ch == '?':
+                parts.append('[^/]')
+            elif ch == '[':
+                end = norm.find(']', i + 1)
+                if end == -1:
+                    parts.append(re.escape(ch))
+                else:
+                    body = norm[i + 1:end]
+                    if body.startswith('!'):
+                        body = '^' + body[1:]
+                    parts.append(f"[{body}]")
+                    i = end + 1
+                    continue
+            else:
+                parts.append(re.escape(ch))
+            i += 1
+        return ''.join(parts)
+
+    def match_entry(self, path: str) -> bool:
+        """检查路径的最后一级是否命中规则
+
+        遍历时父目录已经检查过，因此只需匹配以当前这一级结尾的规则，
+        目录名和相对路径规则是哈希查找，耗时与规则数量无关。
+        """
+        norm = self.normalize(path)
+        name = norm.rsplit('/', 1)[-1]
+
+        if name in self.names:
+            return True
+
+        suffixes = self.suffixes.get(name)
+        if suffixes and any(norm.endswith(suffix) for suffix in suffixes):
+            return True
+
+        if norm in self.anchored:
+            return True
+
+        if self.glob_regex is not None and self.glob_regex.fullmatch(norm):
+            return True
+
+        return False
+
+    def matches(self, path: str) -> bool:
+        """检查完整路径（包括所有上级目录）是否命中规则"""
+        norm = self.normalize(path)
+        index = len(norm)
+        while index > 0:
+            if self.match_entry(norm[:index]):
+                return True
+            index = norm.rfind('/', 0, index)
+        return False
@@ -0,0 +1,74 @@
+import time
+import traceback
+from typing import Any, Callable, Iterable
+
+
+class RenderScheduler:
+    """分帧渲染 - 在Tk事件循环中分批创建组件，每批不超过时间预算，批与批之间让出事件循环
+
+    - start：按给定顺序渲染（调用方把首屏的项排在前面），第一批立即渲染，剩余的通过after分批渲染
+    - 每批至少渲染一项，渲染耗时超过budget_ms后停止，等下一次after再继续
+    - 新的start或cancel会丢弃尚未渲染的项（如新的过滤结果取代了旧结果）
+    - 单项渲染出错时输出错误和调用栈，继续渲染其余项
+
+    widget需要提供Tk的after/after_cancel。
+    """
+
+    # 每批的时间预算（毫秒），留出时间给事件循环处理输入和重绘
+    FRAME_BUDGET_MS = 12
+    # 两批之间的间隔（毫秒）
+    FRAME_INTERVAL_MS = 1
+
+    def __init__(self, widget, budget_ms: float = None, clock: Callable[[], float] = time.perf_counter):
+        self.widget = widget
+        self.budget = (self.FRAME_BUDGET_MS if budget_ms is None else budget_ms) / 1000.0
+        self.clock = clock
+        self._items = []
+        self._position = 0
+        self._render = None
+        self._timer = None
+
+    @property
+    def active(self) -> bool:
+        """是否还有未渲染的项"""
+        return self._position < len(self._items)
+
+    def start(self, items: Iterable[Any], render: Callable[[Any], None]):
+        """取消未完成的渲染，开始分批渲染items，render(item)创建单个组件"""
+        self.cancel()
+        self._items = list(items)
+        self._render = render
+        self._run()
+
+    def cancel(self):
+        """丢弃尚未渲染的项"""
+        if self._timer is not None:
+            self.widget.after_cancel(self._timer)
+            self._timer = None
+        self._items = []
+        self._position = 0
+        self._render = None
+
+    def _run(self):
+        self._timer = None
+        items, render = self._items, self._render
+        deadline = self.clock() + self.budget
+        while self._position < len(items):
+            item = items[self._position]
+            self._position += 1
+            try:
+                render(item)
+            except Exception as e:
+                print(f"渲染组件出错: {e}")
+                traceback.print_exc()
+            # render中可能调用了cancel或start，当前这批已被取代
+            if self._items is not items:
+                return
+            if self.clock() >= deadline:
+                break
+        if self.active:
+            self._timer = self.widget.after(self.FRAME_INTERVAL_MS, self._run)
+        else:
+            self._items = []
+            self._position = 0
+            self._render = None
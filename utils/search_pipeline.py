@@ -0,0 +1,108 @@
+import threading
+from typing import Any, Callable, Optional
+
+
+class SearchPipeline:
+    """搜索流水线 - 输入防抖，在后台线程中执行搜索，只把最新一次查询的结果交给界面
+
+    - submit：输入停止delay_ms毫秒后才开始搜索，连续输入只搜索最后一次
+    - 搜索在单个后台线程中执行，执行期间又有新查询时，中间的查询直接丢弃
+    - 每次查询有递增的编号，结果回到Tk线程时编号已过期（有更新的查询或调用了cancel）则丢弃
+
+    widget需要提供Tk的after/after_cancel；search_func在后台线程中调用，
+    on_result(query, result)通过after(0, ...)在Tk线程中调用。
+    """
+
+    DEBOUNCE_MS = 250
+
+    def __init__(self, widget, search_func: Callable[[Any], Any],
+                 on_result: Callable[[Any, Any], None], delay_ms: Optional[int] = None):
+        self.widget = widget
+        self.search_func = search_func
+        self.on_result = on_result
+        self.delay_ms = self.DEBOUNCE_MS if delay_ms is None else delay_ms
+        self._timer = None
+        self._generation = 0
+        # 等待后台线程执行的查询：(编号, 查询)
+        self._request = None
+        # 最近一次交给界面的查询，相同的查询不重复搜索
+        self._applied = None
+        self._applied_generation = 0
+        self._condition = threading.Condition()
+        self._worker = None
+        self._stopped = False
+
+    def submit(self, query, delay_ms: Optional[int] = None):
+        """提交查询，delay_ms毫秒内没有新的查询才开始搜索（0表示立即开始）"""
+        self._cancel_timer()
+        # 与界面上的结果相同且之后没有其他查询时不需要再搜索
+        if query == self._applied and self._applied_generation == self._generation:
+            return
+        delay_ms = self.delay_ms if delay_ms is None else delay_ms
+        if delay_ms <= 0:
+            self._start(query)
+        else:
+            self._timer = self.widget.after(delay_ms, lambda: self._start(query))
+
+    def cancel(self):
+        """取消等待中和正在执行的查询（如界面已同步刷新），之后的结果都会被丢弃"""
+        self._cancel_timer()
+        with self._condition:
+            self._generation += 1
+            self._request = None
+        self._applied = None
+
+    def stop(self):
+        """停止后台线程"""
+        self.cancel()
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self.widget.after_cancel(self._timer)
+            self._timer = None
+
+    def _start(self, query):
+        self._timer = None
+        with self._condition:
+            if self._stopped:
+                return
+            self._generation += 1
+            self._request = (self._generation, query)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._work, daemon=True)
+                self._worker.start()
+            self._condition.notify()
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while self._request is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                generation, query = self._request
+                self._request = None
+
+            try:
+                result = self.search_func(query)
+            except Exception as e:
+                print(f"搜索出错: {e}")
+                continue
+            if generation != self._generation:
+                continue
+            try:
+                self.widget.after(0, lambda: self._deliver(generation, query, result))
+            except RuntimeError:
+                # 界面已销毁
+                return
+
+    def _deliver(self, generation, query, result):
+        """在Tk线程中交付结果，过期的结果直接丢弃"""
+        if generation != self._generation:
+            return
+        self._applied = query
+        self._applied_generation = generation
+        self.on_result(query, result)
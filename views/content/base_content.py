@@ -185,6 +185,11 @@ class ContentManager(ctk.CTkFrame):
                 old_page = self.pages[self.current_page]
                 # 使用lower而不是grid_remove，保持在grid中但在底层
                 old_page.lower()
+                # 页面保留，只通知其暂停后台工作（如工程扫描）
+                if hasattr(old_page, 'on_page_hidden'):
+                    old_page.on_page_hidden()
+            if hasattr(new_page, 'on_page_shown'):
+                new_page.on_page_shown()
             
             # 更新当前页面记录
             self.current_page = page_name
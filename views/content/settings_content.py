@@ -79,6 +79,24 @@ class SettingsContent(ctk.CTkFrame):
         )
         config_button.pack(pady=20)
         
+        # 资产搜索设置区域
+        search_frame = ctk.CTkFrame(content_frame, corner_radius=10)
+        search_frame.pack(fill="x", pady=(0, 20), ipady=10)
+        
+        search_title = ctk.CTkLabel(search_frame, text="资产搜索",
+                                   font=ctk.CTkFont(size=16, weight="bold"))
+        search_title.pack(anchor="w", padx=20, pady=(15, 10))
+        
+        # 模糊搜索开关
+        self.fuzzy_search_var = ctk.BooleanVar(value=self.controller.asset_manager.is_fuzzy_search_enabled())
+        self.fuzzy_search_switch = ctk.CTkSwitch(
+            search_frame,
+            text="模糊搜索（容许拼写错误，按相关度排序）",
+            variable=self.fuzzy_search_var,
+            command=self.on_fuzzy_search_change
+        )
+        self.fuzzy_search_switch.pack(anchor="w", padx=20, pady=(0, 15))
+        
         # 提示信息
         hint_label = ctk.CTkLabel(
             content_frame,
@@ -93,6 +111,10 @@ class SettingsContent(ctk.CTkFrame):
         self.app_state.set_theme(theme)
         ctk.set_appearance_mode(theme)
         
+    def on_fuzzy_search_change(self):
+        """处理模糊搜索开关变更"""
+        self.controller.asset_manager.set_fuzzy_search(self.fuzzy_search_var.get())
+        
     def _start_close_timer(self, event=None):
         """开始下拉菜单自动关闭计时器"""
         # 取消之前的计时器
@@ -116,6 +138,7 @@ class SettingsContent(ctk.CTkFrame):
         """刷新页面内容"""
         # 更新主题选择器的值以匹配当前状态
         self.theme_var.set(self.app_state.theme)
+        self.fuzzy_search_var.set(self.controller.asset_manager.is_fuzzy_search_enabled())
         
     def show_category_path_config_dialog(self):
         """显示分类路径配置对话框"""
@@ -6,16 +6,29 @@ from tkinter import messagebox
 import webbrowser
 from utils.image_utils import ImageUtils
 from utils.dialog_utils import DialogUtils
+from utils.search_pipeline import SearchPipeline
 from widgets.search_entry import SearchEntry
 from widgets.asset_card import AssetCard
+from widgets.virtual_grid import VirtualGrid
 
 class UEAssetLibraryContent(ctk.CTkFrame):
+    # 卡片参数 - 固定4列布局
+    CARD_WIDTH = 180
+    CARD_HEIGHT = 220
+    CARD_MARGIN = 15
+    CARDS_PER_ROW = 4
+    
     def __init__(self, parent, controller):
         super().__init__(parent, corner_radius=10)
         self.controller = controller
         self.image_utils = ImageUtils()
         self.is_data_loaded = False  # 数据加载状态
         self.last_refresh_time = None  # 上次刷新时间
+        # 网格上方/下方当前显示的提示（内容不变时不重建）
+        self.grid_header_state = None
+        self.grid_footer_state = None
+        # 搜索和分类过滤在后台线程中执行，输入停止后只刷新一次
+        self.search_pipeline = SearchPipeline(self, self._search_assets, self._apply_search_result)
         
         self.create_widgets()
         
@@ -27,7 +40,8 @@ class UEAssetLibraryContent(ctk.CTkFrame):
         def preload_thread():
             try:
                 print(f"🔍 后台加载资源数据...")
-                # 触发资源加载
+                # 触发资源加载（SQLite存储启动时只读取了首屏的资源，这里等待其余资源读取完成）
+                partial = not self.controller.asset_manager.is_loaded()
                 resources = self.controller.asset_manager.get_resources()
                 print(f"✅ 后台资源加载完成，找到 {len(resources)} 个资源")
                 
@@ -35,6 +49,10 @@ class UEAssetLibraryContent(ctk.CTkFrame):
                 self.is_data_loaded = True
                 self.last_refresh_time = datetime.now()
                 
+                # 之前显示的是部分资源，在主线程中刷新为全部资源
+                if partial:
+                    self.after(0, self._update_display_only)
+                
             except Exception as e:
                 print(f"后台资源加载出错: {e}")
         
@@ -79,7 +97,8 @@ class UEAssetLibraryContent(ctk.CTkFrame):
         self.search_entry = SearchEntry(search_frame, 
                                        placeholder_text="🔍 搜索资产...",
                                        height=40,
-                                       command=self.on_search)
+                                       command=self.on_search,
+                                       submit_command=self.on_search_submit)
         self.search_entry.pack(side="left", fill="x", expand=True)
         
         # 右侧：操作按钮组
@@ -154,23 +173,56 @@ class UEAssetLibraryContent(ctk.CTkFrame):
                                         text_color=("gray50", "gray50"))
         self.status_label.pack(side="left")
         
-        # 创建资产网格容器 - 现代化背景显示
-        self.asset_scrollable = ctk.CTkScrollableFrame(self, 
-                                                      fg_color=("gray90", "gray15"),
-                                                      corner_radius=15,
-                                                      border_width=1,
-                                                      border_color=("gray80", "gray20"))
-        self.asset_scrollable.pack(fill="both", expand=True, padx=20, pady=(0, 20))
+        # 创建资产网格容器 - 现代化背景显示，只为可见行创建卡片
+        self.asset_grid = VirtualGrid(self,
+                                      create_widget=self._create_card_slot,
+                                      bind_widget=self._bind_card_slot,
+                                      cell_width=self.CARD_WIDTH,
+                                      cell_height=self.CARD_HEIGHT,
+                                      gap_x=self.CARD_MARGIN,
+                                      gap_y=self.CARD_MARGIN + 11,
+                                      padding=self.CARD_MARGIN + 2,
+                                      columns=self.CARDS_PER_ROW,
+                                      key=lambda asset: asset['id'],
+                                      fg_color=("gray90", "gray15"),
+                                      corner_radius=15,
+                                      border_width=1,
+                                      border_color=("gray80", "gray20"))
+        self.asset_grid.pack(fill="both", expand=True, padx=20, pady=(0, 20))
 
     def on_search(self, search_term):
-        """处理搜索"""
-        self.controller.set_search_term(search_term)
-        self.refresh_content(force=False)  # 搜索时不强制刷新
+        """处理搜索输入 - 防抖后在后台搜索"""
+        self.controller.app_state.set_search_term(search_term)
+        self.request_search()
+
+    def on_search_submit(self, search_term):
+        """处理回车和搜索按钮 - 立即搜索"""
+        self.controller.app_state.set_search_term(search_term)
+        self.request_search(delay_ms=0)
 
     def on_category_change(self, category):
         """处理分类变更"""
-        self.controller.set_current_category(category)
-        self.refresh_content(force=False)  # 分类变更时不强制刷新
+        self.controller.app_state.set_current_category(category)
+        self.request_search(delay_ms=0)
+
+    def request_search(self, delay_ms=None):
+        """按当前分类和搜索词提交搜索，结果由_apply_search_result显示"""
+        app_state = self.controller.app_state
+        self.search_pipeline.submit((app_state.current_category, app_state.search_term), delay_ms)
+
+    def _search_assets(self, query):
+        """后台线程中执行搜索"""
+        category, search_term = query
+        return self.controller.asset_manager.get_filtered_resources(category, search_term)
+
+    def _apply_search_result(self, query, filtered_assets):
+        """显示最新一次搜索的结果"""
+        self._show_filtered_assets(filtered_assets)
+
+    def destroy(self):
+        """销毁界面时停止搜索线程"""
+        self.search_pipeline.stop()
+        super().destroy()
         
     def _start_close_timer(self, event=None):
         """开始下拉菜单自动关闭计时器"""
@@ -193,6 +245,9 @@ class UEAssetLibraryContent(ctk.CTkFrame):
 
     def refresh_content(self, force=False):
         """刷新内容显示 - 智能刷新机制"""
+        # 同步刷新后，之前提交的后台搜索结果已过期
+        self.search_pipeline.cancel()
+        
         # 智能刷新判断
         if not force and self.is_data_loaded:
             # 数据已加载且非强制刷新，直接显示现有数据
@@ -220,14 +275,14 @@ class UEAssetLibraryContent(ctk.CTkFrame):
         )
         
         # 更新资产总数显示
-        total_count = len(self.controller.asset_manager.resources)
+        total_count = self.controller.asset_manager.resource_count()
         filtered_count = len(filtered_assets)
         if total_count == filtered_count:
                 self.asset_count_label.configure(text=f"总资源数量: {total_count}")
         else:
                 self.asset_count_label.configure(text=f"{filtered_count}/{total_count}")
         
-        self.display_assets(filtered_assets)
+        self.display_assets(filtered_assets, keep_position=True)
         
         # 标记数据已加载
         self.is_data_loaded = True
@@ -247,8 +302,7 @@ class UEAssetLibraryContent(ctk.CTkFrame):
         # 收集所有新文件夹
         new_folders = []
         
-        # 获取现有资源路径集合（用于快速查找）
-        existing_paths = {asset['path'] for asset in self.controller.asset_manager.resources}
+        asset_manager = self.controller.asset_manager
         
         # 扫描每个路径
         for path in paths:
@@ -261,7 +315,7 @@ class UEAssetLibraryContent(ctk.CTkFrame):
                     item_path = os.path.join(path, item)
                     if os.path.isdir(item_path):
                         # 检查是否已存在
-                        if item_path not in existing_paths:
+                        if not asset_manager.has_resource_path(item_path):
                             new_folders.append({
                                 'name': item,
                                 'path': item_path,
@@ -410,8 +464,7 @@ class UEAssetLibraryContent(ctk.CTkFrame):
             resource_name = name_var.get().strip()
             # 只有当名称不为空时才检查
             if resource_name:
-                existing_resources = [r for r in self.controller.asset_manager.resources if r['name'] == resource_name]
-                if existing_resources:
+                if self.controller.asset_manager.has_resource_name(resource_name):
                     # 显示红色错误提示
                     name_error_label.configure(text="资源名称已存在，请使用其他名称")
                     # 禁用导入按钮
@@ -450,8 +503,7 @@ class UEAssetLibraryContent(ctk.CTkFrame):
             
             # 再次检查资源名称是否重复（防止在输入过程中有其他操作）
             resource_name = name_var.get()
-            existing_resources = [r for r in self.controller.asset_manager.resources if r['name'] == resource_name]
-            if existing_resources:
+            if self.controller.asset_manager.has_resource_name(resource_name):
                 # 在对话框中显示红色错误提示
                 name_error_label.configure(text="资源名称已存在，请使用其他名称")
                 # 禁用导入按钮
@@ -502,22 +554,25 @@ class UEAssetLibraryContent(ctk.CTkFrame):
                 self.controller.app_state.current_category, 
                 self.controller.app_state.search_term
             )
-            
-            # 更新资产总数显示
-            total_count = len(self.controller.asset_manager.resources)
-            filtered_count = len(filtered_assets)
-            if total_count == filtered_count:
-                self.asset_count_label.configure(text=f"共 {total_count} 个资源")
-            else:
-                self.asset_count_label.configure(text=f"共 {filtered_count}/{total_count} 个资源")
-            
-            self.display_assets(filtered_assets)
+            # 编辑、导入后的刷新保持滚动位置，只更新变化的卡片
+            self._show_filtered_assets(filtered_assets, keep_position=True)
             
         except Exception as e:
             print(f"更新显示出错: {e}")
             # 出错时回退到完整刷新
             self.refresh_content(force=True)
 
+    def _show_filtered_assets(self, filtered_assets, keep_position=False):
+        """更新资产总数并显示过滤后的资源"""
+        total_count = self.controller.asset_manager.resource_count()
+        filtered_count = len(filtered_assets)
+        if total_count == filtered_count:
+            self.asset_count_label.configure(text=f"共 {total_count} 个资源")
+        else:
+            self.asset_count_label.configure(text=f"共 {filtered_count}/{total_count} 个资源")
+        
+        self.display_assets(filtered_assets, keep_position)
+
     def update_category_combo(self):
         """更新分类下拉框"""
         # 获取当前选中的分类
@@ -550,51 +605,33 @@ class UEAssetLibraryContent(ctk.CTkFrame):
         if status_type == "success":
             self.after(3000, lambda: self.status_label.configure(text=""))
 
-    def display_assets(self, assets):
-        """显示资产列表 - 固定4列布局，优化空状态显示"""
-        # 清空现有显示
-        for widget in self.asset_scrollable.winfo_children():
-            widget.destroy()
-        
+    def display_assets(self, assets, keep_position=False):
+        """显示资产列表 - 固定4列布局，优化空状态显示
+
+        按资产id与当前显示比较，只绑定新出现的卡片；keep_position为True时保持滚动位置。
+        """
         if not assets:
-            # 创建美化的空状态显示
-            empty_container = ctk.CTkFrame(self.asset_scrollable, 
-                                          fg_color="transparent",
-                                          height=400)
-            empty_container.pack(fill="both", expand=True, pady=50)
-            empty_container.pack_propagate(False)
-            
-            # 空状态图标和文本
-            empty_icon = ctk.CTkLabel(empty_container, 
-                                     text="📦",
-                                     font=ctk.CTkFont(size=48))
-            empty_icon.pack(pady=(80, 10))
-            
-            empty_label = ctk.CTkLabel(empty_container, 
-                                      text="暂无匹配的资源",
-                                      font=ctk.CTkFont(size=16, weight="bold"),
-                                      text_color=("gray50", "gray50"))
-            empty_label.pack(pady=(0, 5))
-            
-            # 提示文本
-            tip_label = ctk.CTkLabel(empty_container, 
-                                    text="点击「+ 添加资产」按钮来导入新的资源",
-                                    font=ctk.CTkFont(size=12),
-                                    text_color=("gray40", "gray60"))
-            tip_label.pack(pady=(0, 20))
-            
-            # 添加快捷按钮
-            quick_add_btn = ctk.CTkButton(empty_container,
-                                         text="📎 立即添加资产",
-                                         command=self.import_assets,
-                                         height=40,
-                                         width=150,
-                                         font=ctk.CTkFont(size=13))
-            quick_add_btn.pack(pady=10)
+            self.asset_grid.set_items([])
+            self._set_grid_footer(None)
+            self._set_grid_header("empty", self._create_empty_state, 500)
             return
         
         # 创建固定4列布局
-        self.create_simple_layout(assets)
+        self.create_simple_layout(assets, keep_position)
+
+    def _set_grid_header(self, state, build=None, height=0):
+        """内容变化时才重建网格上方的提示"""
+        if state == self.grid_header_state:
+            return
+        self.grid_header_state = state
+        self.asset_grid.set_header(build() if build else None, height)
+
+    def _set_grid_footer(self, state, build=None, height=0):
+        """内容变化时才重建网格下方的提示"""
+        if state == self.grid_footer_state:
+            return
+        self.grid_footer_state = state
+        self.asset_grid.set_footer(build() if build else None, height)
 
     def show_manage_categories_dialog(self):
         """显示管理分类对话框 - 修改了窗口大小"""
@@ -750,11 +787,10 @@ class UEAssetLibraryContent(ctk.CTkFrame):
             return
             
         # 检查是否有资源使用此分类
-        resources_in_category = [r for r in self.controller.asset_manager.resources 
-                                if r.get('category') == category]
+        resources_in_category = self.controller.asset_manager.count_resources_in_category(category)
         
         if resources_in_category:
-            self.show_status(f"分类 '{category}' 中有 {len(resources_in_category)} 个资源，无法删除", "error")
+            self.show_status(f"分类 '{category}' 中有 {resources_in_category} 个资源，无法删除", "error")
             return
             
         if messagebox.askyesno("确认删除", f"确定要删除分类 '{category}' 吗？"):
@@ -883,8 +919,7 @@ class UEAssetLibraryContent(ctk.CTkFrame):
             """实时检测资源名称是否重复"""
             resource_name = name_var.get().strip()
             if resource_name:  # 只有当名称不为空时才检查
-                existing_resources = [r for r in self.controller.asset_manager.resources if r['name'] == resource_name]
-                if existing_resources:
+                if self.controller.asset_manager.has_resource_name(resource_name):
                     # 显示红色错误提示
                     name_error_label.configure(text="资源名称已存在，请使用其他名称")
                     # 禁用导入按钮
@@ -923,8 +958,7 @@ class UEAssetLibraryContent(ctk.CTkFrame):
             
             # 再次检查资源名称是否重复（防止在输入过程中有其他操作）
             resource_name = name_var.get()
-            existing_resources = [r for r in self.controller.asset_manager.resources if r['name'] == resource_name]
-            if existing_resources:
+            if self.controller.asset_manager.has_resource_name(resource_name):
                 # 在对话框中显示红色错误提示
                 name_error_label.configure(text="资源名称已存在，请使用其他名称")
                 # 禁用导入按钮
@@ -963,74 +997,109 @@ class UEAssetLibraryContent(ctk.CTkFrame):
 
     # browse_file 方法已被 DialogUtils 替代，移除冗余代码
 
-    def create_simple_layout(self, assets):
-        """创建简单的4列布局 - 优化少量资产的显示效果"""
-        # 卡片参数
-        card_width = 180
-        card_height = 220
-        card_margin = 15
-        cards_per_row = 4  # 固定4列
-        
+    def create_simple_layout(self, assets, keep_position=False):
+        """创建简单的4列布局 - 优化少量资产的显示效果，卡片只在滚动到可见区域时创建"""
         # 如果资产数量较少，添加一些视觉引导
         if len(assets) <= 4:
-            # 添加提示信息
-            info_frame = ctk.CTkFrame(self.asset_scrollable, 
-                                     fg_color=("gray90", "gray25"),
-                                     corner_radius=8,
-                                     height=50)
-            info_frame.pack(fill="x", padx=10, pady=(10, 15))
-            info_frame.pack_propagate(False)
-            
-            info_label = ctk.CTkLabel(info_frame, 
-                                     text=f"当前显示 {len(assets)} 个资源",
-                                     font=ctk.CTkFont(size=12),
-                                     text_color=("gray60", "gray70"))
-            info_label.pack(expand=True)
-        
-        # 创建资产卡片
-        current_row = None
-        for i, asset in enumerate(assets):
-            if i % cards_per_row == 0:
-                current_row = ctk.CTkFrame(self.asset_scrollable, fg_color="transparent")
-                current_row.pack(fill="x", padx=10, pady=8)
-            
-            # 创建固定尺寸的卡片容器
-            card_container = ctk.CTkFrame(current_row, 
-                                        fg_color="transparent", 
-                                        width=card_width, 
-                                        height=card_height)
-            card_container.pack(side="left", padx=card_margin//2, pady=5)
-            card_container.pack_propagate(False)  # 防止容器自适应内容大小
-            
-            # 创建卡片
-            card = AssetCard(card_container, asset, self.controller, self.image_utils)
-            card.pack(fill="both", expand=True)
+            self._set_grid_header(len(assets), lambda: self._create_info_header(len(assets)), 75)
+        else:
+            self._set_grid_header(None)
         
         # 如果资产数量较少，在底部添加一些装饰性内容
         if len(assets) <= 8:
-            # 添加底部间距，避免卡片贴边
-            spacer_frame = ctk.CTkFrame(self.asset_scrollable, 
-                                       fg_color="transparent",
-                                       height=100)
-            spacer_frame.pack(fill="x", pady=20)
+            self._set_grid_footer("tips", self._create_tips_footer, 190)
+        else:
+            self._set_grid_footer(None)
+        
+        self.asset_grid.set_items(assets, keep_position)
+
+    def _create_empty_state(self):
+        """没有匹配资源时的空状态显示"""
+        # 创建美化的空状态显示
+        empty_container = ctk.CTkFrame(self.asset_grid.canvas, 
+                                      fg_color="transparent",
+                                      height=400)
+        empty_container.pack_propagate(False)
             
-            # 添加一些友好的提示
-            tips_frame = ctk.CTkFrame(spacer_frame, 
-                                     fg_color=("gray92", "gray20"),
-                                     corner_radius=8)
-            tips_frame.pack(fill="x", padx=50, pady=10)
+        # 空状态图标和文本
+        empty_icon = ctk.CTkLabel(empty_container, 
+                                 text="📦",
+                                 font=ctk.CTkFont(size=48))
+        empty_icon.pack(pady=(80, 10))
             
-            tips_title = ctk.CTkLabel(tips_frame, 
-                                     text="💡 使用提示",
-                                     font=ctk.CTkFont(size=13, weight="bold"),
-                                     text_color=("#2563eb", "#60a5fa"))
-            tips_title.pack(anchor="w", padx=15, pady=(10, 5))
+        empty_label = ctk.CTkLabel(empty_container, 
+                                  text="暂无匹配的资源",
+                                  font=ctk.CTkFont(size=16, weight="bold"),
+                                  text_color=("gray50", "gray50"))
+        empty_label.pack(pady=(0, 5))
             
-            tips_content = ctk.CTkLabel(tips_frame, 
-                                       text="• 点击「添加资产」按钮可导入新资源\n• 使用搜索框快速查找特定资源\n• 可以自定义分类管理资源\n• 点击资源卡片查看详情", 
-                                       font=ctk.CTkFont(size=11),
-                                       text_color=("gray60", "gray70"),
-                                       justify="left")
-            tips_content.pack(anchor="w", padx=15, pady=(0, 10))
+        # 提示文本
+        tip_label = ctk.CTkLabel(empty_container, 
+                                text="点击「+ 添加资产」按钮来导入新的资源",
+                                font=ctk.CTkFont(size=12),
+                                text_color=("gray40", "gray60"))
+        tip_label.pack(pady=(0, 20))
+            
+        # 添加快捷按钮
+        quick_add_btn = ctk.CTkButton(empty_container,
+                                     text="📎 立即添加资产",
+                                     command=self.import_assets,
+                                     height=40,
+                                     width=150,
+                                     font=ctk.CTkFont(size=13))
+        quick_add_btn.pack(pady=10)
+        return empty_container
+
+    def _create_info_header(self, count):
+        """资产数量较少时网格上方的提示信息"""
+        info_container = ctk.CTkFrame(self.asset_grid.canvas, fg_color="transparent")
+        info_frame = ctk.CTkFrame(info_container, 
+                                 fg_color=("gray90", "gray25"),
+                                 corner_radius=8,
+                                 height=50)
+        info_frame.pack(fill="x", padx=10, pady=(10, 15))
+        info_frame.pack_propagate(False)
+        
+        info_label = ctk.CTkLabel(info_frame, 
+                                 text=f"当前显示 {count} 个资源",
+                                 font=ctk.CTkFont(size=12),
+                                 text_color=("gray60", "gray70"))
+        info_label.pack(expand=True)
+        return info_container
+
+    def _create_tips_footer(self):
+        """资产数量较少时网格下方的使用提示"""
+        # 添加底部间距，避免卡片贴边
+        spacer_frame = ctk.CTkFrame(self.asset_grid.canvas, 
+                                   fg_color="transparent",
+                                   height=100)
+        
+        # 添加一些友好的提示
+        tips_frame = ctk.CTkFrame(spacer_frame, 
+                                 fg_color=("gray92", "gray20"),
+                                 corner_radius=8)
+        tips_frame.pack(fill="x", padx=50, pady=30)
+        
+        tips_title = ctk.CTkLabel(tips_frame, 
+                                 text="💡 使用提示",
+                                 font=ctk.CTkFont(size=13, weight="bold"),
+                                 text_color=("#2563eb", "#60a5fa"))
+        tips_title.pack(anchor="w", padx=15, pady=(10, 5))
+        
+        tips_content = ctk.CTkLabel(tips_frame, 
+                                   text="• 点击「添加资产」按钮可导入新资源\n• 使用搜索框快速查找特定资源\n• 可以自定义分类管理资源\n• 点击资源卡片查看详情", 
+                                   font=ctk.CTkFont(size=11),
+                                   text_color=("gray60", "gray70"),
+                                   justify="left")
+        tips_content.pack(anchor="w", padx=15, pady=(0, 10))
+        return spacer_frame
+
+    def _create_card_slot(self, parent):
+        """创建空卡片，尺寸由网格固定；卡片由网格回收复用，过滤和滚动时不再销毁重建"""
+        return AssetCard(parent, None, self.controller, self.image_utils)
+
+    def _bind_card_slot(self, card, asset):
+        """将卡片绑定到资产，只更新变化的文字和图片"""
+        card.set_asset(asset)
 
     # center_window 方法已被 DialogUtils 替代，移除冗余代码
\ No newline at end of file
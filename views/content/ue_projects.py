@@ -1,21 +1,52 @@
 import customtkinter as ctk
 import os
+import queue
 import threading
 from datetime import datetime
 from tkinter import messagebox
 import customtkinter as ctk
 from models.project_manager import ProjectManager
 from utils.dialog_utils import DialogUtils
+from utils.render_scheduler import RenderScheduler
+from utils.card_events import CardEventDispatcher
+from utils.hover_animator import HoverAnimator
 
 class UEProjectsContent(ctk.CTkFrame):
     """虚幻引擎工程内容界面"""
     
+    # 搜索过程中批量插入新工程卡片的间隔（毫秒）
+    STREAM_INTERVAL_MS = 100
+    # 工程目录变化后合并刷新界面的延迟（毫秒）
+    CHANGE_REFRESH_MS = 300
+    
     def __init__(self, parent, controller):
         super().__init__(parent, corner_radius=10)
         self.controller = controller
         self.project_manager = ProjectManager()
         self.is_data_loaded = False  # 数据加载状态
         self.last_refresh_time = None  # 上次刷新时间
+        self.found_queue = queue.Queue()  # 扫描线程找到的工程
+        self.streamed_count = 0  # 本次搜索已显示的工程数量
+        self.stream_job = None  # 批量插入定时器
+        self.changes_pending = False  # 是否有待刷新的工程目录变化
+        self.card_renderer = RenderScheduler(self)  # 分帧创建工程卡片，不阻塞界面
+        # 工程卡片共用的事件绑定，事件数据为(卡片, 工程)
+        self.card_events = CardEventDispatcher("UEProjectCard", {
+            # 双击事件：直接打开项目
+            '<Double-Button-1>': lambda card, e: self.on_project_double_click(card[1]),
+            # 右键事件：显示菜单
+            '<Button-3>': lambda card, e: self.show_project_context_menu(e, card[1]),
+            # 悬停事件：动画效果
+            '<Enter>': lambda card, e: self.on_card_enter(card[0]),
+            '<Leave>': lambda card, e: self.on_card_leave(card[0]),
+        })
+        # 工程卡片悬停动画：默认状态灰色背景、细边框，悬停状态淡蓝色背景、蓝色边框
+        self.card_hover = HoverAnimator(
+            normal={'fg_color': ("gray92", "gray20"), 'border_color': ("gray70", "gray30"), 'border_width': 1},
+            hover={'fg_color': ("#e8f4fd", "#2d3748"), 'border_color': ("#3182ce", "#4299e1"), 'border_width': 2})
+        
+        # 工程目录变化时由监视线程通知，不再需要定期完整扫描
+        self.project_manager.add_change_listener(self._on_project_changed)
         
         self.create_widgets()
         
@@ -23,25 +54,9 @@ class UEProjectsContent(ctk.CTkFrame):
         self.start_initial_search()
     
     def start_initial_search(self):
-        """启动初始搜索 - 后台进行，不阻塞界面"""
-        def initial_search_thread():
-            try:
-                print(f"🔍 后台搜索UE工程...")
-                projects = self.project_manager.refresh_projects()
-                print(f"✅ 后台搜索完成，找到 {len(projects)} 个工程")
-                
-                # 标记数据已加载
-                self.is_data_loaded = True
-                self.last_refresh_time = datetime.now()
-                
-                # 在主线程中更新UI
-                self.after(0, self._update_display_only)
-                
-            except Exception as e:
-                print(f"后台搜索出错: {e}")
-        
-        # 在后台线程中执行搜索，不影响界面加载速度
-        threading.Thread(target=initial_search_thread, daemon=True).start()
+        """启动初始搜索 - 后台进行，不阻塞界面，找到的工程边搜索边显示"""
+        print(f"🔍 后台搜索UE工程...")
+        self.start_project_search()
     
     def create_widgets(self):
         """创建界面组件"""
@@ -90,6 +105,12 @@ class UEProjectsContent(ctk.CTkFrame):
                                      font=ctk.CTkFont(size=14, weight="bold"))
         projects_title.pack(anchor="w", padx=15, pady=(15, 5))
         
+        # 工程目录监视方式及其限制（新建的工程何时会自动显示）
+        watch_hint = ctk.CTkLabel(projects_frame, text=self.project_manager.watch_description(),
+                                 font=ctk.CTkFont(size=11),
+                                 text_color=("gray50", "gray50"))
+        watch_hint.pack(anchor="w", padx=15, pady=(0, 5))
+        
         # 搜索栏
         search_frame = ctk.CTkFrame(projects_frame, fg_color="transparent")
         search_frame.pack(fill="x", padx=15, pady=(0, 10))
@@ -124,6 +145,7 @@ class UEProjectsContent(ctk.CTkFrame):
         self.status_label.configure(text="正在搜索工程...")
         
         # 清空现有内容
+        self.card_renderer.cancel()
         for widget in self.recent_scroll.winfo_children():
             widget.destroy()
         for widget in self.projects_scroll.winfo_children():
@@ -136,23 +158,106 @@ class UEProjectsContent(ctk.CTkFrame):
         loading_label.pack(pady=50)
     
     def start_project_search(self):
-        """启动工程搜索"""
+        """启动工程搜索 - 找到的工程会边搜索边显示"""
+        # 每次搜索使用独立的队列，旧搜索的结果不会混入
+        found_queue = queue.Queue()
+        self.found_queue = found_queue
+        self.streamed_count = 0
+        
+        # 新搜索会取消仍在进行的旧搜索，避免多个完整扫描同时运行
+        job = self.project_manager.start_scan_job()
+        
         def search_thread():
             try:
                 # 搜索工程
-                projects = self.project_manager.search_ue_projects()
+                projects = self.project_manager.search_ue_projects(project_callback=found_queue.put, job=job)
+                
+                # 被取代的搜索不再更新界面
+                if job.cancelled:
+                    return
                 
                 # 在主线程中更新UI
                 self.after(0, lambda: self.on_search_complete(projects))
                 
             except Exception as e:
-                self.after(0, lambda: self.on_search_error(str(e)))
+                if not job.cancelled:
+                    self.after(0, lambda: self.on_search_error(str(e)))
         
         # 在后台线程中执行搜索
         threading.Thread(target=search_thread, daemon=True).start()
+        
+        # 定时把找到的工程批量插入界面
+        self._stop_streaming()
+        self.stream_job = self.after(self.STREAM_INTERVAL_MS, self._drain_found_projects)
+    
+    def _drain_found_projects(self):
+        """将搜索线程找到的工程批量插入到工程列表"""
+        self.stream_job = None
+        batch = []
+        while True:
+            try:
+                batch.append(self.found_queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        if batch:
+            # 第一批结果到达时移除加载提示
+            if self.streamed_count == 0:
+                for widget in self.projects_scroll.winfo_children():
+                    widget.destroy()
+            
+            search_term = self.search_var.get().lower()
+            for project in batch:
+                if not search_term or search_term in project['name'].lower():
+                    self.create_project_card(self.projects_scroll, project, is_recent=False)
+            
+            self.streamed_count += len(batch)
+            self.status_label.configure(text=f"正在搜索工程... 已找到 {self.streamed_count} 个")
+        
+        self.stream_job = self.after(self.STREAM_INTERVAL_MS, self._drain_found_projects)
+    
+    def _stop_streaming(self):
+        """停止批量插入定时器"""
+        if self.stream_job is not None:
+            self.after_cancel(self.stream_job)
+            self.stream_job = None
+    
+    def destroy(self):
+        """销毁界面时取消正在进行的搜索并停止监视工程目录（在后台线程中等待监视线程退出）"""
+        self._stop_streaming()
+        self.card_renderer.cancel()
+        self.card_hover.cancel()
+        self.project_manager.cancel_scan()
+        self.project_manager.remove_change_listener(self._on_project_changed)
+        self.project_manager.stop_watching(wait=False)
+        super().destroy()
+    
+    def on_page_hidden(self):
+        """离开工程页面时暂停正在进行的扫描，已找到的工程保留"""
+        if self.project_manager.is_scanning():
+            print(f"⏸️ 离开工程页面，暂停工程扫描")
+            self.project_manager.pause_scan()
+    
+    def on_page_shown(self):
+        """回到工程页面时继续暂停的扫描"""
+        self.project_manager.resume_scan()
+    
+    def _on_project_changed(self, event, project):
+        """工程目录变化回调（监视线程中调用），短时间内的多次变化合并为一次刷新"""
+        if self.changes_pending:
+            return
+        self.changes_pending = True
+        self.after(self.CHANGE_REFRESH_MS, self._apply_project_changes)
+    
+    def _apply_project_changes(self):
+        """在主线程中刷新工程列表显示"""
+        self.changes_pending = False
+        if self.is_data_loaded:
+            self._update_display_only()
     
     def on_search_complete(self, projects):
         """搜索完成回调"""
+        self._stop_streaming()
         self.status_label.configure(text=f"找到 {len(projects)} 个工程")
         
         # 标记数据已加载
@@ -161,9 +266,13 @@ class UEProjectsContent(ctk.CTkFrame):
         
         # 更新显示
         self._update_display_only()
+        
+        # 监视工程目录，之后的新增、删除和修改无需重新扫描（在后台线程中启动，不阻塞界面）
+        self.project_manager.start_watching(wait=False)
     
     def on_search_error(self, error_msg):
         """搜索错误回调"""
+        self._stop_streaming()
         self.status_label.configure(text=f"搜索出错: {error_msg}")
         
         # 显示错误信息
@@ -190,6 +299,10 @@ class UEProjectsContent(ctk.CTkFrame):
         
         # 需要刷新数据
         if not self.is_data_loaded:
+            if self.project_manager.is_scanning():
+                # 后台搜索仍在进行，找到的工程会陆续显示，无需重新搜索
+                print(f"⏳ UE工程搜索进行中，等待结果")
+                return
             print(f"🔄 首次加载，进行数据刷新")
             self.show_loading_state()
             self.start_project_search()
@@ -234,7 +347,8 @@ class UEProjectsContent(ctk.CTkFrame):
     
     def update_all_projects(self):
         """更新所有工程"""
-        # 清空现有内容
+        # 清空现有内容（未创建完的卡片不再创建）
+        self.card_renderer.cancel()
         for widget in self.projects_scroll.winfo_children():
             widget.destroy()
         
@@ -247,9 +361,9 @@ class UEProjectsContent(ctk.CTkFrame):
             no_projects_label.pack(pady=50)
             return
         
-        # 显示工程
-        for project in projects:
-            self.create_project_card(self.projects_scroll, project, is_recent=False)
+        # 分帧创建工程卡片，排在前面的（首屏）先显示
+        self.card_renderer.start(
+            projects, lambda project: self.create_project_card(self.projects_scroll, project, is_recent=False))
     
     def get_filtered_and_sorted_projects(self):
         """获取过滤和排序后的工程列表"""
@@ -355,89 +469,18 @@ class UEProjectsContent(ctk.CTkFrame):
         self.bind_project_card_events(card_frame, project)
     
     def bind_project_card_events(self, card_frame, project):
-        """绑定工程卡片事件"""
-        # 获取所有子组件
-        all_widgets = [card_frame]
-        
-        def get_all_children(widget):
-            children = []
-            for child in widget.winfo_children():
-                children.append(child)
-                children.extend(get_all_children(child))
-            return children
-        
-        all_widgets.extend(get_all_children(card_frame))
-        
-        # 为所有组件绑定事件（除了按钮）
-        for widget in all_widgets:
-            # 跳过按钮组件，避免干扰按钮功能
-            if not isinstance(widget, ctk.CTkButton):
-                # 双击事件：直接打开项目
-                widget.bind('<Double-Button-1>', lambda e, p=project: self.on_project_double_click(p))
-                # 右键事件：显示菜单
-                widget.bind('<Button-3>', lambda e, p=project: self.show_project_context_menu(e, p))
-                # 悬停事件：动画效果
-                widget.bind('<Enter>', lambda e, cf=card_frame: self.on_card_enter(cf))
-                widget.bind('<Leave>', lambda e, cf=card_frame: self.on_card_leave(cf))
-                # 鼠标指针样式
-                widget.configure(cursor="hand2")
+        """绑定工程卡片事件 - 卡片及子组件加入共用的bindtag，不为每个子组件单独bind"""
+        # 跳过按钮组件，避免干扰按钮功能
+        self.card_events.attach(card_frame, (card_frame, project),
+                                skip=lambda widget: isinstance(widget, ctk.CTkButton), cursor="hand2")
     
     def on_card_enter(self, card_frame):
-        """鼠标进入卡片事件（悬停动画）"""
-        try:
-            # 平滑过渡到悬停状态
-            self.animate_card_hover(card_frame, True)
-        except Exception as e:
-            print(f"悬停动画出错: {e}")
+        """鼠标进入卡片事件（悬停动画，子组件之间移动不会重复触发）"""
+        self.card_hover.enter(card_frame)
     
     def on_card_leave(self, card_frame):
         """鼠标离开卡片事件（悬停动画）"""
-        try:
-            # 平滑过渡到默认状态
-            self.animate_card_hover(card_frame, False)
-        except Exception as e:
-            print(f"离开动画出错: {e}")
-    
-    def animate_card_hover(self, card_frame, is_hover, step=0, max_steps=1):
-        """卡片悬停动画效果 - 优化版本，即时响应"""
-        try:
-            if not card_frame.winfo_exists():
-                return
-            
-            # 即时设置最终状态，无延迟
-            if is_hover:
-                # 悬停状态：淡蓝色背景，蓝色边框
-                card_frame.configure(
-                    fg_color=("#e8f4fd", "#2d3748"),
-                    border_width=2,
-                    border_color=("#3182ce", "#4299e1")
-                )
-            else:
-                # 默认状态：灰色背景，细边框
-                card_frame.configure(
-                    fg_color=("gray92", "gray20"),
-                    border_width=1,
-                    border_color=("gray70", "gray30")
-                )
-        
-        except Exception as e:
-            print(f"动画执行出错: {e}")
-            # 发生错误时直接设置最终状态
-            try:
-                if is_hover:
-                    card_frame.configure(
-                        fg_color=("#e8f4fd", "#2d3748"),
-                        border_width=2,
-                        border_color=("#3182ce", "#4299e1")
-                    )
-                else:
-                    card_frame.configure(
-                        fg_color=("gray92", "gray20"),
-                        border_width=1,
-                        border_color=("gray70", "gray30")
-                    )
-            except:
-                pass
+        self.card_hover.leave(card_frame)
     
     def on_project_double_click(self, project):
         """处理项目双击事件"""
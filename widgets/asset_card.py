@@ -5,31 +5,50 @@ import webbrowser
 import customtkinter as ctk
 from utils.file_utils import FileUtils
 from utils.dialog_utils import DialogUtils
+from utils.card_events import CardEventDispatcher
+from utils.hover_animator import HoverAnimator
 
 class AssetCard(ctk.CTkFrame):
+    """资产卡片 - 创建后可以通过set_asset绑定到其他资产，只更新变化的文字和图片，不重建组件"""
+
+    THUMBNAIL_SIZE = (180, 140)
+
+    # 所有资产卡片共用的事件绑定
+    EVENTS = CardEventDispatcher("AssetCard", {
+        '<Button-1>': lambda card, event: card.on_click(event),
+        '<Button-3>': lambda card, event: card.on_right_click(event),
+        '<Enter>': lambda card, event: card.on_enter(event),
+        '<Leave>': lambda card, event: card.on_leave(event),
+    })
+    # 所有资产卡片共用的悬停动画
+    HOVER = HoverAnimator(
+        normal={'fg_color': ("gray90", "gray25"), 'border_color': ("gray70", "gray30"), 'border_width': 1},
+        hover={'fg_color': ("#e0f2fe", "#1e3a8a"), 'border_color': ("#3b82f6", "#60a5fa"), 'border_width': 2})
+
     def __init__(self, parent, asset, controller, image_utils):
         super().__init__(parent, 
                         corner_radius=12,
                         border_width=1,
                         border_color=("gray70", "gray30"))
-        self.asset = asset
+        self.asset = None
         self.controller = controller
         self.image_utils = image_utils
         self.file_utils = FileUtils()
+        # 当前显示的内容：(封面, 名称, 分类, 日期)
+        self._rendered = (None, None, None, None)
         self.create_widgets()
         self.bind_events()
+        self.set_asset(asset)
 
     def create_widgets(self):
-        """创建资产卡片组件 - 现代化设计"""
+        """创建资产卡片组件 - 现代化设计，内容由set_asset填充"""
         # 缩略图容器（现代化设计）
         thumbnail_frame = ctk.CTkFrame(self, fg_color="transparent", height=160, corner_radius=10)
         thumbnail_frame.pack(fill="x", padx=12, pady=(12, 8))
         thumbnail_frame.pack_propagate(False)
         
         # 缩略图（现代化设计）
-        thumbnail_size = (180, 140)  # 调整缩略图尺寸
-        thumbnail = self.image_utils.load_thumbnail(self.asset.get('cover'), thumbnail_size)
-        self.img_label = ctk.CTkLabel(thumbnail_frame, image=thumbnail, text="",
+        self.img_label = ctk.CTkLabel(thumbnail_frame, text="",
                                      fg_color="transparent", cursor="hand2")
         # 不需要手动保存引用，CTkImage会自动处理
         self.img_label.pack(expand=True)
@@ -39,12 +58,7 @@ class AssetCard(ctk.CTkFrame):
         info_frame.pack(fill="both", expand=True, padx=12, pady=(0, 12))
         
         # 名称（现代化设计）
-        asset_name = self.asset.get('name', '未命名')
-        # 如果名称太长，截断并添加省略号
-        if len(asset_name) > 20:  # 调整名称长度限制
-            asset_name = asset_name[:20] + "..."
-            
-        self.name_label = ctk.CTkLabel(info_frame, text=asset_name,
+        self.name_label = ctk.CTkLabel(info_frame, text="",
                                       font=ctk.CTkFont(size=14, weight="bold"),  # 调整字体大小
                                       cursor="hand2")
         self.name_label.pack(anchor="w", pady=(0, 8))
@@ -54,17 +68,32 @@ class AssetCard(ctk.CTkFrame):
         meta_frame.pack(fill="x")
         
         # 分类标签（现代化设计）
-        category_text = self.asset.get('category', '未分类')
-        if len(category_text) > 12:  # 调整分类名称长度限制
-            category_text = category_text[:12] + "..."
-            
-        self.category_label = ctk.CTkLabel(meta_frame, text=category_text,
+        self.category_label = ctk.CTkLabel(meta_frame, text="",
                                           font=ctk.CTkFont(size=12, weight="bold"),  # 调整字体大小
                                           text_color=("#2563eb", "#60a5fa"))
         self.category_label.pack(side="left")
         
         # 添加日期（现代化设计，只显示月-日）
-        date_added = self.asset.get('date_added', '')
+        self.date_label = ctk.CTkLabel(meta_frame, text="",
+                                      font=ctk.CTkFont(size=11, weight="bold"),  # 调整字体大小
+                                      text_color=("gray60", "gray60"))
+        self.date_label.pack(side="right")
+
+    @staticmethod
+    def format_asset(asset):
+        """卡片上显示的内容：(封面, 名称, 分类, 日期)"""
+        # 名称（如果名称太长，截断并添加省略号）
+        asset_name = asset.get('name', '未命名')
+        if len(asset_name) > 20:  # 调整名称长度限制
+            asset_name = asset_name[:20] + "..."
+        
+        category_text = asset.get('category', '未分类')
+        if len(category_text) > 12:  # 调整分类名称长度限制
+            category_text = category_text[:12] + "..."
+        
+        # 添加日期只显示月-日
+        short_date = ""
+        date_added = asset.get('date_added', '')
         if date_added:
             try:
                 # 提取月日部分
@@ -75,33 +104,30 @@ class AssetCard(ctk.CTkFrame):
                     short_date = date_added.split()[0]
             except:
                 short_date = ""
-                
-            if short_date:
-                date_label = ctk.CTkLabel(meta_frame, text=short_date,
-                                         font=ctk.CTkFont(size=11, weight="bold"),  # 调整字体大小
-                                         text_color=("gray60", "gray60"))
-                date_label.pack(side="right")
+        
+        return asset.get('cover'), asset_name, category_text, short_date
+
+    def set_asset(self, asset):
+        """绑定到资产，只更新与当前显示不同的部分（事件处理通过self.asset获取资产，无需重新绑定）"""
+        self.asset = asset
+        if asset is None:
+            return
+        cover, name, category, date = self.format_asset(asset)
+        old_cover, old_name, old_category, old_date = self._rendered
+        if cover != old_cover or old_name is None:
+            thumbnail = self.image_utils.load_thumbnail(cover, self.THUMBNAIL_SIZE)
+            self.img_label.configure(image=thumbnail)
+        if name != old_name:
+            self.name_label.configure(text=name)
+        if category != old_category:
+            self.category_label.configure(text=category)
+        if date != old_date:
+            self.date_label.configure(text=date)
+        self._rendered = (cover, name, category, date)
 
     def bind_events(self):
-        """绑定事件"""
-        # 获取所有子组件
-        all_widgets = [self]
-        
-        def get_all_children(widget):
-            children = []
-            for child in widget.winfo_children():
-                children.append(child)
-                children.extend(get_all_children(child))
-            return children
-        
-        all_widgets.extend(get_all_children(self))
-        
-        # 为所有组件绑定事件
-        for widget in all_widgets:
-            widget.bind('<Button-1>', self.on_click)
-            widget.bind('<Button-3>', self.on_right_click)
-            widget.bind('<Enter>', self.on_enter)
-            widget.bind('<Leave>', self.on_leave)
+        """绑定事件 - 卡片及所有子组件加入共用的bindtag，事件由EVENTS分发到本卡片"""
+        self.EVENTS.attach(self, self)
 
     def on_click(self, event):
         """处理左键点击 - 显示资产详情界面"""
@@ -395,16 +421,12 @@ class AssetCard(ctk.CTkFrame):
                 self.controller.show_status("资源路径不存在", "error")
 
     def on_enter(self, event):
-        """鼠标进入 - 现代化悬停效果"""
-        self.configure(fg_color=("#e0f2fe", "#1e3a8a"),
-                      border_color=("#3b82f6", "#60a5fa"),
-                      border_width=2)
+        """鼠标进入 - 现代化悬停效果（子组件之间移动不会重复触发）"""
+        self.HOVER.enter(self)
 
     def on_leave(self, event):
         """鼠标离开 - 恢复默认样式"""
-        self.configure(fg_color=("gray90", "gray25"),
-                      border_color=("gray70", "gray30"),
-                      border_width=1)
+        self.HOVER.leave(self)
 
     def open_document(self):
         """打开文档"""
@@ -455,22 +477,11 @@ class AssetCard(ctk.CTkFrame):
         # 优先使用已加载的工程列表，避免重新搜索导致卡顿
         projects = self.get_preloaded_projects()
         
-        # 如果没有获取到工程列表，尝试手动搜索
+        # 没有获取到工程列表时不在界面线程中搜索（会阻塞界面），由工程页面在后台搜索
+        projects_loading = False
         if not projects:
-            print("未获取到预加载的工程列表，尝试手动搜索...")
-            try:
-                from models.project_manager import ProjectManager
-                project_manager = ProjectManager()
-                all_projects = project_manager.get_projects()  # 使用已有的工程列表
-                if not all_projects:  # 如果没有已有工程，才重新搜索
-                    all_projects = project_manager.refresh_projects()
-                projects = [{
-                    'name': project['name'],
-                    'path': project['path'],
-                    'dir': project['dir']
-                } for project in all_projects]
-            except Exception as e:
-                print(f"手动搜索工程失败: {e}")
+            print("未获取到预加载的工程列表，在后台搜索工程...")
+            projects_loading = self.start_background_project_search()
         
         # 获取当前运行的虚幻引擎进程
         running_processes = []
@@ -536,7 +547,7 @@ class AssetCard(ctk.CTkFrame):
         
         # 显示工程列表
         if projects:
-            self.display_found_projects_simple(scrollable_frame, projects, archive_files)
+            self.display_found_projects_simple(scrollable_frame, projects, archive_files, projects_loading)
         else:
             # 显示提示信息
             no_projects_label = ctk.CTkLabel(scrollable_frame, 
@@ -642,16 +653,41 @@ class AssetCard(ctk.CTkFrame):
         self.selection_dialog.destroy()
         self.process_selected_project(project, archive_files)
     
+    def get_projects_page(self):
+        """获取主窗口中的虚幻工程页面，没有时返回None"""
+        content_manager = getattr(self.controller, 'content_manager', None)
+        pages = getattr(content_manager, 'pages', {})
+        return pages.get('ue_projects')
+    
+    def start_background_project_search(self):
+        """工程列表为空时通过工程页面在后台搜索，返回是否有搜索正在进行"""
+        try:
+            ue_projects_content = self.get_projects_page()
+            if ue_projects_content is None:
+                return False
+            project_manager = ue_projects_content.project_manager
+            if project_manager.is_scanning():
+                # 离开工程页面时扫描被暂停，继续扫描
+                project_manager.resume_scan()
+                return True
+            if ue_projects_content.is_data_loaded:
+                # 搜索已完成，确实没有工程
+                return False
+            ue_projects_content.refresh_content()
+            return True
+        except Exception as e:
+            print(f"后台搜索工程失败: {e}")
+            return False
+    
     def get_preloaded_projects(self):
         """从主窗口获取已加载的工程列表"""
         try:
             # 尝试从内容管理器中获取虚幻工程组件
-            content_manager = self.controller.content_manager
-            if hasattr(content_manager, 'pages') and 'ue_projects' in content_manager.pages:
-                ue_projects_content = content_manager.pages['ue_projects']
+            ue_projects_content = self.get_projects_page()
+            if ue_projects_content is not None:
                 if hasattr(ue_projects_content, 'project_manager'):
-                    # 使用已有的工程列表，避免强制刷新导致卡顿
-                    projects = ue_projects_content.project_manager.get_projects()
+                    # 使用已有的工程列表，不调用get_projects（列表为空时会在界面线程中完整扫描）
+                    projects = ue_projects_content.project_manager.projects
                     # 转换为对话框需要的格式
                     return [{
                         'name': project['name'],
@@ -667,11 +703,15 @@ class AssetCard(ctk.CTkFrame):
             print(f"获取预加载工程列表失败: {e}")
             return []
     
-    def display_found_projects_simple(self, parent, projects, archive_files):
-        """显示找到的工程列表（简化版）"""
+    def display_found_projects_simple(self, parent, projects, archive_files, loading=False):
+        """显示找到的工程列表（简化版），loading为True时表示工程列表仍在后台搜索"""
         if not projects:
+            if loading:
+                text = "正在后台搜索UE工程，请稍后重新打开此窗口\n或点击'手动选择文件'按钮选择工程"
+            else:
+                text = "未找到UE工程文件\n请点击'手动选择文件'按钮选择工程"
             no_projects_label = ctk.CTkLabel(parent, 
-                                           text="未找到UE工程文件\n请点击'手动选择文件'按钮选择工程",
+                                           text=text,
                                            font=ctk.CTkFont(size=12),
                                            text_color=("gray50", "gray50"))
             no_projects_label.pack(pady=50)
@@ -1647,8 +1687,7 @@ class AssetCard(ctk.CTkFrame):
                 return
                 
             # 更新资源分类
-            self.asset['category'] = new_category
-            if self.controller.asset_manager.save_data():
+            if self.controller.asset_manager.set_resource_category(self.asset, new_category):
                 dialog.destroy()
                 self.controller.refresh_content()
                 if hasattr(self.controller, 'show_status'):
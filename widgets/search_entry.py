@@ -1,9 +1,16 @@
 import customtkinter as ctk
 
 class SearchEntry(ctk.CTkFrame):
-    def __init__(self, parent, placeholder_text="", height=35, command=None):
+    """搜索框 - 输入内容变化时调用command；按回车或点击搜索按钮时调用submit_command（未指定时为command）
+
+    防抖由调用方处理（见SearchPipeline），这里只过滤不改变内容的按键（方向键、Shift等）。
+    """
+
+    def __init__(self, parent, placeholder_text="", height=35, command=None, submit_command=None):
         super().__init__(parent, fg_color="transparent")
         self.command = command
+        self.submit_command = submit_command
+        self.last_text = ""
         
         # 创建搜索框
         self.entry = ctk.CTkEntry(self, 
@@ -12,6 +19,7 @@ class SearchEntry(ctk.CTkFrame):
                                  font=ctk.CTkFont(size=13))
         self.entry.pack(side="left", fill="x", expand=True)
         self.entry.bind('<KeyRelease>', self.on_key_release)
+        self.entry.bind('<Return>', lambda event: self.on_search_click())
         
         # 搜索图标按钮
         self.search_btn = ctk.CTkButton(self, 
@@ -23,14 +31,20 @@ class SearchEntry(ctk.CTkFrame):
         self.search_btn.pack(side="right", padx=(5, 0))
 
     def on_key_release(self, event=None):
-        """处理键盘释放事件"""
+        """处理键盘释放事件，内容没有变化时不触发搜索"""
+        text = self.entry.get()
+        if text == self.last_text:
+            return
+        self.last_text = text
         if self.command:
-            self.command(self.entry.get())
+            self.command(text)
 
     def on_search_click(self):
         """处理搜索按钮点击"""
-        if self.command:
-            self.command(self.entry.get())
+        self.last_text = self.entry.get()
+        command = self.submit_command or self.command
+        if command:
+            command(self.last_text)
 
     def get(self):
         """获取搜索内容"""
@@ -38,4 +52,5 @@ class SearchEntry(ctk.CTkFrame):
 
     def clear(self):
         """清空搜索框"""
-        self.entry.delete(0, 'end')
\ No newline at end of file
+        self.entry.delete(0, 'end')
+        self.last_text = ""
\ No newline at end of file
@@ -0,0 +1,326 @@
+import sys
+import tkinter
+import customtkinter as ctk
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+from utils.render_scheduler import RenderScheduler
+
+
+class GridLayout:
+    """网格布局计算 - 固定尺寸的格子按行排列，计算位置和可见范围（与界面无关，便于测试）"""
+
+    def __init__(self, cell_width: int, cell_height: int, gap_x: int = 0, gap_y: int = 0,
+                 padding: int = 0, columns: Optional[int] = None):
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.gap_x = gap_x
+        self.gap_y = gap_y
+        self.padding = padding
+        # 固定列数，None表示按宽度自动计算
+        self.columns = columns
+
+    @property
+    def row_height(self) -> int:
+        return self.cell_height + self.gap_y
+
+    def column_count(self, width: int) -> int:
+        """宽度能容纳的列数（至少1列）"""
+        if self.columns:
+            return self.columns
+        usable = width - 2 * self.padding + self.gap_x
+        return max(1, usable // (self.cell_width + self.gap_x))
+
+    def row_count(self, count: int, columns: int) -> int:
+        return (count + columns - 1) // columns
+
+    def content_height(self, count: int, columns: int) -> int:
+        """所有行的总高度"""
+        rows = self.row_count(count, columns)
+        return 2 * self.padding + rows * self.row_height - (self.gap_y if rows else 0)
+
+    def position(self, index: int, columns: int) -> Tuple[int, int]:
+        """第index个格子左上角的坐标"""
+        row, column = divmod(index, columns)
+        return (self.padding + column * (self.cell_width + self.gap_x),
+                self.padding + row * self.row_height)
+
+    def visible_range(self, top: int, height: int, count: int, columns: int, overscan_rows: int = 1) -> Tuple[int, int]:
+        """可见区域（top到top+height）内的格子下标范围[start, end)，上下各多包含overscan_rows行"""
+        if count <= 0 or height <= 0:
+            return 0, 0
+        first_row = max(0, (top - self.padding) // self.row_height - overscan_rows)
+        last_row = (top + height - self.padding) // self.row_height + overscan_rows
+        start = first_row * columns
+        end = min(count, (last_row + 1) * columns)
+        return min(start, end), end
+
+
+def keyed_diff(old: Dict[Hashable, int], new: Sequence[Tuple[int, Hashable]]):
+    """按键比较新旧两组格子
+
+    old为{键: 原下标}，new为[(新下标, 键)]（按新下标排列）。
+    返回(保留, 插入, 移除)：保留为[(键, 原下标, 新下标)]（下标不同即需要移动），
+    插入为[(新下标, 键)]，移除为原来有、现在没有的键。
+    """
+    kept, inserted = [], []
+    remaining = dict(old)
+    for index, key in new:
+        old_index = remaining.pop(key, None)
+        if old_index is None:
+            inserted.append((index, key))
+        else:
+            kept.append((key, old_index, index))
+    return kept, inserted, list(remaining)
+
+
+class VirtualGrid(ctk.CTkFrame):
+    """虚拟化网格 - 只为可见行（加上下缓冲行）创建格子组件，滚动时回收复用
+
+    格子组件由create_widget(parent)创建，bind_widget(widget, item)将组件绑定到数据项。
+    组件数量只与可见区域大小有关，与数据项数量无关。
+    组件按key(item)跟随数据项（默认按对象本身）：数据更新后仍可见的数据项保留原来的组件，
+    位置变化时只移动，只有新出现的数据项需要绑定组件。
+    新出现的数据项通过RenderScheduler分帧绑定，视口内的先绑定，缓冲行的之后再绑定。
+    可以用set_header/set_footer在网格上方/下方放置固定高度的组件。
+    """
+
+    SCROLL_INCREMENT = 40
+
+    def __init__(self, parent, create_widget: Callable[[Any], Any], bind_widget: Callable[[Any, Any], None],
+                 cell_width: int, cell_height: int, gap_x: int = 0, gap_y: int = 0, padding: int = 0,
+                 columns: Optional[int] = None, overscan_rows: int = 1,
+                 key: Optional[Callable[[Any], Hashable]] = None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.create_widget = create_widget
+        self.bind_widget = bind_widget
+        self.key = key or id
+        self.overscan_rows = overscan_rows
+        self._base_layout = (cell_width, cell_height, gap_x, gap_y, padding, columns)
+        self.layout = self._scaled_layout()
+        self.items: Sequence[Any] = []
+        self.columns = 1
+        # 上次摆放格子时的(列数, 顶部组件高度)，变化后所有格子都要移动
+        self._placement = None
+        # {下标: (组件, 画布窗口id)}
+        self._visible: Dict[int, Tuple[Any, int]] = {}
+        # {画布窗口id: 绑定的数据项}
+        self._bound: Dict[int, Any] = {}
+        # 数据更新后，保留的组件也需要重新绑定（数据项内容可能已修改）
+        self._rebind = False
+        # 空闲的格子
+        self._free: List[Tuple[Any, int]] = []
+        # 等待分帧绑定的格子 {下标: 格子}，None表示绑定时再创建
+        self._pending: Dict[int, Optional[Tuple[Any, int]]] = {}
+        self.renderer = RenderScheduler(self)
+        self._header = None
+        self._header_height = 0
+        self._footer = None
+        self._footer_height = 0
+
+        self.canvas = tkinter.Canvas(self, highlightthickness=0, borderwidth=0,
+                                     yscrollincrement=self._apply_widget_scaling(self.SCROLL_INCREMENT))
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_yview)
+        self.scrollbar.pack(side="right", fill="y", padx=(0, 4), pady=6)
+        corner = self._apply_widget_scaling(self.cget("corner_radius"))
+        self.canvas.pack(side="left", fill="both", expand=True, padx=(corner // 2, 0), pady=corner // 2)
+        self._set_canvas_color()
+
+        self.canvas.bind("<Configure>", lambda event: self._relayout())
+        # 滚轮事件绑定在全局，销毁时只移除自己的绑定（[(事件, 回调id)]）
+        sequences = ["<MouseWheel>"]
+        if not sys.platform.startswith("win") and sys.platform != "darwin":
+            sequences += ["<Button-4>", "<Button-5>"]
+        self._wheel_bindings = [(sequence, self.bind_all(sequence, self._on_mouse_wheel, add="+"))
+                                for sequence in sequences]
+
+    def _scaled_layout(self) -> GridLayout:
+        cell_width, cell_height, gap_x, gap_y, padding, columns = self._base_layout
+        scale = self._apply_widget_scaling
+        return GridLayout(round(scale(cell_width)), round(scale(cell_height)),
+                          round(scale(gap_x)), round(scale(gap_y)), round(scale(padding)), columns)
+
+    def _set_canvas_color(self):
+        color = self.cget("fg_color")
+        if color == "transparent":
+            color = self.master.cget("fg_color") if hasattr(self.master, "cget") else "transparent"
+        if color != "transparent":
+            self.canvas.configure(bg=self._apply_appearance_mode(color))
+
+    def _set_appearance_mode(self, mode_string):
+        super()._set_appearance_mode(mode_string)
+        self._set_canvas_color()
+
+    def _set_scaling(self, *args, **kwargs):
+        super()._set_scaling(*args, **kwargs)
+        self.layout = self._scaled_layout()
+        self._placement = None
+        pending = [slot for slot in self._pending.values() if slot is not None]
+        for widget, window_id in list(self._visible.values()) + self._free + pending:
+            self.canvas.itemconfigure(window_id, width=self.layout.cell_width, height=self.layout.cell_height)
+        self._relayout()
+
+    # ---- 数据 ----
+
+    def set_items(self, items: Sequence[Any], keep_position: bool = False):
+        """设置数据项，默认滚动回顶部；keep_position为True时保持滚动位置（如编辑后刷新）
+
+        仍然可见的数据项保留原来的组件（按key比较）。
+        """
+        self.items = items
+        self._rebind = True
+        if not keep_position:
+            self.canvas.yview_moveto(0)
+        self._relayout()
+
+    def set_header(self, widget, height: int):
+        """在网格上方放置固定高度的组件，widget为None时移除"""
+        self._header, self._header_height = self._place_extra(self._header, widget, height)
+        self._relayout()
+
+    def set_footer(self, widget, height: int):
+        """在网格下方放置固定高度的组件，widget为None时移除"""
+        self._footer, self._footer_height = self._place_extra(self._footer, widget, height)
+        self._relayout()
+
+    def _place_extra(self, old, widget, height):
+        if old is not None:
+            self.canvas.delete(old[1])
+            old[0].destroy()
+        if widget is None:
+            return None, 0
+        window_id = self.canvas.create_window(0, 0, window=widget, anchor="nw")
+        return (widget, window_id), round(self._apply_widget_scaling(height))
+
+    def cancel_render(self):
+        """取消尚未完成的分帧绑定，未绑定的格子回到空闲列表"""
+        self.renderer.cancel()
+        self._free.extend(slot for slot in self._pending.values() if slot is not None)
+        self._pending = {}
+
+    def destroy(self):
+        self.renderer.cancel()
+        for sequence, funcid in self._wheel_bindings:
+            self._unbind_all(sequence, funcid)
+        self._wheel_bindings = []
+        super().destroy()
+
+    def _unbind_all(self, sequence: str, funcid: str):
+        """从全局绑定中移除一个回调，保留其他组件绑定的回调（unbind_all会全部移除）"""
+        script = self.tk.call("bind", "all", sequence)
+        lines = [line for line in script.split("\n") if line and funcid not in line]
+        self.tk.call("bind", "all", sequence, "\n".join(lines))
+        self.deletecommand(funcid)
+
+    def visible_widgets(self) -> Dict[int, Any]:
+        """当前绑定了数据项的组件 {下标: 组件}"""
+        return {index: slot[0] for index, slot in self._visible.items()}
+
+    # ---- 布局 ----
+
+    def _relayout(self):
+        """尺寸或数据变化后重新计算列数和滚动区域"""
+        width = self.canvas.winfo_width()
+        self.columns = self.layout.column_count(width)
+
+        grid_height = self.layout.content_height(len(self.items), self.columns)
+        total_height = self._header_height + grid_height + self._footer_height
+        self.canvas.configure(scrollregion=(0, 0, width, max(total_height, 1)))
+        if self._header is not None:
+            self.canvas.coords(self._header[1], 0, 0)
+            self.canvas.itemconfigure(self._header[1], width=width, height=self._header_height)
+        if self._footer is not None:
+            self.canvas.coords(self._footer[1], 0, self._header_height + grid_height)
+            self.canvas.itemconfigure(self._footer[1], width=width, height=self._footer_height)
+        self._update_visible()
+
+    def _update_visible(self):
+        """按键比较可见范围内的数据项：保留的组件原地或移动，新出现的数据项使用空闲组件分帧绑定"""
+        # 上次未完成的绑定已过期，这些数据项如果仍然可见会作为新出现的数据项重新安排
+        self.cancel_render()
+        top = int(self.canvas.canvasy(0)) - self._header_height
+        height = self.canvas.winfo_height()
+        start, end = self.layout.visible_range(top, height, len(self.items), self.columns, self.overscan_rows)
+        old_slots = {}
+        old_indexes = {}
+        for index, slot in self._visible.items():
+            key = self.key(self._bound[slot[1]])
+            old_slots[key] = slot
+            old_indexes[key] = index
+        new = [(index, self.key(self.items[index])) for index in range(start, end)]
+        kept, inserted, removed = keyed_diff(old_indexes, new)
+
+        placement = (self.columns, self._header_height)
+        relayout = placement != self._placement
+        self._placement = placement
+        self._visible = {}
+        for key in removed:
+            slot = old_slots[key]
+            self.canvas.itemconfigure(slot[1], state="hidden")
+            self._free.append(slot)
+        for key, old_index, index in kept:
+            slot = old_slots[key]
+            if old_index != index or relayout:
+                self._move(slot, index)
+            item = self.items[index]
+            if self._rebind or self._bound[slot[1]] is not item:
+                self._bind(slot, item)
+            self._visible[index] = slot
+        self._rebind = False
+
+        # 视口内的先绑定，缓冲行的排在后面（sort是稳定的，同一组内保持顺序）
+        view_start, view_end = self.layout.visible_range(top, height, len(self.items), self.columns, 0)
+        inserted.sort(key=lambda entry: not view_start <= entry[0] < view_end)
+        for index, key in inserted:
+            self._pending[index] = self._free.pop() if self._free else None
+        self.renderer.start([index for index, key in inserted], self._render_slot)
+
+    def _render_slot(self, index):
+        """绑定一个新出现的数据项（由RenderScheduler分帧调用）"""
+        slot = self._pending.pop(index)
+        if slot is None:
+            slot = self._new_slot()
+        self._move(slot, index)
+        self._visible[index] = slot
+        self._bind(slot, self.items[index])
+        self.canvas.itemconfigure(slot[1], state="normal")
+
+    def _move(self, slot, index):
+        x, y = self.layout.position(index, self.columns)
+        self.canvas.coords(slot[1], x, y + self._header_height)
+
+    def _bind(self, slot, item):
+        self._bound[slot[1]] = item
+        self.bind_widget(slot[0], item)
+
+    def _new_slot(self) -> Tuple[Any, int]:
+        widget = self.create_widget(self.canvas)
+        window_id = self.canvas.create_window(0, 0, window=widget, anchor="nw", state="hidden",
+                                              width=self.layout.cell_width, height=self.layout.cell_height)
+        return widget, window_id
+
+    # ---- 滚动 ----
+
+    def _on_yview(self, first, last):
+        self.scrollbar.set(first, last)
+        self._update_visible()
+
+    def _on_mouse_wheel(self, event):
+        if not self._contains(event.widget) or self.canvas.yview() == (0.0, 1.0):
+            return
+        if sys.platform.startswith("win"):
+            # 高精度触控板的delta可能小于120，至少滚动1个单位
+            self.canvas.yview_scroll(-int(event.delta / 120) or (-1 if event.delta > 0 else 1), "units")
+        elif sys.platform == "darwin":
+            self.canvas.yview_scroll(-event.delta, "units")
+        else:
+            self.canvas.yview_scroll(-1 if event.num == 4 else 1, "units")
+
+    def _contains(self, widget) -> bool:
+        """widget是否在网格内（对话框等其他窗口中的滚动不处理）"""
+        if not self.winfo_exists():
+            return False
+        while widget is not None and not isinstance(widget, str):
+            if widget is self:
+                return True
+            widget = getattr(widget, "master", None)
+        return False